@@ -0,0 +1,248 @@
+"""Convert sketches and IFC files in batch, without Inkscape.
+
+    python abstractBIM_batch.py sketches/ -o output --jobs 8
+    python abstractBIM_batch.py "projects/**/*.svg" models/*.ifc -o output
+
+SVG sketches become one IFC file per Building= layer ({project}_{building}.ifc),
+IFC files become {name}.svg. Files found in a directory or by a glob pattern
+keep their path below it in the output directory. Inputs whose outputs all
+exist and are newer are skipped unless --force is given; inputs that would
+write the same output fail. The exit status is 1 if any input failed and 2
+if no input was found.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional
+
+from utils.convert_ifc_to_svg import process_ifc
+from utils.convert_svg_to_ifc import ifc_file_names, process_svg_layers
+from utils.instrumentation import configure_logging
+from utils.unit_class import ModelUnit
+
+INPUT_SUFFIXES = (".svg", ".ifc")
+
+
+class InputFile(NamedTuple):
+    path: str
+    output_subdir: str  # Directory of the file below its input root, mirrored in the output directory
+
+
+@dataclass
+class FileResult:
+    input_file: str
+    outputs: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        status = "skipped" if self.skipped else "ok" if self.ok else "FAILED"
+        line = f"{status:<8}{self.input_file}"
+        if self.outputs:
+            line += f" -> {', '.join(self.outputs)}"
+        if not self.skipped:
+            line += f" ({self.seconds:.2f}s)"
+        if not self.ok:
+            line += f": {self.error}"
+        return line
+
+
+def _glob_root(pattern: str) -> str:
+    """The directory part of a glob pattern before its first wildcard"""
+    root = os.path.dirname(pattern)
+    while glob.has_magic(root):
+        root = os.path.dirname(root)
+    return root
+
+
+def collect_inputs(patterns: List[str], recursive: bool = False) -> List[InputFile]:
+    """Files named by paths, directories (their SVG and IFC files) or glob patterns, in order"""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            root = pattern
+            matches = glob.glob(os.path.join(pattern, "**", "*") if recursive else os.path.join(pattern, "*"),
+                                recursive=recursive)
+        elif glob.has_magic(pattern):
+            root = _glob_root(pattern)
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            files.append(InputFile(pattern, ""))  # Reported as failed later if it does not exist
+            continue
+        for match in sorted(m for m in matches if m.lower().endswith(INPUT_SUFFIXES)):
+            subdir = os.path.relpath(os.path.dirname(match), root) if root else os.path.dirname(match)
+            files.append(InputFile(match, "" if subdir == os.curdir else subdir))
+    unique: Dict[str, InputFile] = {}
+    for input_file in files:
+        unique.setdefault(os.path.normpath(input_file.path), input_file)
+    return list(unique.values())
+
+
+def expected_outputs(input_file: str, output_dir: str) -> List[str]:
+    """Output files of an input; empty if they cannot be known without converting"""
+    suffix = os.path.splitext(input_file)[1].lower()
+    if suffix == ".ifc":
+        return [os.path.join(output_dir, os.path.splitext(os.path.basename(input_file))[0] + ".svg")]
+    if suffix == ".svg":
+        try:
+            return ifc_file_names(input_file, output_dir)
+        except Exception:
+            return []  # Unreadable sketch: convert it and report the real error
+    return []
+
+
+def up_to_date(input_file: str, outputs: List[str]) -> bool:
+    """make-style check: every output exists and is newer than the input"""
+    if not outputs or not os.path.exists(input_file):
+        return False
+    try:
+        oldest = min(os.path.getmtime(output) for output in outputs)
+    except OSError:
+        return False
+    return oldest >= os.path.getmtime(input_file)
+
+
+def convert_file(input_file: str, output_dir: str, options: Dict) -> FileResult:
+    """Convert one input; errors are reported in the result. Process pool entry point."""
+    start = time.perf_counter()
+    result = FileResult(input_file)
+    suffix = os.path.splitext(input_file)[1].lower()
+    try:
+        if not os.path.isfile(input_file):
+            raise FileNotFoundError(f"No such file: {input_file}")
+        if suffix == ".svg":
+            buildings = process_svg_layers(input_file, output_dir, incremental=options["incremental"],
+                                           deterministic=options["deterministic"], repair=options["repair"])
+            result.outputs = [building.ifc_file for building in buildings if building.ok]
+            errors = [f"{building.name}: {building.error}" for building in buildings if not building.ok]
+            if not buildings:
+                errors.append("no Building= layer found")
+            if errors:
+                result.error = "; ".join(errors)
+        elif suffix == ".ifc":
+            output = expected_outputs(input_file, output_dir)[0]
+            os.makedirs(output_dir, exist_ok=True)
+            # Written under a temporary name so a failed run never looks up to date
+            partial = output + ".part"
+            try:
+                with open(partial, "w", encoding="utf-8") as f:
+                    process_ifc(input_file, unit=options["unit"], cache_dir=options["cache_dir"], output=f)
+                os.replace(partial, output)
+            finally:
+                if os.path.exists(partial):
+                    os.remove(partial)
+            result.outputs = [output]
+        else:
+            raise ValueError(f"Unsupported file type '{suffix}', expected one of {INPUT_SUFFIXES}")
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _output_conflicts(outputs: List[List[str]], inputs: List[str]) -> Dict[int, str]:
+    """Errors of the inputs that would write the same output file as another input"""
+    writers: Dict[str, List[int]] = {}
+    for index, files in enumerate(outputs):
+        for output in files:
+            writers.setdefault(os.path.normcase(os.path.abspath(output)), []).append(index)
+    conflicts = {}
+    for output, indices in writers.items():
+        if len(indices) > 1:
+            for index in indices:
+                others = ", ".join(inputs[other] for other in indices if other != index)
+                conflicts.setdefault(index, f"{output} would also be written by {others}")
+    return conflicts
+
+
+def convert_files(inputs: List[InputFile], output_dir: str, jobs: int = 1, force: bool = False,
+                  **options) -> List[FileResult]:
+    """Convert the inputs that are out of date, in jobs processes; results in input order"""
+    options = dict(dict(incremental=False, deterministic=False, repair=False,
+                        unit=ModelUnit.CENTIMETERS, cache_dir=None), **options)
+    paths = [input_file.path for input_file in inputs]
+    output_dirs = [os.path.join(output_dir, input_file.output_subdir) if input_file.output_subdir else output_dir
+                   for input_file in inputs]
+    outputs = [expected_outputs(path, directory) for path, directory in zip(paths, output_dirs)]
+    # Two inputs writing one file would overwrite each other, or race in parallel
+    conflicts = _output_conflicts(outputs, paths)
+
+    results: List[Optional[FileResult]] = [None] * len(inputs)
+    pending = []
+    for index, path in enumerate(paths):
+        if index in conflicts:
+            results[index] = FileResult(path, error=f"Output conflict: {conflicts[index]}")
+        elif not force and up_to_date(path, outputs[index]):
+            results[index] = FileResult(path, outputs[index], skipped=True)
+        else:
+            pending.append(index)
+
+    if jobs <= 1 or len(pending) < 2:
+        for index in pending:
+            results[index] = convert_file(paths[index], output_dirs[index], options)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            futures = {index: pool.submit(convert_file, paths[index], output_dirs[index], options)
+                       for index in pending}
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except Exception as e:  # The worker process died
+                    results[index] = FileResult(paths[index], error=f"{type(e).__name__}: {e}")
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0],
+                                     epilog="\n".join(__doc__.splitlines()[2:]),
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="SVG/IFC files, directories or glob patterns")
+    parser.add_argument("-o", "--output-dir", default="output", help="Directory of the converted files")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Files converted in parallel, 0 for one per CPU core")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("-f", "--force", action="store_true", help="Convert inputs even if up to date")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Patch existing IFC files instead of rewriting them (keeps GlobalIds)")
+    parser.add_argument("--deterministic", action="store_true", help="Reproducible GlobalIds and timestamps")
+    parser.add_argument("--repair", action="store_true", help="Repair self-touching space outlines")
+    parser.add_argument("--unit", choices=[unit.value for unit in ModelUnit], default=ModelUnit.CENTIMETERS.value,
+                        help="Unit of the SVG files written from IFC")
+    parser.add_argument("--cache-dir", help="Geometry cache for IFC to SVG conversions")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show per-space diagnostics")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    configure_logging(verbose=args.verbose)
+
+    inputs = collect_inputs(args.inputs, args.recursive)
+    if not inputs:
+        print("No SVG or IFC files found", file=sys.stderr)
+        return 2
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    results = convert_files(inputs, args.output_dir, jobs, args.force, incremental=args.incremental,
+                            deterministic=args.deterministic, repair=args.repair,
+                            unit=ModelUnit(args.unit), cache_dir=args.cache_dir)
+    for result in results:
+        print(result)
+
+    failed = sum(not result.ok for result in results)
+    skipped = sum(result.skipped for result in results)
+    print(f"{len(results) - failed - skipped} converted, {skipped} up to date, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
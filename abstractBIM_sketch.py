@@ -1,13 +1,17 @@
 import inkex
 import os
-from utils.convert_ifc_to_svg import process_ifc
-from utils.convert_svg_to_ifc import process_svg_layers
+# The converters load ifcopenshell, shapely and NumPy; they are imported by
+# the operations that need them, as Inkscape starts a new process every run
+from utils.instrumentation import configure_logging
 
 class AbstractBIMSketch(inkex.EffectExtension):
     def add_arguments(self, pars):
         # General arguments
         pars.add_argument("--ifc_file", type=inkex.Path, help="Path to the IFC file")
         pars.add_argument("--output_unit", type=str, default="centimeters", help="Unit for the output SVG")
+        pars.add_argument("--workers", type=int, default=1, help="Number of threads used to tessellate the IFC spaces")
+        pars.add_argument("--cache_dir", type=str, default="", help="Directory of the geometry cache (empty to disable)")
+        pars.add_argument("--verbose", type=inkex.Boolean, default=False, help="Show per-space diagnostics")
 
         # Operation selection
         pars.add_argument("--operation", type=str, default="process_ifc", 
@@ -19,32 +23,37 @@ class AbstractBIMSketch(inkex.EffectExtension):
         operation = self.options.operation
         ifc_file_path = self.options.ifc_file
         output_unit = self.options.output_unit
+        workers = self.options.workers
+        cache_dir = self.options.cache_dir or None
+        # Only warnings reach Inkscape's error dialog unless verbose is set
+        configure_logging(verbose=self.options.verbose)
 
         # Dispatch based on the operation selected
         if operation == "process_ifc":
-            self.process_ifc(ifc_file_path, output_unit)
+            self.process_ifc(ifc_file_path, output_unit, workers, cache_dir)
         elif operation == "other_function":
             self.other_function()
         else:
             inkex.errormsg(f"Unknown operation: {operation}")
 
-    def process_ifc(self, ifc_file_path, output_unit):
+    def process_ifc(self, ifc_file_path, output_unit, workers=1, cache_dir=None):
         """Process an IFC file and generate SVG."""
         # Validate the IFC file path
         if not os.path.isfile(ifc_file_path):
             inkex.errormsg(f"The file {ifc_file_path} does not exist.")
             return
 
-        # Process the IFC file
+        # Process the IFC file straight into lxml elements
         try:
-            svg_content = process_ifc(ifc_file_path, unit=output_unit)
+            from utils.convert_ifc_to_svg import process_ifc_to_element
+            svg_root = process_ifc_to_element(ifc_file_path, unit=output_unit, workers=workers,
+                                              cache_dir=cache_dir)
         except Exception as e:
             inkex.errormsg(f"Error processing IFC file: {e}")
             return
 
         # Add SVG content to the Inkscape document
         try:
-            svg_root = inkex.etree.fromstring(svg_content)
             self.svg.getroot().append(svg_root)
         except Exception as e:
             inkex.errormsg(f"Error adding SVG to Inkscape: {e}")
@@ -0,0 +1,56 @@
+"""Report entity counts, file size and write time of the IFC emission options.
+
+Compares the former output (no shared entities, separate Body and FootPrint
+polylines) with shared constant entities and the shared / indexed outlines.
+
+    python tests/bench_entity_interning.py [spaces]
+"""
+import sys
+import os
+import math
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_svg_to_ifc import entity_counts
+from synthetic_models import create_space_model
+
+
+CONFIGURATIONS = [
+    ("before", dict(share_entities=False, curve_mode="separate")),
+    ("interned", dict(share_entities=True, curve_mode="separate")),
+    ("shared", dict(share_entities=True, curve_mode="shared")),
+    ("indexed", dict(share_entities=True, curve_mode="indexed")),
+]
+
+
+def measure(space_count: int, directory: str, name: str, options: dict):
+    # Storeys of 100 rooms, so space_count is rounded up to a multiple of 100
+    storeys = [(f"Storey {s}", 3.0 * s) for s in range(math.ceil(space_count / 100))]
+    ifc_file = create_space_model(100, storeys, **options)
+    path = os.path.join(directory, f"{name}.ifc")
+    start = time.perf_counter()
+    ifc_file.write(path)
+    seconds = time.perf_counter() - start
+    return entity_counts(ifc_file), os.path.getsize(path), seconds
+
+
+if __name__ == "__main__":
+    space_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [measure(space_count, tmp, name, options) for name, options in CONFIGURATIONS]
+
+    names = [name for name, _ in CONFIGURATIONS]
+    all_counts = [counts for counts, _, _ in results]
+    entities = sorted({entity for counts in all_counts for entity in counts},
+                      key=lambda entity: -all_counts[0].get(entity, 0))
+
+    print(f"{math.ceil(space_count / 100) * 100} spaces")
+    print(f"{'entity':<28}" + "".join(f"{name:>10}" for name in names))
+    for entity in entities:
+        values = [counts.get(entity, 0) for counts in all_counts]
+        if len(set(values)) > 1:
+            print(f"{entity:<28}" + "".join(f"{value:>10}" for value in values))
+    print(f"{'total':<28}" + "".join(f"{sum(counts.values()):>10}" for counts in all_counts))
+    print(f"{'file size (MB)':<28}" + "".join(f"{size / 1e6:>10.2f}" for _, size, _ in results))
+    print(f"{'write time (ms)':<28}" + "".join(f"{seconds * 1000:>10.1f}" for _, _, seconds in results))
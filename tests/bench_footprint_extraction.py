@@ -0,0 +1,81 @@
+"""Benchmark bottom-face extraction on a dense freeform space.
+
+Compares the former per-triangle loop + unary_union with the vectorized
+boundary-edge outline in SVGGenerator._process_shape_geometry.
+
+    python tests/bench_footprint_extraction.py [vertices]
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import ifcopenshell.geom
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+from utils.convert_ifc_to_svg import SVGGenerator
+from utils.convert_svg_to_ifc import IfcModelCreator, Point3D
+
+
+def create_freeform_space(vertex_count: int):
+    """Create a model with one extruded blob-shaped space of vertex_count vertices"""
+    creator = IfcModelCreator()
+    creator.create_owner_history()
+    creator.create_project_context("Benchmark")
+    creator.create_spatial_hierarchy()
+    creator.create_storey("EG", 0.0)
+    storey = creator.storeys["EG"]
+
+    angles = np.linspace(0, 2 * np.pi, vertex_count, endpoint=False)
+    radius = 10 * (1 + 0.2 * np.sin(5 * angles))
+    coords = [Point3D(r * np.cos(a), r * np.sin(a)) for r, a in zip(radius, angles)]
+    coords.append(coords[0])
+
+    space = creator._create_spatial_element(
+        "IfcSpace", "Blob", creator._create_local_placement(storey.ObjectPlacement))
+    space.Representation = creator._create_space_geometry(coords, 3.0)
+    creator._create_aggregation(storey, [space])
+    return creator.ifc, space
+
+
+def loop_and_union(shape):
+    """The per-face implementation this benchmark measures against"""
+    vertices = np.array(shape.geometry.verts).reshape((-1, 3)) * 100
+    faces = np.array(shape.geometry.faces).reshape((-1, 3))
+    min_z = np.min(vertices[:, 2])
+    space_faces = []
+    for face in faces:
+        face_verts = vertices[face]
+        if np.allclose(face_verts[:, 2], min_z, rtol=1e-5):
+            poly = Polygon([(x, y) for x, y, z in face_verts])
+            if poly.is_valid:
+                space_faces.append(poly)
+    return unary_union(space_faces)
+
+
+def best_of(function, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    vertex_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    ifc_file, space = create_freeform_space(vertex_count)
+    generator = SVGGenerator()
+    shape = ifcopenshell.geom.create_shape(generator.settings, space)
+    print(f"{vertex_count} profile vertices, {len(shape.geometry.faces) // 3} triangles")
+
+    reference = loop_and_union(shape)
+    footprint = generator._process_shape_geometry(space, shape).footprint
+    assert footprint.symmetric_difference(reference).area < 1e-6 * reference.area
+
+    old = best_of(lambda: loop_and_union(shape))
+    new = best_of(lambda: generator._process_shape_geometry(space, shape))
+    print(f"loop + unary_union: {old * 1000:8.2f} ms")
+    print(f"boundary edges:     {new * 1000:8.2f} ms")
+    print(f"speedup:            {old / new:8.1f}x")
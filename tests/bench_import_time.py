@@ -0,0 +1,114 @@
+"""Benchmark the import time of the entry points with python -X importtime.
+
+Inkscape starts a new Python process for every extension run, so whatever
+the modules import at load time is paid on each click. Every entry point is
+imported in a fresh interpreter; the best cumulative time of --repeat runs
+is reported with the slowest modules it pulled in. The run fails if an entry
+point loads one of the heavy modules it is expected to defer.
+
+    python tests/bench_import_time.py [--entry extension] [--repeat 5] [--top 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Entry point -> (module, heavy modules it must not load)
+ENTRIES = {
+    "extension": ("abstractBIM_sketch", ["ifcopenshell", "shapely", "svgpathtools", "scipy", "svg.path"]),
+    "svg_to_ifc": ("utils.convert_svg_to_ifc", ["svgpathtools", "scipy", "svg.path"]),
+    "ifc_to_svg": ("utils.convert_ifc_to_svg", ["svgpathtools", "scipy", "svg.path"]),
+    "batch_cli": ("abstractBIM_batch", ["svgpathtools", "scipy", "svg.path"]),
+}
+HEAVY_MODULES = ["numpy", "shapely", "ifcopenshell", "ifcopenshell.geom", "svgpathtools", "scipy", "svg.path", "lxml"]
+
+
+class ImportLine(NamedTuple):
+    self_us: int
+    cumulative_us: int
+    module: str
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportLine]:
+    """Lines of -X importtime output; depth 0 are the modules imported directly"""
+    lines = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        lines.append(ImportLine(int(self_us), int(cumulative_us), module, depth))
+    return lines
+
+
+def import_once(module: str) -> Optional[dict]:
+    """Import module in a fresh interpreter; None if one of its dependencies is missing"""
+    code = (f"import sys, json; import {module}; "
+            f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))")
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        if "ModuleNotFoundError" in process.stderr:
+            return None
+        raise RuntimeError(f"Importing {module} failed:\n{process.stderr[-2000:]}")
+    lines = parse_importtime(process.stderr)
+    total = next(line.cumulative_us for line in reversed(lines) if line.module == module)
+    return {"total_us": total, "lines": lines, "loaded": json.loads(process.stdout.strip().splitlines()[-1])}
+
+
+def measure(module: str, repeat: int) -> Optional[dict]:
+    best = None
+    for _ in range(repeat):
+        run = import_once(module)
+        if run is None:
+            return None
+        if best is None or run["total_us"] < best["total_us"]:
+            best = run
+    return best
+
+
+def slowest_dependencies(lines: List[ImportLine], top: int) -> Dict[str, int]:
+    """Cumulative time of the top-level packages (e.g. ifcopenshell, not its submodules)"""
+    packages: Dict[str, int] = {}
+    for line in lines:
+        if line.depth >= 1:
+            package = line.module.split(".")[0]
+            if package in ("utils", "abstractBIM_sketch", "abstractBIM_batch"):
+                continue
+            packages[package] = max(packages.get(package, 0), line.cumulative_us)
+    return dict(sorted(packages.items(), key=lambda item: -item[1])[:top])
+
+
+def run(entries: List[str], repeat: int, top: int) -> int:
+    failed = False
+    for name in entries:
+        module, deferred = ENTRIES[name]
+        result = measure(module, repeat)
+        if result is None:
+            print(f"{name:<12} skipped, {module} needs a module that is not installed")
+            continue
+        unexpected = [m for m in result["loaded"] if m in deferred]
+        failed |= bool(unexpected)
+        dependencies = ", ".join(f"{package} {us / 1000:.0f}" for package, us in
+                                 slowest_dependencies(result["lines"], top).items())
+        print(f"{name:<12}{result['total_us'] / 1000:8.1f} ms  loads: {', '.join(result['loaded']) or '-'}")
+        print(f"{'':<12}slowest (ms): {dependencies}")
+        if unexpected:
+            print(f"{'':<12}REGRESSION: loads {', '.join(unexpected)} at import time")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entry", action="append", choices=sorted(ENTRIES),
+                        help="Entry point to measure (repeatable), all by default")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point, the best counts")
+    parser.add_argument("--top", type=int, default=5, help="Slowest dependencies shown per entry point")
+    args = parser.parse_args()
+    sys.exit(run(args.entry or list(ENTRIES), args.repeat, args.top))
@@ -0,0 +1,173 @@
+"""Benchmark suite on synthetic floor plans.
+
+Measures process_svg_layers, process_ifc and the SVG -> IFC -> SVG -> IFC
+round trip (incremental update of unchanged files) in spaces/sec, and the
+peak Python heap (tracemalloc, a separate run; ifcopenshell's C++ heap is
+not included). Results are compared with tests/bench_baselines.json so
+regressions show up. Throughput is stored relative to a calibration
+workload timed in the same run (spaces per calibration run), so the
+baselines carry over between machines; refresh them with --update-baselines.
+
+    python tests/bench_suite.py [--scenario NAME ...] [--update-baselines] [--tolerance 0.25]
+"""
+import sys
+import os
+import argparse
+import gc
+import json
+import math
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from utils.convert_ifc_to_svg import process_ifc
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import write_floor_plan_svg, write_ifc_models
+
+BASELINES_FILE = os.path.join(os.path.dirname(__file__), "bench_baselines.json")
+
+SCENARIOS = {
+    "small": dict(buildings=1, storeys=2, spaces_per_storey=25, vertices_per_space=4),
+    "wide": dict(buildings=1, storeys=1, spaces_per_storey=2000, vertices_per_space=4),
+    "tall": dict(buildings=2, storeys=20, spaces_per_storey=50, vertices_per_space=4),
+    "curved": dict(buildings=1, storeys=2, spaces_per_storey=200, vertices_per_space=64),
+}
+
+
+def space_count(layout: dict) -> int:
+    return layout["buildings"] * layout["storeys"] * layout["spaces_per_storey"]
+
+
+def svg_to_ifc(directory: str, layout: dict):
+    svg_file = os.path.join(directory, "plan.svg")
+    write_floor_plan_svg(svg_file, **layout)
+    output_dir = os.path.join(directory, "ifc")
+    return lambda: process_svg_layers(svg_file, output_dir)
+
+
+def ifc_to_svg(directory: str, layout: dict):
+    ifc_files = write_ifc_models(os.path.join(directory, "models"), **layout)
+    return lambda: [process_ifc(ifc_file) for ifc_file in ifc_files]
+
+
+def round_trip(directory: str, layout: dict):
+    svg_file = os.path.join(directory, "plan.svg")
+    write_floor_plan_svg(svg_file, **layout)
+    output_dir = os.path.join(directory, "round_trip")
+
+    def run():
+        results = process_svg_layers(svg_file, output_dir)
+        for index, result in enumerate(results):
+            exported = os.path.join(directory, f"export_{index}.svg")
+            with open(exported, "w", encoding="utf-8") as f:
+                process_ifc(result.ifc_file, output=f)
+            for update in process_svg_layers(exported, output_dir, incremental=True):
+                assert update.ok and update.update.touched == 0, update
+    return run
+
+
+BENCHMARKS = {"svg_to_ifc": svg_to_ifc, "ifc_to_svg": ifc_to_svg, "round_trip": round_trip}
+
+
+def calibration_workload() -> None:
+    """Fixed Python and numpy work that uses none of this repository's code"""
+    values = [((i * 7919) % 10007) / 3.0 for i in range(200_000)]
+    sorted(values)
+    json.loads(json.dumps(values))
+    sum(math.sqrt(value) for value in values)
+    points = np.random.default_rng(0).random((200_000, 2))
+    np.linalg.norm(points - points.mean(axis=0), axis=1).argsort()
+
+
+def calibrate(repeat: int) -> float:
+    """Seconds of the calibration workload, the unit relative throughput is given in"""
+    timings = []
+    for _ in range(max(repeat, 3)):
+        gc.collect()
+        start = time.perf_counter()
+        calibration_workload()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(function, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": min(timings), "peak_mb": peak / 1e6}
+
+
+def run_suite(scenarios, repeat: int) -> dict:
+    calibration = calibrate(repeat)
+    print(f"calibration run: {calibration * 1000:.1f} ms")
+    results = {}
+    for scenario in scenarios:
+        layout = SCENARIOS[scenario]
+        for name, setup in BENCHMARKS.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                result = measure(setup(tmp, layout), repeat)
+            result["spaces_per_sec"] = space_count(layout) / result["seconds"]
+            result["spaces_per_calibration"] = result["spaces_per_sec"] * calibration
+            results[f"{scenario}/{name}"] = result
+            print(f"{scenario + '/' + name:<22}{space_count(layout):>7} spaces "
+                  f"{result['spaces_per_sec']:>10.0f} spaces/s {result['spaces_per_calibration']:>8.1f} relative "
+                  f"{result['peak_mb']:>8.1f} MB peak")
+    return results
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list:
+    """Names of the benchmarks that got slower or bigger than tolerance allows"""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["spaces_per_calibration"] < baseline["spaces_per_calibration"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['spaces_per_calibration']:.1f} spaces per calibration run, "
+                               f"baseline {baseline['spaces_per_calibration']:.1f}")
+        if result["peak_mb"] > baseline["peak_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: {result['peak_mb']:.1f} MB peak, baseline {baseline['peak_mb']:.1f}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable), all by default")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark, the best counts")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown / growth")
+    parser.add_argument("--update-baselines", action="store_true", help="Store the results as new baselines")
+    args = parser.parse_args()
+
+    results = run_suite(args.scenario or list(SCENARIOS), args.repeat)
+
+    baselines = {}
+    if os.path.exists(BASELINES_FILE):
+        with open(BASELINES_FILE, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.update_baselines:
+        baselines.update({name: {"spaces_per_calibration": round(r["spaces_per_calibration"], 2),
+                                 "peak_mb": round(r["peak_mb"], 2)}
+                          for name, r in results.items()})
+        with open(BASELINES_FILE, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"Baselines written to {BASELINES_FILE}")
+        sys.exit(0)
+
+    regressions = compare(results, baselines, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
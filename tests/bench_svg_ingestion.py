@@ -0,0 +1,62 @@
+"""Benchmark SVG path ingestion on a large sketch.
+
+Compares the former lxml parse + svg2paths2 + d-string dict with the
+single-pass SVGPathCache used by process_svg_layers.
+
+    python tests/bench_svg_ingestion.py [paths]
+"""
+import sys
+import os
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from lxml import etree
+from svgpathtools import svg2paths2
+from utils.convert_svg_to_ifc import SVGPathCache
+from synthetic_models import write_floor_plan_svg
+
+
+def ingest_two_pass(file_name: str) -> int:
+    tree = etree.parse(file_name)
+    paths, attributes, svg_attributes = svg2paths2(file_name)
+    path_dict = {attr.get('d', ''): path for path, attr in zip(paths, attributes)}
+    found = 0
+    for elem in tree.getroot().iter('{http://www.w3.org/2000/svg}path'):
+        if path_dict.get(elem.get('d')) is not None:
+            found += 1
+    return found
+
+
+def ingest_single_pass(file_name: str) -> int:
+    tree = etree.parse(file_name)
+    path_cache = SVGPathCache()
+    found = 0
+    for elem in tree.getroot().iter('{http://www.w3.org/2000/svg}path'):
+        if path_cache.get(elem) is not None:
+            found += 1
+    return found
+
+
+def best_of(function, repeat: int = 3) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == "__main__":
+    path_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        file_name = os.path.join(tmp, "sketch.svg")
+        write_floor_plan_svg(file_name, spaces_per_storey=path_count, vertices_per_space=6)
+        assert ingest_two_pass(file_name) == ingest_single_pass(file_name) == path_count
+
+        old = best_of(lambda: ingest_two_pass(file_name))
+        new = best_of(lambda: ingest_single_pass(file_name))
+    print(f"{path_count} paths")
+    print(f"lxml + svg2paths2: {old * 1000:8.1f} ms")
+    print(f"single pass:       {new * 1000:8.1f} ms")
+    print(f"speedup:           {old / new:8.1f}x")
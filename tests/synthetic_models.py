@@ -0,0 +1,156 @@
+"""Synthetic floor plans for tests and benchmarks.
+
+Sketches and IFC models are laid out the same way: every storey holds a grid
+of rooms, each room a convex outline with vertices_per_space vertices
+(4 gives plain rectangles). The small hand-laid models below them are the
+ones tests assert exact geometry, ids and elevations on.
+"""
+import sys
+import os
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from utils.convert_svg_to_ifc import IfcModelCreator, Point3D
+from utils.polygon_array import PolygonArray
+
+ROOM_WIDTH = 500.0  # cm
+ROOM_DEPTH = 400.0  # cm
+ROOM_GAP = 25.0  # cm, wall between two rooms
+STOREY_HEIGHT = 300.0  # cm
+SPACE_HEIGHT = 280.0  # cm
+
+
+def room_outline(index: int, spaces_per_storey: int, vertices_per_space: int) -> np.ndarray:
+    """Open (N, 2) outline of a room in cm, y pointing down like in the sketch"""
+    columns = max(1, math.ceil(math.sqrt(spaces_per_storey)))
+    x0 = (index % columns) * (ROOM_WIDTH + ROOM_GAP)
+    y0 = (index // columns) * (ROOM_DEPTH + ROOM_GAP)
+    if vertices_per_space == 4:
+        corners = [(0, 0), (ROOM_WIDTH, 0), (ROOM_WIDTH, ROOM_DEPTH), (0, ROOM_DEPTH)]
+        return np.array(corners) + (x0, y0)
+
+    # Superellipse: convex, rounded corners, no three vertices collinear
+    angles = np.linspace(0, 2 * np.pi, vertices_per_space, endpoint=False)
+    cos, sin = np.cos(angles), np.sin(angles)
+    x = np.sign(cos) * np.abs(cos) ** 0.5
+    y = np.sign(sin) * np.abs(sin) ** 0.5
+    return np.column_stack([x0 + (x + 1) * ROOM_WIDTH / 2, y0 + (y + 1) * ROOM_DEPTH / 2])
+
+
+def floor_plan_svg(buildings: int = 1, storeys: int = 1, spaces_per_storey: int = 10,
+                   vertices_per_space: int = 4, project_name: str = "Synthetic") -> str:
+    """An SVG sketch with the Project/Site/Building/Storey/Spaces layer structure"""
+    parts = [
+        '<svg xmlns="http://www.w3.org/2000/svg"\n'
+        '    xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">\n'
+        f'<g inkscape:label="Project={project_name}">\n'
+        '<g inkscape:label="Site=Site">\n'
+    ]
+    for b in range(buildings):
+        parts.append(f'<g inkscape:label="Building=B{b}">\n')
+        for s in range(storeys):
+            parts.append(f'<g inkscape:label="Storey=S{s}, Z={s * STOREY_HEIGHT:.0f}">\n'
+                         f'<g inkscape:label="Spaces, h={SPACE_HEIGHT:.0f}, relZ=0">\n')
+            for r in range(spaces_per_storey):
+                outline = room_outline(r, spaces_per_storey, vertices_per_space)
+                d = " L ".join(f"{x:.3f},{y:.3f}" for x, y in outline)
+                parts.append(f'<path id="b{b}s{s}r{r}" inkscape:label="Room {s}.{r}" d="M {d} Z" />\n')
+            parts.append('</g>\n</g>\n')
+        parts.append('</g>\n')
+    parts.append('</g>\n</g>\n</svg>\n')
+    return "".join(parts)
+
+
+def write_floor_plan_svg(file_name: str, **layout) -> None:
+    with open(file_name, "w", encoding="utf-8") as f:
+        f.write(floor_plan_svg(**layout))
+
+
+def create_ifc_model(storeys: int = 1, spaces_per_storey: int = 10, vertices_per_space: int = 4,
+                     project_name: str = "Synthetic", building_name: str = "B0"):
+    """One building with extruded IfcSpaces, in metres"""
+    creator = IfcModelCreator()
+    creator.create_owner_history()
+    creator.create_project_context(project_name)
+    creator.create_spatial_hierarchy("Site", building_name)
+    for s in range(storeys):
+        storey_name = f"S{s}"
+        z = s * STOREY_HEIGHT / 100
+        creator.create_storey(storey_name, z)
+        for r in range(spaces_per_storey):
+            # Same coordinates the sketch converter produces (it does not flip y)
+            outline = room_outline(r, spaces_per_storey, vertices_per_space) / 100
+            coords = PolygonArray(outline).closed().with_z(z)
+            creator.create_space(coords, SPACE_HEIGHT / 100, storey_name, f"Room {s}.{r}")
+    return creator.ifc
+
+
+def write_ifc_models(directory: str, buildings: int = 1, project_name: str = "Synthetic",
+                     **layout) -> List[str]:
+    """One {project}_{building}.ifc per building, named like process_svg_layers output"""
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for b in range(buildings):
+        file_name = os.path.join(directory, f"{project_name}_B{b}.ifc")
+        create_ifc_model(project_name=project_name, building_name=f"B{b}", **layout).write(file_name)
+        files.append(file_name)
+    return files
+
+
+def create_space_model(rooms_per_storey: int = 3,
+                       storeys: Sequence[Tuple[str, float]] = (("EG", 0.0), ("OG", 3.0)), **options):
+    """Small in-memory model: 4 x 3 m rooms, 2.5 m high and 5 m apart, on each (name, z) storey.
+
+    options are passed to IfcModelCreator.
+    """
+    creator = IfcModelCreator(**options)
+    creator.create_owner_history()
+    creator.create_project_context("Test Project")
+    creator.create_spatial_hierarchy("Test Site", "Test Building")
+    for storey_name, z in storeys:
+        creator.create_storey(storey_name, z)
+        for i in range(rooms_per_storey):
+            x = i * 5.0
+            coords = [Point3D(x, 0, z), Point3D(x + 4, 0, z), Point3D(x + 4, 3, z),
+                      Point3D(x, 3, z), Point3D(x, 0, z)]
+            creator.create_space(coords, 2.5, storey_name, f"Room {storey_name}.{i}")
+    return creator.ifc
+
+
+# (id, label, x, width) of a 300 cm deep rectangle; an id of None writes none
+SketchRoom = Tuple[Optional[str], str, float, float]
+
+
+def sketch_svg(buildings: Dict[str, Sequence[Tuple[str, object, Sequence[SketchRoom]]]],
+               project_name: str = "P", site_name: str = "S") -> str:
+    """A sketch of {building: [(storey, z, rooms)]}; z is written as given, so it may be invalid"""
+    parts = []
+    for building, storeys in buildings.items():
+        parts.append(f'<g inkscape:label="Building={building}">')
+        for storey, z, rooms in storeys:
+            parts.append(f'<g inkscape:label="Storey={storey}, Z={z}"><g inkscape:label="Spaces, h=300, relZ=0">')
+            for element_id, label, x, width in rooms:
+                id_attribute = f'id="{element_id}" ' if element_id is not None else ""
+                parts.append(f'<rect {id_attribute}inkscape:label="{label}" x="{x}" y="0" '
+                             f'width="{width}" height="300" />')
+            parts.append('</g></g>')
+        parts.append('</g>')
+    return f'''<svg xmlns="http://www.w3.org/2000/svg"
+    xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">
+  <g inkscape:label="Project={project_name}"><g inkscape:label="Site={site_name}">{"".join(parts)}</g></g>
+</svg>'''
+
+
+def write_sketch(file_name: str, buildings: Dict[str, Sequence[Tuple[str, object, Sequence[SketchRoom]]]],
+                 **names) -> None:
+    with open(file_name, "w", encoding="utf-8") as f:
+        f.write(sketch_svg(buildings, **names))
+
+
+def write_campus(file_name: str) -> None:
+    """Buildings A, B and C with one room each; B has an invalid storey elevation"""
+    write_sketch(file_name, {name: [("EG", z, [(None, f"Room {name}", 0, 400)])]
+                             for name, z in [("A", 0), ("B", "not-a-number"), ("C", 300)]},
+                 project_name="Campus", site_name="Site")
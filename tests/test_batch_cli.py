@@ -0,0 +1,113 @@
+import sys
+import os
+import logging
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from abstractBIM_batch import collect_inputs, main
+from synthetic_models import write_floor_plan_svg, write_ifc_models
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """main() installs a stderr handler; later tests expect the library to be silent"""
+    yield
+    package_logger = logging.getLogger("utils")
+    for handler in package_logger.handlers[:]:
+        if not isinstance(handler, logging.NullHandler):
+            package_logger.removeHandler(handler)
+    package_logger.setLevel(logging.NOTSET)
+
+
+def _age(file_name, seconds):
+    """Move a file's mtime into the past, so anything written now is newer"""
+    mtime = os.path.getmtime(file_name) - seconds
+    os.utime(file_name, (mtime, mtime))
+
+
+def test_converts_sketch_then_skips_it_until_touched(tmp_path, capsys):
+    sketch = str(tmp_path / "plan.svg")
+    output_dir = str(tmp_path / "out")
+    write_floor_plan_svg(sketch, buildings=2, spaces_per_storey=3)
+    _age(sketch, 10)
+
+    assert main([sketch, "-o", output_dir]) == 0
+    outputs = sorted(os.listdir(output_dir))
+    assert outputs == ["Synthetic_B0.ifc", "Synthetic_B1.ifc"]
+    assert "1 converted, 0 up to date, 0 failed" in capsys.readouterr().out
+
+    assert main([sketch, "-o", output_dir]) == 0
+    assert "0 converted, 1 up to date, 0 failed" in capsys.readouterr().out
+
+    # Editing the sketch makes it newer than its outputs
+    for output in outputs:
+        _age(os.path.join(output_dir, output), 20)
+    assert main([sketch, "-o", output_dir]) == 0
+    assert "1 converted, 0 up to date" in capsys.readouterr().out
+
+    assert main([sketch, "-o", output_dir, "--force"]) == 0
+    assert "1 converted" in capsys.readouterr().out
+
+
+def test_converts_ifc_directory_in_parallel(tmp_path, capsys):
+    inputs = str(tmp_path / "models")
+    output_dir = str(tmp_path / "out")
+    write_ifc_models(inputs, buildings=3, spaces_per_storey=2)
+
+    assert main([inputs, "-o", output_dir, "--jobs", "2"]) == 0
+    assert sorted(os.listdir(output_dir)) == ["Synthetic_B0.svg", "Synthetic_B1.svg", "Synthetic_B2.svg"]
+    with open(os.path.join(output_dir, "Synthetic_B0.svg"), encoding="utf-8") as f:
+        assert "Room 0.1" in f.read()
+    assert "3 converted, 0 up to date, 0 failed" in capsys.readouterr().out
+
+
+def test_failures_set_exit_status_and_leave_no_output(tmp_path, capsys):
+    broken = tmp_path / "broken.ifc"
+    broken.write_text("not an IFC file")
+    sketch = str(tmp_path / "plan.svg")
+    write_floor_plan_svg(sketch, spaces_per_storey=2)
+    output_dir = str(tmp_path / "out")
+
+    assert main([str(tmp_path / "*.*"), "-o", output_dir]) == 1
+    out = capsys.readouterr().out
+    assert "FAILED  " + str(broken) in out
+    assert "1 converted, 0 up to date, 1 failed" in out
+    assert sorted(os.listdir(output_dir)) == ["Synthetic_B0.ifc"]
+
+    assert main([str(tmp_path / "missing.svg"), "-o", output_dir]) == 1
+    assert main([str(tmp_path / "nothing" / "*.svg"), "-o", output_dir]) == 2
+
+
+def test_collect_inputs(tmp_path):
+    (tmp_path / "a.svg").write_text("")
+    (tmp_path / "b.IFC").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.svg").write_text("")
+
+    directory = str(tmp_path)
+    assert collect_inputs([directory]) == [(str(tmp_path / "a.svg"), ""), (str(tmp_path / "b.IFC"), "")]
+    assert (str(tmp_path / "sub" / "c.svg"), "sub") in collect_inputs([directory], recursive=True)
+    assert collect_inputs([str(tmp_path / "**" / "*.svg")])[-1] == (str(tmp_path / "sub" / "c.svg"), "sub")
+    # Duplicates are converted once
+    assert collect_inputs([str(tmp_path / "*.svg"), str(tmp_path / "a.svg")]) == [(str(tmp_path / "a.svg"), "")]
+
+
+def test_same_names_in_different_directories(tmp_path, capsys):
+    inputs = tmp_path / "models"
+    write_ifc_models(str(inputs / "a"), spaces_per_storey=2)
+    write_ifc_models(str(inputs / "b"), spaces_per_storey=3)
+    output_dir = tmp_path / "out"
+
+    # Mirrored below the output directory, so nothing is overwritten
+    assert main([str(inputs), "--recursive", "-o", str(output_dir), "--jobs", "2"]) == 0
+    assert "2 converted" in capsys.readouterr().out
+    assert "Room 0.2" not in (output_dir / "a" / "Synthetic_B0.svg").read_text(encoding="utf-8")
+    assert "Room 0.2" in (output_dir / "b" / "Synthetic_B0.svg").read_text(encoding="utf-8")
+
+    # Named one by one they would write the same file: both fail, nothing is written
+    files = [str(inputs / "a" / "Synthetic_B0.ifc"), str(inputs / "b" / "Synthetic_B0.ifc")]
+    assert main(files + ["-o", str(tmp_path / "flat"), "--jobs", "2"]) == 1
+    out = capsys.readouterr().out
+    assert out.count("Output conflict") == 2
+    assert not (tmp_path / "flat").exists()
@@ -0,0 +1,79 @@
+import sys
+import os
+import numpy as np
+import pytest
+import shapely
+from svgpathtools import parse_path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_svg_to_ifc import SVGGeometryParser
+
+# Room outlines in cm: a quarter circle of 300 cm radius and a Bézier bay window
+CURVED_PATHS = [
+    "M 0,0 L 300,0 A 300,300 0 0 1 0,300 Z",
+    "M 0,0 L 400,0 C 450,100 450,200 400,300 L 0,300 Z",
+    "M 0,0 L 400,0 Q 500,150 400,300 L 0,300 Z",
+]
+
+
+def deviation(path, outline: np.ndarray) -> float:
+    """Largest distance (m) from points along the exact path to the flattened outline"""
+    exact = np.array([segment.point(t) for segment in path for t in np.linspace(0, 1, 200)]) / 100
+    ring = shapely.LinearRing(outline[:, :2])
+    return float(shapely.distance(ring, shapely.points(exact.real, exact.imag)).max())
+
+
+@pytest.mark.parametrize("d", CURVED_PATHS)
+@pytest.mark.parametrize("tolerance", [0.05, 0.01, 0.001])
+def test_curves_stay_within_tolerance(d, tolerance):
+    path = parse_path(d)
+    outline = SVGGeometryParser(curve_tolerance=tolerance).parse_path(path).coords
+
+    assert deviation(path, outline) <= tolerance
+    # Chords scale with 1 / sqrt(tolerance): a quarter of the tolerance needs about twice as many
+    chords = SVGGeometryParser(curve_tolerance=tolerance / 4).parse_path(path)
+    assert len(outline) < len(chords)
+
+
+def test_quarter_circle_vertex_count():
+    parser = SVGGeometryParser(curve_tolerance=0.01)
+    outline = parser.parse_path(parse_path(CURVED_PATHS[0]))
+    # r = 3 m, 1 cm sagitta: chords of 2 acos(1 - 0.01 / 3) = 0.163 rad, 10 for 90°
+    assert len(outline) == 2 + 10 + 1
+
+
+def test_no_tolerance_keeps_segment_ends():
+    outline = SVGGeometryParser(curve_tolerance=None).parse_path(parse_path(CURVED_PATHS[1]))
+    np.testing.assert_allclose(outline.coords, [[0, 0], [4, 0], [4, 3], [0, 3], [0, 0]])
+
+
+def test_straight_lines_are_not_subdivided():
+    outline = SVGGeometryParser(curve_tolerance=0.0001).parse_path(parse_path("M 0,0 H 900 V 600 H 0 Z"))
+    assert len(outline) == 5
+
+
+def test_tolerance_holds_inside_scaled_groups(tmp_path):
+    from utils.convert_svg_to_ifc import process_svg_layers
+    import ifcopenshell
+
+    # A circle of 10 cm radius drawn inside a group scaled by 20 is 2 m wide in the model
+    svg_file = tmp_path / "scaled.svg"
+    svg_file.write_text('''<svg xmlns="http://www.w3.org/2000/svg"
+    xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">
+  <g inkscape:label="Project=P"><g inkscape:label="Site=S"><g inkscape:label="Building=B">
+    <g inkscape:label="Storey=EG, Z=0"><g inkscape:label="Spaces, h=300, relZ=0">
+      <g transform="scale(20)"><path id="round" inkscape:label="Round"
+         d="M 20,10 A 10,10 0 0 1 0,10 A 10,10 0 0 1 20,10 Z" /></g>
+    </g></g>
+  </g></g></g>
+</svg>''', encoding="utf-8")
+    [result] = process_svg_layers(str(svg_file), str(tmp_path), curve_tolerance=0.01, simplify_tolerance=0.0)
+
+    [space] = ifcopenshell.open(result.ifc_file).by_type("IfcSpace")
+    [body] = [rep for rep in space.Representation.Representations if rep.RepresentationIdentifier == "Body"]
+    curve = body.Items[0].SweptArea.OuterCurve
+    coords = curve.Points.CoordList if curve.is_a("IfcIndexedPolyCurve") else [p.Coordinates for p in curve.Points]
+    outline = np.array(coords)[:, :2]
+    exact = np.exp(1j * np.linspace(0, 2 * np.pi, 720)) * 2.0 + (2.0 + 2.0j)
+    ring = shapely.LinearRing(outline)
+    assert float(shapely.distance(ring, shapely.points(exact.real, exact.imag)).max()) <= 0.01
@@ -0,0 +1,62 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ifcopenshell
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import write_sketch
+
+
+def _convert(tmp_path, name, rooms, **options):
+    svg_file = str(tmp_path / f"{name}.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, rooms)]})
+    output_dir = tmp_path / name
+    [result] = process_svg_layers(svg_file, str(output_dir), **options)
+    assert result.ok
+    with open(result.ifc_file, "rb") as f:
+        return f.read(), ifcopenshell.open(result.ifc_file)
+
+
+def test_same_sketch_gives_identical_bytes(tmp_path):
+    rooms = [("rect1", "A", 0, 400), ("rect2", "B", 500, 400)]
+    first, _ = _convert(tmp_path, "first", rooms, deterministic=True)
+    second, _ = _convert(tmp_path, "second", rooms, deterministic=True)
+    random, _ = _convert(tmp_path, "random", rooms)
+
+    assert first == second
+    assert first != random
+
+
+def test_guids_follow_element_ids(tmp_path):
+    _, before = _convert(tmp_path, "before", [("rect1", "A", 0, 400), ("rect2", "B", 500, 400)],
+                         deterministic=True)
+    # Adding a room and reshaping another keeps the GlobalIds of everything else
+    _, after = _convert(tmp_path, "after", [("rect0", "New", -500, 400), ("rect1", "A", 0, 400),
+                                            ("rect2", "B", 500, 450)], deterministic=True)
+
+    def guids(model):
+        return {entity.Name: entity.GlobalId for entity in model.by_type("IfcSpatialStructureElement")}
+
+    before_guids, after_guids = guids(before), guids(after)
+    assert {name: after_guids[name] for name in before_guids} == before_guids
+    assert len(set(after_guids.values())) == len(after_guids)
+    relationships = {rel.GlobalId for rel in after.by_type("IfcRelAggregates")}
+    assert {rel.GlobalId for rel in before.by_type("IfcRelAggregates")} <= relationships
+
+
+def test_update_gives_the_guids_of_a_full_conversion(tmp_path):
+    svg_file = str(tmp_path / "sketch.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, [("rect1", "A", 0, 400), ("rect2", "B", 500, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path / "updated"), deterministic=True)
+    # New room on an existing storey, a reshaped room and a new storey with a room
+    write_sketch(svg_file, {"B": [("EG", 0, [("rect1", "A", 0, 400), ("rect2", "B", 600, 400),
+                                             ("rect3", "C", 1000, 400)]),
+                                  ("OG", 300, [("rect4", "D", 0, 400)])]})
+    [updated] = process_svg_layers(svg_file, str(tmp_path / "updated"), incremental=True, deterministic=True)
+    [full] = process_svg_layers(svg_file, str(tmp_path / "full"), deterministic=True)
+
+    def guids(ifc_file):
+        return sorted((entity.is_a(), entity.GlobalId) for entity in ifcopenshell.open(ifc_file).by_type("IfcRoot"))
+
+    assert len(updated.update.added) == 2
+    assert guids(updated.ifc_file) == guids(full.ifc_file)
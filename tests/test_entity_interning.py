@@ -0,0 +1,93 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from utils.convert_ifc_to_svg import SVGGenerator
+from utils.convert_svg_to_ifc import IfcModelCreator, Point3D, entity_counts, CURVE_MODES
+from synthetic_models import create_space_model
+
+GROUND_FLOOR = [("EG", 0.0)]
+
+
+def test_constant_entities_do_not_grow_with_space_count():
+    few = entity_counts(create_space_model(2, GROUND_FLOOR, share_entities=True))
+    many = entity_counts(create_space_model(20, GROUND_FLOOR, share_entities=True))
+
+    assert few["IfcDirection"] == many["IfcDirection"] == 2
+    assert few["IfcAxis2Placement3D"] == many["IfcAxis2Placement3D"]
+
+
+def test_sharing_keeps_the_geometry():
+    shared = create_space_model(5, GROUND_FLOOR, share_entities=True)
+    unshared = create_space_model(5, GROUND_FLOOR, share_entities=False)
+    assert len(list(shared)) < len(list(unshared))
+
+    generator = SVGGenerator()
+    footprints = [
+        [generator._process_shape_geometry(space, shape).footprint.wkt
+         for space, shape in generator.iter_space_shapes(model, model.by_type("IfcSpace"))]
+        for model in (shared, unshared)
+    ]
+    assert footprints[0] == footprints[1]
+
+
+@pytest.mark.parametrize("curve_mode", CURVE_MODES)
+def test_curve_modes_keep_the_geometry(curve_mode):
+    reference = create_space_model(3, GROUND_FLOOR, curve_mode="separate")
+    model = create_space_model(3, GROUND_FLOOR, curve_mode=curve_mode)
+
+    generator = SVGGenerator()
+    footprints = [
+        [generator._process_shape_geometry(space, shape).footprint.wkt
+         for space, shape in generator.iter_space_shapes(m, m.by_type("IfcSpace"))]
+        for m in (reference, model)
+    ]
+    assert footprints[0] == footprints[1]
+
+    for space in model.by_type("IfcSpace"):
+        body, footprint = space.Representation.Representations
+        outline = body.Items[0].SweptArea.OuterCurve
+        assert (footprint.Items[0] == outline) == (curve_mode != "separate")
+
+
+def test_shared_outline_halves_the_profile_points():
+    separate = entity_counts(create_space_model(10, GROUND_FLOOR, curve_mode="separate"))
+    shared = entity_counts(create_space_model(10, GROUND_FLOOR, curve_mode="shared"))
+    indexed = entity_counts(create_space_model(10, GROUND_FLOOR, curve_mode="indexed"))
+
+    assert separate["IfcPolyline"] == 2 * shared["IfcPolyline"] == 20
+    assert separate["IfcCartesianPoint"] - shared["IfcCartesianPoint"] == 10 * 4
+    assert "IfcPolyline" not in indexed
+    assert indexed["IfcCartesianPointList2D"] == 10
+
+
+def test_indexed_curves_need_ifc4():
+    with pytest.raises(ValueError):
+        IfcModelCreator(schema="IFC2X3", curve_mode="indexed")
+
+
+def test_one_aggregation_per_parent():
+    model = create_space_model(20, GROUND_FLOOR)
+
+    relationships = model.by_type("IfcRelAggregates")
+    parents = [rel.RelatingObject for rel in relationships]
+    assert len(parents) == len(set(parents)) == 4  # project, site, building and storey
+    storey = model.by_type("IfcBuildingStorey")[0]
+    assert len(storey.IsDecomposedBy[0].RelatedObjects) == 20
+
+
+def test_reading_the_model_mid_build_keeps_one_aggregation_per_parent():
+    creator = IfcModelCreator()
+    creator.create_owner_history()
+    creator.create_project_context("Test Project")
+    creator.create_spatial_hierarchy("Test Site", "Test Building")
+    creator.create_storey("EG", 0.0)
+    for i in range(4):
+        coords = [Point3D(i * 5.0, 0), Point3D(i * 5.0 + 4, 0), Point3D(i * 5.0 + 4, 3), Point3D(i * 5.0, 3),
+                  Point3D(i * 5.0, 0)]
+        creator.create_space(coords, 2.5, "EG", f"Room {i}")
+        # Every access sees the spatial structure built so far
+        [storey] = creator.ifc.by_type("IfcBuildingStorey")
+        assert len(storey.IsDecomposedBy) == 1
+        assert len(storey.IsDecomposedBy[0].RelatedObjects) == i + 1
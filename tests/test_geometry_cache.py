@@ -0,0 +1,78 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_ifc_to_svg import SVGGenerator
+from utils.geometry_cache import GeometryCache
+from synthetic_models import create_space_model
+
+
+def test_unchanged_spaces_skip_tessellation(tmp_path):
+    ifc_file = create_space_model()
+    first = SVGGenerator(cache=GeometryCache(str(tmp_path)))
+    expected = first.get_spaces_by_storey(ifc_file)
+
+    cache = GeometryCache(str(tmp_path))
+    second = SVGGenerator(cache=cache)
+    cached = second.get_spaces_by_storey(ifc_file)
+
+    assert second.tessellation_count == 0
+    assert cache.stats.hits == 6 and cache.stats.misses == 0
+    assert cached == expected
+
+
+def test_moved_placement_changes_key(tmp_path):
+    ifc_file = create_space_model(rooms_per_storey=1)
+    cache = GeometryCache(str(tmp_path))
+    space = ifc_file.by_type("IfcSpace")[0]
+    key = cache.space_key(ifc_file, space)
+
+    storey = space.Decomposes[0].RelatingObject
+    storey.ObjectPlacement.RelativePlacement.Location.Coordinates = (0.0, 0.0, 1.0)
+
+    assert GeometryCache(str(tmp_path)).space_key(ifc_file, space) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    ifc_file = create_space_model()
+    generator = SVGGenerator(cache=GeometryCache(str(tmp_path)))
+    generator.get_spaces_by_storey(ifc_file)
+
+    cache = GeometryCache(str(tmp_path), max_bytes=1)
+
+    assert cache.stats.evictions == 5
+    assert len(cache._entries) == 1
+
+
+def test_reused_cache_sees_an_edited_model(tmp_path):
+    ifc_file = create_space_model(rooms_per_storey=1)
+    generator = SVGGenerator(cache=GeometryCache(str(tmp_path)))
+    before = generator.get_spaces_by_storey(ifc_file)
+
+    # Widen the first profile point of one space from x=0 to x=-5
+    space = ifc_file.by_type("IfcSpace")[0]
+    [body] = [rep for rep in space.Representation.Representations if rep.RepresentationIdentifier == "Body"]
+    points = body.Items[0].SweptArea.OuterCurve.Points
+    for point in (points[0], points[-1]):
+        point.Coordinates = (-5.0, 0.0)
+
+    after = generator.get_spaces_by_storey(ifc_file)
+
+    assert generator.tessellation_count == 3
+    assert after != before
+
+
+def test_foreign_json_files_are_never_touched(tmp_path):
+    own = tmp_path / "project.json"
+    own.write_text("{}")
+    (tmp_path / "ab").mkdir()
+    nested = tmp_path / "ab" / "settings.json"
+    nested.write_text("{}")
+    ifc_file = create_space_model()
+    SVGGenerator(cache=GeometryCache(str(tmp_path))).get_spaces_by_storey(ifc_file)
+
+    cache = GeometryCache(str(tmp_path), max_bytes=1)
+    assert len(cache._entries) == 1
+    cache.clear()
+
+    assert own.exists() and nested.exists()
@@ -0,0 +1,134 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ifcopenshell
+import ifcopenshell.guid
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import create_space_model, write_sketch
+
+GUIDS = [ifcopenshell.guid.new() for _ in range(4)]
+
+
+def test_update_touches_only_the_diff(tmp_path):
+    svg_file = str(tmp_path / "sketch.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, [(GUIDS[0], "A", 0, 400), (GUIDS[1], "B", 500, 400),
+                                             (GUIDS[2], "C", 1000, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path))
+    original = ifcopenshell.open(result.ifc_file)
+    assert sorted(space.GlobalId for space in original.by_type("IfcSpace")) == sorted(GUIDS[:3])
+    unchanged_shape = original.by_guid(GUIDS[0]).Representation.id()
+
+    # A unchanged, B wider, C renamed and moved, D new
+    write_sketch(svg_file, {"B": [("EG", 0, [(GUIDS[0], "A", 0, 400), (GUIDS[1], "B", 500, 450),
+                                             (GUIDS[3], "D", 1000, 400), (GUIDS[2], "C2", 1500, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+
+    assert result.ok
+    assert result.update.unchanged == 1
+    assert sorted(result.update.changed) == sorted([GUIDS[1], GUIDS[2]])
+    assert result.update.added == [GUIDS[3]]
+
+    updated = ifcopenshell.open(result.ifc_file)
+    assert sorted(space.GlobalId for space in updated.by_type("IfcSpace")) == sorted(GUIDS)
+    assert updated.by_guid(GUIDS[0]).Representation.id() == unchanged_shape
+    assert updated.by_guid(GUIDS[2]).LongName == "C2"
+    assert len(updated.by_type("IfcProductDefinitionShape")) == 4
+    # New spaces join the storey's existing aggregation
+    [storey] = updated.by_type("IfcBuildingStorey")
+    assert len(storey.IsDecomposedBy) == 1
+    assert len(storey.IsDecomposedBy[0].RelatedObjects) == 4
+
+    # Removing a space deletes its geometry and relationship membership
+    write_sketch(svg_file, {"B": [("EG", 0, [(GUIDS[0], "A", 0, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert sorted(result.update.removed) == sorted(GUIDS[1:])
+    updated = ifcopenshell.open(result.ifc_file)
+    assert [space.GlobalId for space in updated.by_type("IfcSpace")] == [GUIDS[0]]
+    assert len(updated.by_type("IfcProductDefinitionShape")) == 1
+    assert len(updated.by_type("IfcExtrudedAreaSolid")) == 1
+    related = [obj for rel in updated.by_type("IfcRelAggregates") for obj in rel.RelatedObjects]
+    assert all(obj is not None for obj in related)
+
+
+def test_unchanged_sketch_does_not_rewrite_the_file(tmp_path):
+    svg_file = str(tmp_path / "sketch.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, [(GUIDS[0], "A", 0, 400), (GUIDS[1], "B", 500, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path))
+    os.utime(result.ifc_file, (0, 0))
+
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+
+    assert result.update.touched == 0
+    assert os.path.getmtime(result.ifc_file) == 0
+
+
+def test_round_trip_through_svg_export_is_unchanged(tmp_path):
+    from utils.convert_ifc_to_svg import process_ifc
+    from utils.unit_class import ModelUnit
+
+    ifc_file = str(tmp_path / "Test Project_Test Building.ifc")
+    create_space_model().write(ifc_file)
+    svg_file = str(tmp_path / "export.svg")
+    with open(svg_file, "w", encoding="utf-8") as f:
+        f.write(process_ifc(ifc_file, ModelUnit.CENTIMETERS))
+
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+
+    assert result.ok
+    assert result.update.unchanged == 6
+    assert result.update.touched == 0
+
+
+def _elevations(ifc_file: str):
+    model = ifcopenshell.open(ifc_file)
+    return {storey.Name: storey.ObjectPlacement.RelativePlacement.Location.Coordinates[2]
+            for storey in model.by_type("IfcBuildingStorey")}
+
+
+def test_storey_changes_are_written(tmp_path):
+    svg_file = str(tmp_path / "sketch.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, [(GUIDS[0], "A", 0, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path))
+
+    # Only the storey's Z changes
+    write_sketch(svg_file, {"B": [("EG", 500, [(GUIDS[0], "A", 0, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert result.update.storeys_moved == ["EG"]
+    assert result.update.touched == 1
+    assert _elevations(result.ifc_file) == {"EG": 5.0}
+
+    # A new storey without spaces is kept
+    write_sketch(svg_file, {"B": [("EG", 500, [(GUIDS[0], "A", 0, 400)]), ("OG", 800, [])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert result.update.storeys_added == ["OG"]
+    assert _elevations(result.ifc_file) == {"EG": 5.0, "OG": 8.0}
+
+    # Storeys dropped from the sketch are removed with their spaces
+    write_sketch(svg_file, {"B": [("OG", 800, [])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert result.update.storeys_removed == ["EG"]
+    assert result.update.removed == [GUIDS[0]]
+    assert _elevations(result.ifc_file) == {"OG": 8.0}
+    [building] = ifcopenshell.open(result.ifc_file).by_type("IfcBuilding")
+    assert [obj.Name for rel in building.IsDecomposedBy for obj in rel.RelatedObjects] == ["OG"]
+
+
+def test_hand_drawn_spaces_keep_their_globalids(tmp_path):
+    svg_file = str(tmp_path / "sketch.svg")
+    write_sketch(svg_file, {"B": [("EG", 0, [("rect12", "A", 0, 400), ("path7", "B", 500, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path))
+    original = {space.LongName: space.GlobalId for space in ifcopenshell.open(result.ifc_file).by_type("IfcSpace")}
+    os.utime(result.ifc_file, (0, 0))
+
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert str(result.update) == "0 added, 0 changed, 0 removed, 2 unchanged"
+    assert os.path.getmtime(result.ifc_file) == 0
+
+    write_sketch(svg_file, {"B": [("EG", 0, [("rect12", "A", 0, 400), ("path7", "B", 500, 450),
+                                             ("rect13", "C", 1000, 400)])]})
+    [result] = process_svg_layers(svg_file, str(tmp_path), incremental=True)
+    assert result.update.changed == [original["B"]]
+    assert len(result.update.added) == 1
+    updated = {space.LongName: space.GlobalId for space in ifcopenshell.open(result.ifc_file).by_type("IfcSpace")}
+    assert {name: updated[name] for name in original} == original
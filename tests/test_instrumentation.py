@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from utils.instrumentation import Stats, NULL_STATS
+from utils.convert_ifc_to_svg import process_ifc
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import create_space_model, write_campus
+
+
+def test_spans_and_counters_add_up(tmp_path):
+    stats = Stats()
+    for _ in range(3):
+        with stats.span("stage"):
+            stats.count("items", 2)
+    other = Stats()
+    other.count("items")
+    stats.merge(other)
+
+    assert stats.spans["stage"].calls == 3
+    assert stats.counters == {"items": 7}
+    report = json.loads(stats.to_json(str(tmp_path / "stats.json")))
+    assert report["spans"]["stage"]["calls"] == 3
+    with open(tmp_path / "stats.json", encoding="utf-8") as f:
+        assert json.load(f) == report
+
+
+def test_null_stats_record_nothing():
+    with NULL_STATS.span("stage"):
+        NULL_STATS.count("items")
+    assert not NULL_STATS.enabled
+    assert NULL_STATS.spans == {} and NULL_STATS.counters == {}
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_svg_to_ifc_stats(tmp_path, workers):
+    svg_file = str(tmp_path / "campus.svg")
+    write_campus(svg_file)
+    stats = Stats()
+
+    process_svg_layers(svg_file, str(tmp_path), workers=workers, stats=stats)
+
+    # Building B has an invalid storey label and fails before reading its spaces
+    assert stats.counters["buildings"] == 2
+    assert stats.counters["buildings_failed"] == 1
+    assert stats.counters["spaces_created"] == 2
+    assert stats.counters["vertices"] == 2 * 5
+    assert stats.spans["write_ifc"].calls == 2
+    for stage in ("total", "parse_svg", "read_spaces", "simplify", "create_entities"):
+        assert stage in stats.spans
+
+
+def test_ifc_to_svg_stats(tmp_path):
+    ifc_file = str(tmp_path / "model.ifc")
+    create_space_model().write(ifc_file)
+    stats = Stats()
+
+    process_ifc(ifc_file, cache_dir=str(tmp_path / "cache"), stats=stats)
+
+    assert stats.counters["spaces"] == 6
+    assert stats.counters["tessellations"] == 6
+    assert stats.counters["cache_misses"] == 6
+    assert stats.spans["footprint"].calls == 6
+    for stage in ("total", "open_ifc", "cache_lookup", "tessellate", "assemble_storeys", "write_svg"):
+        assert stage in stats.spans
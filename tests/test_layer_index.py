@@ -0,0 +1,60 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from lxml import etree
+from utils.layer_index import LayerIndex, LayerKind
+from utils.convert_svg_to_ifc import find_layer_by_prefix
+
+
+SVG = b'''<svg xmlns="http://www.w3.org/2000/svg"
+    xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">
+  <g inkscape:label="Project=P">
+    <g inkscape:label="Site=S">
+      <g inkscape:label="Building=A">
+        <g inkscape:label="Storey=EG, Z=0">
+          <g inkscape:label="Notes">
+            <g inkscape:label="Spaces, h=300, relZ=0"><path id="r1" /></g>
+          </g>
+          <g inkscape:label="Spaces, h=250, relZ=300"><path id="r2" /></g>
+        </g>
+        <g inkscape:label="Storey=OG, Z=300" />
+      </g>
+      <!-- comment -->
+      <g inkscape:label="Building=B" />
+    </g>
+  </g>
+</svg>'''
+
+
+def test_hierarchy_is_built_in_one_pass():
+    layers = LayerIndex.from_root(etree.fromstring(SVG))
+
+    assert layers.project.name == "P"
+    assert layers.site.name == "S"
+    assert [b.name for b in layers.buildings] == ["A", "B"]
+
+    building = layers.buildings[0]
+    storeys = building.descendants(LayerKind.STOREY)
+    assert [s.label for s in storeys] == ["Storey=EG, Z=0", "Storey=OG, Z=300"]
+    # Unclassified groups are transparent, document order is kept
+    spaces = storeys[0].descendants(LayerKind.SPACES)
+    assert [s.label for s in spaces] == ["Spaces, h=300, relZ=0", "Spaces, h=250, relZ=300"]
+    assert spaces[0].parent is storeys[0]
+    assert layers.node(spaces[0].element) is spaces[0]
+
+
+def test_find_layer_by_prefix_uses_index():
+    root = etree.fromstring(SVG)
+    layer, name = find_layer_by_prefix(root, "Building=", root.nsmap)
+    assert name == "A"
+    with pytest.raises(ValueError):
+        find_layer_by_prefix(root, "Zone=", root.nsmap)
+
+
+def test_missing_project_raises_value_error():
+    root = etree.fromstring(b'<svg xmlns="http://www.w3.org/2000/svg" '
+                            b'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape" />')
+    with pytest.raises(ValueError):
+        LayerIndex.from_root(root).project
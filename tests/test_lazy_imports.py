@@ -0,0 +1,24 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from bench_import_time import ENTRIES, import_once, parse_importtime
+
+
+@pytest.mark.parametrize("entry", sorted(ENTRIES))
+def test_entry_points_defer_heavy_modules(entry):
+    module, deferred = ENTRIES[entry]
+    result = import_once(module)
+    if result is None:
+        pytest.skip(f"{module} needs a module that is not installed")
+    assert not set(result["loaded"]) & set(deferred)
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   numpy._core\n"
+              "import time:       850 |        970 | numpy\n")
+    lines = parse_importtime(stderr)
+    assert [(line.module, line.depth, line.cumulative_us) for line in lines] == [("numpy._core", 1, 120),
+                                                                                ("numpy", 0, 970)]
@@ -0,0 +1,58 @@
+import sys
+import os
+import io
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_svg_to_ifc import process_svg_layers
+from utils.instrumentation import configure_logging
+from synthetic_models import write_campus
+
+
+def test_conversion_is_quiet_by_default(tmp_path, capsys):
+    svg_file = str(tmp_path / "campus.svg")
+    write_campus(svg_file)
+
+    process_svg_layers(svg_file, str(tmp_path))
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == ""
+
+
+def test_diagnostics_go_through_module_loggers(tmp_path, caplog):
+    svg_file = str(tmp_path / "campus.svg")
+    write_campus(svg_file)
+    caplog.set_level(logging.DEBUG, logger="utils")
+
+    process_svg_layers(svg_file, str(tmp_path))
+
+    loggers = {record.name for record in caplog.records}
+    assert loggers == {"utils.convert_svg_to_ifc"}
+    assert any(record.getMessage() == "Processing space: Room A" for record in caplog.records)
+    failed = [record for record in caplog.records if record.levelno == logging.ERROR]
+    assert len(failed) == 1 and "Building B" in failed[0].getMessage()
+
+
+def test_configure_logging_levels():
+    stream = io.StringIO()
+    logger = logging.getLogger("utils.convert_svg_to_ifc")
+    package_logger = logging.getLogger("utils")
+    try:
+        configure_logging(verbose=False, stream=stream)
+        logger.debug("hidden")
+        logger.warning("shown")
+        configure_logging(verbose=True, stream=stream)
+        logger.debug("details")
+        installed = [h for h in package_logger.handlers if not isinstance(h, logging.NullHandler)]
+    finally:
+        for handler in package_logger.handlers[:]:
+            if not isinstance(handler, logging.NullHandler):
+                package_logger.removeHandler(handler)
+        package_logger.setLevel(logging.NOTSET)
+
+    output = stream.getvalue()
+    assert "hidden" not in output
+    assert "WARNING utils.convert_svg_to_ifc: shown" in output
+    assert "details" in output
+    assert len(installed) == 1
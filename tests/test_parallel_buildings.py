@@ -0,0 +1,24 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import ifcopenshell
+import pytest
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import write_campus
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_failing_building_does_not_abort_the_others(tmp_path, workers):
+    svg_file = str(tmp_path / "campus.svg")
+    write_campus(svg_file)
+
+    results = process_svg_layers(svg_file, str(tmp_path), workers=workers)
+
+    assert [result.name for result in results] == ["A", "B", "C"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert "ValueError" in results[1].error
+    assert not os.path.exists(results[1].ifc_file)
+    for result in (results[0], results[2]):
+        assert result.seconds > 0
+        assert len(ifcopenshell.open(result.ifc_file).by_type("IfcSpace")) == 1
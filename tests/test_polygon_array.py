@@ -0,0 +1,38 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import pytest
+from svgpathtools import parse_path
+from utils.convert_svg_to_ifc import SVGGeometryParser
+from utils.polygon_array import Point3D, PolygonArray
+
+
+def test_parse_path_closes_polygon_in_meters():
+    parser = SVGGeometryParser()
+
+    open_path = parser.parse_path(parse_path("M 0,0 L 100,0 L 100,100"))
+    closed_path = parser.parse_path(parse_path("M 0,0 L 100,0 L 100,100 Z"))
+
+    expected = [(0, 0), (1, 0), (1, 1), (0, 0)]
+    assert open_path.coords == pytest.approx(np.array(expected))
+    assert closed_path.coords == pytest.approx(np.array(expected))
+
+
+def test_simplify_polygon_drops_collinear_runs():
+    square = [(0, 0)] + [(x, 0) for x in range(1, 10)] + [(10, 0), (10, 10), (0, 10), (0, 0)]
+
+    simplified = SVGGeometryParser.simplify_polygon(PolygonArray(np.array(square, dtype=float)))
+
+    assert simplified.coords.tolist() == [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+
+
+def test_point3d_lists_are_still_accepted():
+    points = [Point3D(0, 0), Point3D(0, 1), Point3D(1, 1), Point3D(1, 0), Point3D(0, 0)]
+
+    clockwise = SVGGeometryParser.ensure_clockwise(points)
+
+    assert isinstance(clockwise, PolygonArray)
+    assert clockwise.is_clockwise()
+    assert clockwise.with_z(2.5)[0] == Point3D(0, 0, 2.5)
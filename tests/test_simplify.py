@@ -0,0 +1,85 @@
+import sys
+import os
+import numpy as np
+import pytest
+import shapely
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.simplify import douglas_peucker_mask, simplify_ring, visvalingam_whyatt_mask
+
+SQUARE_WITH_RUNS = np.array([(0, 0)] + [(x, 0) for x in range(1, 10)] + [(10, 0), (10, 10), (0, 10), (0, 0)],
+                            dtype=float)
+
+
+def circle(vertices: int, radius: float = 3.0) -> np.ndarray:
+    angles = np.linspace(0, 2 * np.pi, vertices, endpoint=False)
+    return np.column_stack([np.cos(angles), np.sin(angles)]) * radius
+
+
+def recursive_douglas_peucker(line: np.ndarray, tolerance: float) -> np.ndarray:
+    """Textbook recursion, reference for the vectorised version"""
+    keep = np.zeros(len(line), dtype=bool)
+    keep[[0, -1]] = True
+
+    def split(first, last):
+        if last - first < 2:
+            return
+        start, direction = line[first], line[last] - line[first]
+        t = np.clip((line[first + 1:last] - start) @ direction / (direction @ direction), 0, 1)
+        distances = np.hypot(*(line[first + 1:last] - start - t[:, None] * direction).T)
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance + 1e-9:
+            keep[first + 1 + farthest] = True
+            split(first, first + 1 + farthest)
+            split(first + 1 + farthest, last)
+
+    split(0, len(line) - 1)
+    return keep
+
+
+@pytest.mark.parametrize("method, tolerance", [("douglas-peucker", 0.0), ("visvalingam-whyatt", 0.0)])
+def test_tolerance_zero_drops_collinear_vertices_only(method, tolerance):
+    simplified = simplify_ring(SQUARE_WITH_RUNS, tolerance, method)
+    assert simplified.tolist() == [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    assert len(simplify_ring(circle(500), tolerance, method)) == 500
+
+
+def test_douglas_peucker_matches_recursion():
+    rng = np.random.default_rng(7)
+    for _ in range(20):
+        line = np.cumsum(rng.normal(size=(300, 2)), axis=0)
+        for tolerance in (0.5, 2.0, 5.0):
+            assert (douglas_peucker_mask(line, tolerance) == recursive_douglas_peucker(line, tolerance)).all()
+
+
+@pytest.mark.parametrize("tolerance", [1e-4, 1e-3, 1e-2])
+def test_douglas_peucker_stays_within_tolerance(tolerance):
+    ring = circle(2000)
+    simplified = simplify_ring(ring, tolerance)
+    assert 3 < len(simplified) < len(ring)
+    assert shapely.distance(shapely.LinearRing(simplified), shapely.points(ring)).max() <= tolerance
+
+
+def test_visvalingam_whyatt_drops_small_triangles():
+    keep = visvalingam_whyatt_mask(circle(2000), 1e-4)
+    assert 3 < keep.sum() < 2000
+    assert visvalingam_whyatt_mask(circle(2000), 1e6).sum() == 3
+
+
+def test_spikes_and_z_are_kept():
+    spike = np.array([(0, 0), (10, 0), (10, 5), (15, 5), (10, 5), (10, 10), (0, 10)], dtype=float)
+    assert len(simplify_ring(spike, 0.0)) == len(spike)
+
+    with_z = np.column_stack([SQUARE_WITH_RUNS, np.full(len(SQUARE_WITH_RUNS), 3.0)])
+    assert simplify_ring(with_z, 0.0)[:, 2].tolist() == [3.0] * 5
+
+
+def test_simplification_never_creates_self_intersections():
+    # Dropping the 0.4 dent of the bottom edge would cut through the slot reaching down to -0.2
+    slotted = np.array([(0, 0), (5, -0.4), (10, 0), (10, 10), (5.1, 10), (5, -0.2), (4.9, 10), (0, 10)])
+    assert not shapely.Polygon(slotted[douglas_peucker_mask(np.vstack([slotted, slotted[:1]]), 0.5,
+                                                            (0, 3, 8))[:-1]]).is_valid
+
+    simplified = simplify_ring(slotted, 0.5)
+    assert shapely.Polygon(simplified).is_valid
+    assert len(simplified) == len(slotted)
@@ -0,0 +1,58 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import pytest
+from utils.convert_ifc_to_svg import SVGGenerator, footprint_from_triangles
+from synthetic_models import create_space_model
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_each_space_is_tessellated_once(workers):
+    ifc_file = create_space_model()
+    generator = SVGGenerator(workers=workers)
+
+    spaces_by_level = generator.get_spaces_by_storey(ifc_file)
+
+    assert generator.tessellation_count == len(ifc_file.by_type("IfcSpace"))
+    assert sum(len(spaces) for spaces in spaces_by_level.values()) == 6
+
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_spaces_without_geometry_are_reported(workers, caplog):
+    ifc_file = create_space_model()
+    broken = ifc_file.by_type("IfcSpace")[1]
+    broken.Representation = None
+    generator = SVGGenerator(workers=workers)
+
+    shapes = list(generator.iter_space_shapes(ifc_file, ifc_file.by_type("IfcSpace")))
+
+    assert len(shapes) == 5
+    assert broken.GlobalId in caplog.text
+
+def test_space_geometry_record():
+    ifc_file = create_space_model(rooms_per_storey=1)
+    generator = SVGGenerator()
+
+    space = ifc_file.by_type("IfcSpace")[-1]
+    [(_, shape)] = generator.iter_space_shapes(ifc_file, [space])
+    geometry = generator._process_shape_geometry(space, shape)
+
+    assert generator.tessellation_count == 1
+    assert geometry.min_z == pytest.approx(3.0)
+    assert geometry.max_z == pytest.approx(5.5)
+    assert geometry.space_height == pytest.approx(250.0)
+    assert geometry.footprint.area == pytest.approx(400 * 300)
+
+
+def test_footprint_from_triangles_keeps_holes():
+    xy = np.array([(0, 0), (3, 0), (3, 3), (0, 3), (1, 1), (2, 1), (2, 2), (1, 2)], dtype=float)
+    triangles = np.array([(0, 1, 5), (0, 5, 4), (1, 2, 6), (1, 6, 5),
+                          (2, 3, 7), (2, 7, 6), (3, 0, 4), (3, 4, 7)])
+
+    footprint = footprint_from_triangles(xy, triangles)
+
+    assert footprint.area == pytest.approx(8.0)
+    assert len(footprint.interiors) == 1
@@ -0,0 +1,83 @@
+import sys
+import os
+import numpy as np
+import shapely
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_svg_to_ifc import IfcModelCreator, process_svg_layers
+from utils.instrumentation import Stats
+from utils.polygon_array import PolygonArray
+from utils.space_validation import find_space_issues, outline_problem, repair_outline
+from synthetic_models import floor_plan_svg
+
+
+def square(x, y, size=1.0):
+    return np.array([(x, y), (x + size, y), (x + size, y + size), (x, y + size)])
+
+
+def test_find_space_issues():
+    outlines = [square(0, 0), square(1, 0), square(2.02, 0), square(2.5, 0.5), square(10, 0), np.empty((0, 2))]
+
+    issues = find_space_issues(outlines, ["a", "b", "c", "d", "e", "f"], "EG")
+
+    # a/b touch, c/e are far apart: only the sliver b/c and the overlap c/d remain
+    assert [(i.kind, i.first, i.second) for i in issues] == [("gap", "b", "c"), ("overlap", "c", "d")]
+    assert abs(issues[0].size - 0.02) < 1e-9
+    assert abs(issues[1].size - 0.52 * 0.5) < 1e-9
+
+
+def test_grid_of_rooms_is_clean():
+    outlines = [square((i % 70) * 1.25, (i // 70) * 1.25) for i in range(3000)]
+    assert find_space_issues(outlines, [str(i) for i in range(3000)]) == []
+
+
+def test_conversion_reports_overlaps(tmp_path):
+    svg = floor_plan_svg(storeys=1, spaces_per_storey=4)
+    # Stretch the first room into its neighbour
+    svg = svg.replace('d="M 0.000,0.000 L 500.000,0.000 L 500.000,400.000',
+                      'd="M 0.000,0.000 L 600.000,0.000 L 600.000,400.000')
+    svg_file = tmp_path / "plan.svg"
+    svg_file.write_text(svg)
+
+    result, = process_svg_layers(str(svg_file), str(tmp_path))
+    assert result.ok
+    assert [(i.kind, i.storey_name) for i in result.issues] == [("overlap", "S0")]
+    assert result.issues[0].first == "Room 0.0 (b0s0r0)"
+
+    result, = process_svg_layers(str(svg_file), str(tmp_path), validate=False)
+    assert result.issues == []
+
+
+# A square whose closing edges cross in a tiny loop near the corner
+LOOPED_SQUARE = np.array([(0, 0), (10, 0), (10, 10), (0, 10), (0, 0.1), (0.1, 0.2), (-0.1, 0.2)])
+BOWTIE = np.array([(0, 0), (2, 2), (2, 0), (0, 2)])
+
+
+def test_outline_problem_and_repair():
+    assert outline_problem(square(0, 0)) is None
+    assert outline_problem(LOOPED_SQUARE).startswith("Self-intersection")
+
+    repaired = repair_outline(LOOPED_SQUARE)
+    assert outline_problem(repaired) is None
+    assert abs(shapely.Polygon(repaired).area - 100.0) < 0.1
+    # Two equal lobes: no piece is small enough to drop
+    assert repair_outline(BOWTIE) is None
+
+
+def test_create_space_repairs_outlines():
+    coords = PolygonArray(LOOPED_SQUARE).closed().with_z(0.0)
+    for repair in (False, True):
+        stats = Stats()
+        creator = IfcModelCreator(stats=stats, repair_outlines=repair)
+        creator.create_owner_history()
+        creator.create_project_context("P")
+        creator.create_spatial_hierarchy()
+        creator.create_storey("EG", 0.0)
+
+        space = creator.create_space(coords, 3.0, "EG", "Looped")
+
+        points = space.Representation.Representations[0].Items[0].SweptArea.OuterCurve.Points
+        valid = outline_problem(np.array([p.Coordinates for p in points])) is None
+        assert valid == repair
+        assert stats.counters == ({"outlines_repaired": 1, "spaces_created": 1} if repair
+                                  else {"outlines_invalid": 1, "spaces_created": 1})
@@ -0,0 +1,47 @@
+import sys
+import os
+import io
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from lxml import etree
+from utils.convert_ifc_to_svg import SVGGenerator, OutlineStore, get_project_data
+from synthetic_models import create_space_model
+
+
+def _canonical(element) -> bytes:
+    for el in element.iter():
+        if el.text is not None and not el.text.strip():
+            el.text = None
+        if el.tail is not None and not el.tail.strip():
+            el.tail = None
+    return etree.tostring(element, method="c14n")
+
+
+def test_streamed_and_element_output_match_string_output():
+    ifc_file = create_space_model()
+    generator = SVGGenerator()
+    spaces_by_level = generator.get_spaces_by_storey(ifc_file)
+    project_data = get_project_data(ifc_file)
+    expected = generator.generate_svg(spaces_by_level, project_data)
+
+    stream = io.StringIO()
+    generator.write_svg(stream, spaces_by_level, project_data)
+    element = generator.build_svg_element(spaces_by_level, project_data)
+
+    assert stream.getvalue() == expected
+    assert _canonical(element) == _canonical(etree.fromstring(expected.encode()))
+
+
+def test_spilled_outlines_give_the_same_document():
+    ifc_file = create_space_model()
+    generator = SVGGenerator()
+    project_data = get_project_data(ifc_file)
+    expected = generator.generate_svg(generator.get_spaces_by_storey(ifc_file), project_data)
+
+    stream = io.StringIO()
+    with OutlineStore() as outlines:
+        spaces_by_level = generator.get_spaces_by_storey(ifc_file, outlines)
+        generator.write_svg(stream, spaces_by_level, project_data, outlines)
+
+    assert all(not space.points for spaces in spaces_by_level.values() for space in spaces)
+    assert stream.getvalue() == expected
@@ -0,0 +1,67 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+import pytest
+from lxml import etree
+from utils.svg_transform import TransformResolver, parse_transform, apply_transform
+
+
+SVG = b'''<svg xmlns="http://www.w3.org/2000/svg" transform="matrix(9,0,0,9,0,0)">
+  <g id="layer" transform="matrix(1,0,0,1,100,0)">
+    <g id="rotated" transform="matrix(0,1,-1,0,0,0)">
+      <rect id="a" /><rect id="b" />
+    </g>
+    <rect id="c" />
+  </g>
+  <rect id="d" />
+</svg>'''
+
+
+def _by_id(root, element_id):
+    return root.xpath(f"//*[@id='{element_id}']")[0]
+
+
+def test_parent_transform_is_applied_after_child():
+    root = etree.fromstring(SVG)
+    transforms = TransformResolver(root)
+
+    # Rotate first, then translate by the layer offset
+    assert transforms.get(_by_id(root, "a")) == pytest.approx(np.array([[0, -1, 100], [1, 0, 0], [0, 0, 1]]))
+    assert transforms.get(_by_id(root, "c")) == pytest.approx(np.array([[1, 0, 100], [0, 1, 0], [0, 0, 1]]))
+    assert transforms.get(_by_id(root, "d")) is None
+
+
+def test_each_transform_is_parsed_once():
+    root = etree.fromstring(SVG)
+    transforms = TransformResolver(root)
+    for element in root.iter():
+        transforms.get(element)
+
+    assert transforms.parse_count == 2
+
+
+@pytest.mark.parametrize("transform, expected", [
+    ("translate(10)", [(11, 1)]),
+    ("translate(10 -5)", [(11, -4)]),
+    ("scale(2)", [(2, 2)]),
+    ("scale(2,3)", [(2, 3)]),
+    ("rotate(90)", [(-1, 1)]),
+    ("rotate(90, 1, 0)", [(0, 0)]),
+    ("skewX(45)", [(2, 1)]),
+    ("skewY(45)", [(1, 2)]),
+    ("matrix(1 0 0 1 1e1 -5E-1)", [(11, 0.5)]),
+    ("translate(10,0) scale(2)", [(12, 2)]),
+    ("scale(2),translate(10,0)", [(22, 2)]),
+])
+def test_transform_grammar(transform, expected):
+    assert apply_transform(parse_transform(transform), np.array([(1.0, 1.0)])) == pytest.approx(np.array(expected))
+
+
+def test_apply_transform_keeps_z():
+    coords = np.array([(1.0, 2.0, 3.0), (4.0, 5.0, 3.0)])
+
+    result = apply_transform(parse_transform("translate(1,1)"), coords)
+
+    assert result == pytest.approx(np.array([(2, 3, 3), (5, 6, 3)]))
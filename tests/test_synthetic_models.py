@@ -0,0 +1,34 @@
+import sys
+import os
+import pytest
+import ifcopenshell
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.convert_ifc_to_svg import process_ifc
+from utils.convert_svg_to_ifc import process_svg_layers
+from synthetic_models import write_floor_plan_svg, write_ifc_models
+
+LAYOUT = dict(buildings=2, storeys=2, spaces_per_storey=5)
+
+
+@pytest.mark.parametrize("vertices_per_space", [4, 16])
+def test_synthetic_sketch_converts(tmp_path, vertices_per_space):
+    svg_file = tmp_path / "plan.svg"
+    write_floor_plan_svg(str(svg_file), vertices_per_space=vertices_per_space, **LAYOUT)
+
+    results = process_svg_layers(str(svg_file), str(tmp_path / "ifc"))
+
+    assert [result.ok for result in results] == [True, True]
+    for result in results:
+        spaces = ifcopenshell.open(result.ifc_file).by_type("IfcSpace")
+        assert len(spaces) == 10
+        assert len(spaces[0].Representation.Representations[0].Items[0].SweptArea.OuterCurve.Points) \
+            == vertices_per_space + 1
+
+
+def test_synthetic_ifc_models_export(tmp_path):
+    ifc_files = write_ifc_models(str(tmp_path), **LAYOUT)
+
+    assert [os.path.basename(f) for f in ifc_files] == ["Synthetic_B0.ifc", "Synthetic_B1.ifc"]
+    svg = process_ifc(ifc_files[0])
+    assert svg.count("<path") == 10
@@ -2,14 +2,28 @@ import ifcopenshell
 import ifcopenshell.geom
 import numpy as np
 from shapely.geometry import Polygon, MultiPolygon
+from shapely.geometry.polygon import orient
 from shapely.ops import unary_union
 import hashlib
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterator, TextIO, NamedTuple
 from dataclasses import dataclass
 import math
+import os
+import logging
+import tempfile
+from lxml import etree
 
 from utils.unit_class import UnitConverter, ModelUnit
+from utils.geometry_cache import GeometryCache, DEFAULT_MAX_BYTES
+from utils.instrumentation import configure_logging, Stats, NULL_STATS
+from utils.simplify import simplify_ring
 
+logger = logging.getLogger(__name__)
+
+SVG_NS = "http://www.w3.org/2000/svg"
+INKSCAPE_NS = "http://www.inkscape.org/namespaces/inkscape"
+SODIPODI_NS = "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd"
+SVG_NSMAP = {None: SVG_NS, "inkscape": INKSCAPE_NS, "sodipodi": SODIPODI_NS}
 
 
 @dataclass
@@ -33,28 +47,89 @@ class SpaceData:
     relative_z: float  # Z position relative to storey elevation
     space_height: float
     absolute_z: float  # Absolute Z position
+    outline: Optional['OutlineRef'] = None  # Where the points are when they were spilled to an OutlineStore
+
+@dataclass
+class SpaceGeometry:
+    footprint: Polygon  # Union of the bottom faces (scaled like the path data)
+    space_height: float  # Scaled like the footprint
+    min_z: float  # Model units
+    max_z: float  # Model units
+
+
+class OutlineRef(NamedTuple):
+    offset: int  # Bytes into the store file
+    count: int  # Points
+
+
+class OutlineStore:
+    """Space outlines spilled to a temporary file for streamed output.
 
+    get_spaces_by_storey then leaves SpaceData.points empty and sets
+    SpaceData.outline, so only the space metadata stays in memory; the
+    points are read back one path at a time while the SVG is written.
+    The bounds of everything stored give the viewBox.
+    """
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._size = 0
+        self.corners: List[np.ndarray] = []  # Lower left and upper right corner of all points
+
+    def put(self, points: np.ndarray) -> OutlineRef:
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape((-1, 2))
+        self._file.seek(self._size)
+        self._file.write(points.tobytes())
+        ref = OutlineRef(self._size, len(points))
+        self._size += points.nbytes
+        if len(points):
+            low, high = points.min(axis=0), points.max(axis=0)
+            self.corners = ([np.minimum(self.corners[0], low), np.maximum(self.corners[1], high)]
+                            if self.corners else [low, high])
+        return ref
+
+    def get(self, ref: OutlineRef) -> List[Tuple[float, float]]:
+        self._file.seek(ref.offset)
+        points = np.frombuffer(self._file.read(ref.count * 16), dtype=np.float64).reshape((-1, 2))
+        return list(map(tuple, points.tolist()))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'OutlineStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 class SVGGenerator:
     def __init__(self, model_unit: ModelUnit = ModelUnit.METERS, 
                  output_unit: ModelUnit = ModelUnit.CENTIMETERS,
-                 padding_percent: float = 0.1):
+                 padding_percent: float = 0.1,
+                 workers: Optional[int] = 1,
+                 cache: Optional[GeometryCache] = None,
+                 stats: Optional[Stats] = None,
+                 simplify_tolerance: float = 0.0):
         self.unit_converter = UnitConverter(model_unit, output_unit)
         self.unit = ModelUnit(output_unit.value)  # Convert ModelUnit to SVGUnit
         self.padding_percent = padding_percent
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
         self.settings = self._init_geometry_settings()
+        self.tessellation_count = 0  # Number of shapes tessellated so far
+        self.cache = cache
+        self.stats = stats if stats is not None else NULL_STATS
+        # Model units; 0 only drops the collinear vertices of the tessellation
+        self.simplify_tolerance = simplify_tolerance
 
-    def _process_space_geometry(self, space: 'IfcSpace') -> Tuple[Optional[Polygon], Optional[float]]:
-        shape = ifcopenshell.geom.create_shape(self.settings, space)
-        vertices = np.array(shape.geometry.verts).reshape((-1, 3))
-        vertices = self.unit_converter.convert_points(vertices)
-        
     def _init_geometry_settings(self) -> ifcopenshell.geom.settings:
         """Initialize geometry settings with proper configuration"""
         settings = ifcopenshell.geom.settings()
         settings.set(settings.USE_WORLD_COORDS, True)
         return settings
+
+    def _cache_settings_key(self) -> str:
+        """Everything besides the IFC content that changes the cached geometry"""
+        return f"world_coords={self.settings.get(self.settings.USE_WORLD_COORDS)};scale=100"
     
     def _calculate_viewbox(self, points: List[Tuple[float, float]]) -> ViewBox:
         """Calculate ViewBox with proper padding"""
@@ -116,11 +191,43 @@ class SVGGenerator:
         
         return f"#{int(r*255):02x}{int(g*255):02x}{int(b*255):02x}"
 
-    def _process_space_geometry(self, space: 'IfcSpace') -> Tuple[Optional[Polygon], Optional[float]]:
-        """Process space geometry with error handling"""
+    def iter_space_shapes(self, ifc_file, spaces: List['IfcSpace']) -> Iterator[Tuple['IfcSpace', object]]:
+        """Yield (space, shape) pairs, tessellated in batches by the geometry iterator when workers > 1"""
+        if self.workers <= 1:
+            for space in spaces:
+                try:
+                    shape = ifcopenshell.geom.create_shape(self.settings, space)
+                    self.tessellation_count += 1
+                    yield space, shape
+                except Exception as e:
+                    logger.warning("Error processing space %s: %s", space.GlobalId, e)
+            return
+
+        if not spaces:
+            return
+
+        iterator = ifcopenshell.geom.iterator(self.settings, ifc_file, self.workers, include=spaces)
+        tessellated = set()
+        if iterator.initialize():
+            while True:
+                shape = iterator.get()
+                self.tessellation_count += 1
+                tessellated.add(shape.id)
+                yield ifc_file.by_id(shape.id), shape
+                if not iterator.next():
+                    break
+
+        # The iterator silently leaves out what it cannot tessellate
+        for space in spaces:
+            if space.id() not in tessellated:
+                logger.warning("Error processing space %s: no geometry could be created", space.GlobalId)
+
+    def _process_shape_geometry(self, space: 'IfcSpace', shape) -> Optional[SpaceGeometry]:
+        """Extract footprint, height and Z range from a tessellated space shape"""
         try:
-            shape = ifcopenshell.geom.create_shape(self.settings, space)
-            vertices = np.array(shape.geometry.verts).reshape((-1, 3)) * 100 #careful
+            model_vertices = np.array(shape.geometry.verts).reshape((-1, 3))
+            self.stats.count("vertices", len(model_vertices))
+            vertices = model_vertices * 100 #careful
 
             faces = np.array(shape.geometry.faces).reshape((-1, 3))
             
@@ -129,30 +236,24 @@ class SVGGenerator:
             max_z = np.max(vertices[:, 2])
             space_height = max_z - min_z
             
-            # Process bottom faces
-            space_faces = []
+            # Select all bottom faces at once (same test as np.allclose per face)
             z_tolerance = 1e-5
+            face_z = vertices[faces, 2]
+            bottom = np.all(np.abs(face_z - min_z) <= 1e-8 + z_tolerance * abs(min_z), axis=1)
+            footprint = footprint_from_triangles(vertices[:, :2], faces[bottom])
             
-            for face in faces:
-                face_verts = vertices[face]
-                face_z = face_verts[:, 2]
-                
-                if np.allclose(face_z, min_z, rtol=z_tolerance):
-                    face_2d = [(x, y) for x, y, z in face_verts]
-                    try:
-                        poly = Polygon(face_2d)
-                        if poly.is_valid:
-                            space_faces.append(poly)
-                    except ValueError:
-                        continue
-            
-            if space_faces:
-                return unary_union(space_faces), space_height
-            return None, None
+            if footprint is not None:
+                return SpaceGeometry(
+                    footprint=footprint,
+                    space_height=space_height,
+                    min_z=np.min(model_vertices[:, 2]),
+                    max_z=np.max(model_vertices[:, 2])
+                )
+            return None
             
         except Exception as e:
-            print(f"Error processing space {space.GlobalId}: {e}")
-            return None, None
+            logger.warning("Error processing space %s: %s", space.GlobalId, e)
+            return None
 
     def _generate_path_data(self, points: List[Tuple[float, float]]) -> str:
         """Generate optimized SVG path data"""
@@ -174,69 +275,129 @@ class SVGGenerator:
         path_data.append("Z")
         return " ".join(path_data)
 
-    def get_spaces_by_storey(self, ifc_file) -> Dict[float, List[SpaceData]]:
-        """Get spaces organized by storey with relative Z positions"""
-        spaces_by_level = {}
+    def get_spaces_by_storey(self, ifc_file, outlines: Optional[OutlineStore] = None
+                             ) -> Dict[float, List[SpaceData]]:
+        """Get spaces organized by storey with relative Z positions.
+
+        Each footprint is reduced to its outline as soon as it is available.
+        With outlines the points go to that store instead of SpaceData.points,
+        so the geometry of the whole model is never held in memory.
+        """
+        # Tessellate all spaces first (streamed, possibly multi-threaded) and
+        # keep the outlines keyed by entity id so the output order below
+        # does not depend on the order in which the workers finish
+        spaces = ifc_file.by_type('IfcSpace')
+        infos_by_id = {}
+        cache_keys = {}
+        to_tessellate = spaces
+        stats = self.stats
+        stats.count("spaces", len(spaces))
+        if self.cache is not None:
+            # Unchanged spaces are read from the cache and skip tessellation
+            settings_key = self._cache_settings_key()
+            # Entity hashes are memoised by #id, which says nothing about another or an edited model
+            self.cache.reset_hashes()
+            to_tessellate = []
+            with stats.span("cache_lookup"):
+                for space in spaces:
+                    key = self.cache.space_key(ifc_file, space, settings_key)
+                    found, record = self.cache.get(key)
+                    if found:
+                        geometry = SpaceGeometry(**record) if record else None
+                        infos_by_id[space.id()] = self._space_info(space, geometry, outlines)
+                    else:
+                        cache_keys[space.id()] = key
+                        to_tessellate.append(space)
+
+        shapes = self.iter_space_shapes(ifc_file, to_tessellate)
+        while True:
+            with stats.span("tessellate"):
+                item = next(shapes, None)
+            if item is None:
+                break
+            space, shape = item
+            with stats.span("footprint"):
+                geometry = self._process_shape_geometry(space, shape)
+            if self.cache is not None:
+                with stats.span("cache_store"):
+                    self.cache.put(cache_keys[space.id()], vars(geometry) if geometry else None)
+            infos_by_id[space.id()] = self._space_info(space, geometry, outlines)
+        stats.count("tessellations", self.tessellation_count)
+        
+        with stats.span("assemble_storeys"):
+            return self._assemble_storeys(spaces, infos_by_id)
+
+    def _space_info(self, space: 'IfcSpace', geometry: Optional[SpaceGeometry],
+                    outlines: Optional[OutlineStore]) -> Optional[dict]:
+        """What the SVG needs of a space: its simplified outline, Z range and storey"""
+        if geometry is None:
+            return None
+        
+        # Get the storey information
+        storey = None
+        for rel in space.Decomposes:
+            if rel.RelatingObject.is_a('IfcBuildingStorey'):
+                storey = rel.RelatingObject
+                break
+        
+        if not storey:
+            return None
+
+        with self.stats.span("outline"):
+            polygon = geometry.footprint
+            rings = []
+            polygons = polygon.geoms if isinstance(polygon, MultiPolygon) else [polygon]
+            for poly in polygons:
+                # The footprint is scaled by 100 like the tessellated vertices
+                ring = simplify_ring(np.asarray(poly.exterior.coords), self.simplify_tolerance * 100)
+                rings.append(ring[:-1])
+            xy = np.concatenate(rings) if rings else np.empty((0, 2))
+            self.stats.count("path_vertices", len(xy))
+            if outlines is not None:
+                points, outline = [], outlines.put(xy)
+            else:
+                points, outline = list(map(tuple, xy.tolist())), None
+
+        name = space.LongName or space.Name or "Unnamed Space"
+        return {
+            'guid': space.GlobalId,
+            'long_name': name,
+            'points': points,
+            'outline': outline,
+            'color': self._generate_color(name),
+            # Absolute bottom Z position comes from the same tessellation
+            'absolute_z': geometry.min_z,
+            'space_height': geometry.space_height or 0.0,
+            'storey': storey,
+        }
+
+    def _assemble_storeys(self, spaces, infos_by_id) -> Dict[float, List[SpaceData]]:
+        """Group the space outlines by storey with relative Z positions"""
         spaces_by_storey_temp = {}
         
         # First pass: collect all spaces and their absolute Z positions
-        for space in ifc_file.by_type('IfcSpace'):
-            polygon, space_height = self._process_space_geometry(space)
-            if polygon is None:
-                continue
-            
-            points = []
-            if isinstance(polygon, MultiPolygon):
-                for poly in polygon.geoms:
-                    points.extend(list(poly.exterior.coords)[:-1])
-            else:
-                points.extend(list(polygon.exterior.coords)[:-1])
-            
-            # Get the storey information
-            storey = None
-            for rel in space.Decomposes:
-                if rel.RelatingObject.is_a('IfcBuildingStorey'):
-                    storey = rel.RelatingObject
-                    break
-            
-            if not storey:
+        for space in spaces:
+            space_info = infos_by_id.get(space.id())
+            if space_info is None:
                 continue
-
-            # Calculate absolute bottom Z position from geometry
-            shape = ifcopenshell.geom.create_shape(self.settings, space)
-            vertices = np.array(shape.geometry.verts).reshape((-1, 3))
-            absolute_z = np.min(vertices[:, 2])
-            
+            storey = space_info['storey']
             storey_id = storey.GlobalId
-            storey_elevation = float(storey.Elevation or 0)
             
             if storey_id not in spaces_by_storey_temp:
                 spaces_by_storey_temp[storey_id] = {
                     'spaces': [],
                     'z_positions': [],
                     'storey': storey,
-                    'elevation': storey_elevation
                 }
             
-            # Add space information to temporary storage
-            space_info = {
-                'guid': space.GlobalId,
-                'long_name': space.LongName or space.Name or "Unnamed Space",
-                'points': points,
-                'color': self._generate_color(space.LongName or space.Name or "Unnamed Space"),
-                'absolute_z': absolute_z,
-                'space_height': space_height or 0.0,
-                'relative_z': absolute_z - storey_elevation
-            }
             spaces_by_storey_temp[storey_id]['spaces'].append(space_info)
-            spaces_by_storey_temp[storey_id]['z_positions'].append(absolute_z)
+            spaces_by_storey_temp[storey_id]['z_positions'].append(space_info['absolute_z'])
 
         spaces_by_level = {}
     
         for storey_data in spaces_by_storey_temp.values():
-            print(f"Processing space {space.GlobalId}, Storey: {storey.Name if storey else 'N/A'}")
             storey = storey_data['storey']
-            storey_elevation = storey_data['elevation']
+            logger.debug("Processing storey %s with %d spaces", storey.Name, len(storey_data['spaces']))
             
             # Calculate the most common Z position as the base for this storey
             z_positions = np.array(storey_data['z_positions'])
@@ -254,7 +415,8 @@ class SVGGenerator:
                     color=space_info['color'],
                     relative_z=relative_z,
                     space_height=space_info['space_height'],
-                    absolute_z=space_info['absolute_z']
+                    absolute_z=space_info['absolute_z'],
+                    outline=space_info['outline']
                 )
                 
                 if base_z not in spaces_by_level:
@@ -264,27 +426,9 @@ class SVGGenerator:
         
         return spaces_by_level
 
-    def _generate_project_hierarchy(self, project_data: dict,
-                                  spaces_by_level: Dict[float, List[SpaceData]],
-                                  viewbox: ViewBox) -> str:
-        """Generate project hierarchy groups with relative Z positions"""
-        elements = []
-        
-        # Add project, site, building hierarchy
-        elements.extend([
-            f'''    <g
-        id="{project_data['guid']}"
-        inkscape:label="Project={project_data['name']}">''',
-            f'''        <g
-            id="{project_data['site_guid']}"
-            inkscape:label="Site={project_data['site']}">''',
-            f'''            <g
-                id="{project_data['building_guid']}"
-                inkscape:label="Building={project_data['building']}"
-                style="display:inline">'''
-        ])
-        
-        # Add storeys and spaces
+    def _iter_storey_groups(self, spaces_by_level: Dict[float, List[SpaceData]]
+                            ) -> Iterator[Tuple[float, List[SpaceData], List[Tuple[float, float, List[SpaceData]]]]]:
+        """Yield (elevation, spaces, [(height, rel_z, spaces)]) per storey in elevation order"""
         for storey_elevation, spaces in sorted(spaces_by_level.items()):
             if not spaces:
                 continue
@@ -301,69 +445,110 @@ class SVGGenerator:
                     space_groups[key] = []
                 space_groups[key].append(space)
             
+            groups = [(height, rel_z, group_spaces)
+                      for (height, rel_z), group_spaces in sorted(space_groups.items())]
+            yield storey_elevation, spaces, groups
+
+    def _storey_label(self, spaces: List[SpaceData], storey_elevation: float) -> str:
+        return f"Storey={spaces[0].storey}, Z={self.unit_converter.convert(storey_elevation):.2f}"
+
+    def _spaces_group_id_and_label(self, storey_guid: str, height: float, rel_z: float) -> Tuple[str, str]:
+        # Convert rel_z before using it in formatting
+        converted_rel_z = self.unit_converter.convert(rel_z)
+        z_offset_str = "0.00" if abs(rel_z) < 0.001 else f"{converted_rel_z:.2f}"
+        
+        # Generate unique ID for this group
+        group_id = f"spaces_{storey_guid}_h{height:.2f}_z{converted_rel_z:.2f}"
+        return group_id, f"Spaces, h={height:.2f}, relZ={z_offset_str}"
+
+    def _space_style(self, space: SpaceData) -> str:
+        return f"fill:{space.color};stroke:#000000;stroke-width:0.1;fill-opacity:0.7"
+
+    def _iter_project_hierarchy(self, project_data: dict, spaces_by_level: Dict[float, List[SpaceData]],
+                                outlines: Optional[OutlineStore] = None) -> Iterator[str]:
+        """Yield the project hierarchy groups line by line"""
+        # Add project, site, building hierarchy
+        yield f'''    <g
+        id="{project_data['guid']}"
+        inkscape:label="Project={project_data['name']}">'''
+        yield f'''        <g
+            id="{project_data['site_guid']}"
+            inkscape:label="Site={project_data['site']}">'''
+        yield f'''            <g
+                id="{project_data['building_guid']}"
+                inkscape:label="Building={project_data['building']}"
+                style="display:inline">'''
+        
+        # Add storeys and spaces
+        for storey_elevation, spaces, groups in self._iter_storey_groups(spaces_by_level):
             storey_guid = spaces[0].storey_guid
-            storey_name = spaces[0].storey
             
             # Storey level
-            elements.append(f'''                <g
+            yield f'''                <g
                     inkscape:groupmode="layer"
                     id="{storey_guid}"
-                    inkscape:label="Storey={storey_name}, Z={self.unit_converter.convert(storey_elevation):.2f}">''')
+                    inkscape:label="{self._storey_label(spaces, storey_elevation)}">'''
             
             
             # Create single layer for each unique height and Z combination
-            for (height, rel_z), group_spaces in sorted(space_groups.items()):
-                # Convert rel_z before using it in formatting
-                converted_rel_z = self.unit_converter.convert(rel_z)
-                z_offset_str = "0.00" if abs(rel_z) < 0.001 else f"{converted_rel_z:.2f}"
-                
-                # Generate unique ID for this group
-                group_id = f"spaces_{storey_guid}_h{height:.2f}_z{converted_rel_z:.2f}"
-                elements.append(f''' <g
+            for height, rel_z, group_spaces in groups:
+                group_id, group_label = self._spaces_group_id_and_label(storey_guid, height, rel_z)
+                yield f''' <g
                 inkscape:groupmode="layer"
                 id="{group_id}"
-                inkscape:label="Spaces, h={height:.2f}, relZ={z_offset_str}">''')
+                inkscape:label="{group_label}">'''
                 
                 # Add all spaces with this height and Z to the same layer
                 for space in group_spaces:
-                    path_data = self._generate_path_data(space.points)
+                    points = outlines.get(space.outline) if space.outline is not None else space.points
+                    path_data = self._generate_path_data(points)
                     if path_data:
-                        elements.append(f'''                        <path
+                        yield f'''                        <path
                                 id="{space.guid}"
                                 d="{path_data}"
                                 inkscape:label="{space.long_name}"
-                                style="fill:{space.color};stroke:#000000;stroke-width:0.1;fill-opacity:0.7"/>''')
+                                style="{self._space_style(space)}"/>'''
                 
-                elements.append('                    </g>')
+                yield '                    </g>'
             
-            elements.append('                </g>')
+            yield '                </g>'
         # Close hierarchy groups
-        elements.extend([
-            '            </g>',  # Close Building
-            '        </g>',      # Close Site
-            '    </g>'           # Close Project
-        ])
-        
-        return '\n'.join(elements)
-    
-    def generate_svg(self, spaces_by_level: Dict[float, List[SpaceData]], 
-                    project_data: dict) -> str:
-        """Generate SVG content with full IFC hierarchy"""
-        all_points = [point for spaces in spaces_by_level.values() 
-                     for space in spaces for point in space.points]
-        viewbox = self._calculate_viewbox(all_points)
+        yield '            </g>'  # Close Building
+        yield '        </g>'      # Close Site
+        yield '    </g>'          # Close Project
+
+    def _viewbox_for(self, spaces_by_level: Dict[float, List[SpaceData]],
+                     outlines: Optional[OutlineStore] = None) -> ViewBox:
+        """ViewBox around all spaces, from their bounding corners rather than a copy of every vertex"""
+        if outlines is not None:
+            return self._calculate_viewbox(outlines.corners)
+        corners = []
+        for spaces in spaces_by_level.values():
+            for space in spaces:
+                if space.points:
+                    xy = np.asarray(space.points)
+                    corners.extend((xy.min(axis=0), xy.max(axis=0)))
+        return self._calculate_viewbox(corners)
+
+    def iter_svg(self, spaces_by_level: Dict[float, List[SpaceData]],
+                 project_data: dict, outlines: Optional[OutlineStore] = None) -> Iterator[str]:
+        """Yield the SVG document in chunks; joined with newlines they form generate_svg().
+
+        Pass the OutlineStore the spaces were read into by get_spaces_by_storey
+        to read their points back one path at a time.
+        """
+        viewbox = self._viewbox_for(spaces_by_level, outlines)
         
-        svg_elements = [
-            '<?xml version="1.0" encoding="UTF-8" standalone="no"?>',
-            f'''<svg
+        yield '<?xml version="1.0" encoding="UTF-8" standalone="no"?>'
+        yield f'''<svg
     width="{viewbox.width}{self.unit.value}"
     height="{viewbox.height}{self.unit.value}"
     viewBox="{viewbox}"
     version="1.1"
     xmlns="http://www.w3.org/2000/svg"
     xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape"
-    xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd">''',
-            '''    <sodipodi:namedview
+    xmlns:sodipodi="http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd">'''
+        yield '''    <sodipodi:namedview
         id="namedview1"
         pagecolor="#ffffff"
         bordercolor="#000000"
@@ -391,13 +576,98 @@ class SVGGenerator:
             dotted="false" />
             </sodipodi:namedview>
             <defs id="defs1" />'''
-        ]
         
-        svg_elements.append(self._generate_project_hierarchy(
-            project_data, spaces_by_level, viewbox))
+        yield from self._iter_project_hierarchy(project_data, spaces_by_level, outlines)
         
-        svg_elements.append('</svg>')
-        return '\n'.join(svg_elements)
+        yield '</svg>'
+
+    def generate_svg(self, spaces_by_level: Dict[float, List[SpaceData]], 
+                    project_data: dict) -> str:
+        """Generate SVG content with full IFC hierarchy"""
+        return '\n'.join(self.iter_svg(spaces_by_level, project_data))
+
+    def write_svg(self, stream: TextIO, spaces_by_level: Dict[float, List[SpaceData]],
+                  project_data: dict, outlines: Optional[OutlineStore] = None) -> None:
+        """Write the SVG document to a file-like object chunk by chunk (see iter_svg)"""
+        for i, chunk in enumerate(self.iter_svg(spaces_by_level, project_data, outlines)):
+            if i:
+                stream.write('\n')
+            stream.write(chunk)
+
+    def build_svg_element(self, spaces_by_level: Dict[float, List[SpaceData]],
+                          project_data: dict) -> etree._Element:
+        """Build the SVG document directly as lxml elements (no serialize and reparse)"""
+        inkscape_label = f"{{{INKSCAPE_NS}}}label"
+        inkscape_groupmode = f"{{{INKSCAPE_NS}}}groupmode"
+        viewbox = self._viewbox_for(spaces_by_level)
+        
+        svg = etree.Element(f"{{{SVG_NS}}}svg", nsmap=SVG_NSMAP, attrib={
+            "width": f"{viewbox.width}{self.unit.value}",
+            "height": f"{viewbox.height}{self.unit.value}",
+            "viewBox": str(viewbox),
+            "version": "1.1",
+        })
+        namedview = etree.SubElement(svg, f"{{{SODIPODI_NS}}}namedview", attrib={
+            "id": "namedview1",
+            "pagecolor": "#ffffff",
+            "bordercolor": "#000000",
+            "borderopacity": "0.25",
+            f"{{{INKSCAPE_NS}}}showpageshadow": "2",
+            f"{{{INKSCAPE_NS}}}pageopacity": "0.0",
+            f"{{{INKSCAPE_NS}}}pagecheckerboard": "0",
+            f"{{{INKSCAPE_NS}}}deskcolor": "#d1d1d1",
+            f"{{{INKSCAPE_NS}}}document-units": "cm",
+            "showgrid": "true",
+        })
+        etree.SubElement(namedview, f"{{{INKSCAPE_NS}}}grid", attrib={
+            "id": "grid1",
+            "units": "cm",
+            "originx": "0",
+            "originy": "0",
+            "spacingx": "12.5",
+            "spacingy": "12.5",
+            "empcolor": "#0099e5",
+            "empopacity": "0.30196078",
+            "color": "#0099e5",
+            "opacity": "0.14901961",
+            "empspacing": "5",
+            "enabled": "true",
+            "visible": "true",
+            "dotted": "false",
+        })
+        etree.SubElement(svg, f"{{{SVG_NS}}}defs", id="defs1")
+        
+        project = etree.SubElement(svg, f"{{{SVG_NS}}}g", attrib={
+            "id": project_data['guid'], inkscape_label: f"Project={project_data['name']}"})
+        site = etree.SubElement(project, f"{{{SVG_NS}}}g", attrib={
+            "id": project_data['site_guid'], inkscape_label: f"Site={project_data['site']}"})
+        building = etree.SubElement(site, f"{{{SVG_NS}}}g", attrib={
+            "id": project_data['building_guid'],
+            inkscape_label: f"Building={project_data['building']}",
+            "style": "display:inline"})
+        
+        for storey_elevation, spaces, groups in self._iter_storey_groups(spaces_by_level):
+            storey_guid = spaces[0].storey_guid
+            storey = etree.SubElement(building, f"{{{SVG_NS}}}g", attrib={
+                inkscape_groupmode: "layer",
+                "id": storey_guid,
+                inkscape_label: self._storey_label(spaces, storey_elevation)})
+            
+            for height, rel_z, group_spaces in groups:
+                group_id, group_label = self._spaces_group_id_and_label(storey_guid, height, rel_z)
+                group = etree.SubElement(storey, f"{{{SVG_NS}}}g", attrib={
+                    inkscape_groupmode: "layer", "id": group_id, inkscape_label: group_label})
+                
+                for space in group_spaces:
+                    path_data = self._generate_path_data(space.points)
+                    if path_data:
+                        etree.SubElement(group, f"{{{SVG_NS}}}path", attrib={
+                            "id": space.guid,
+                            "d": path_data,
+                            inkscape_label: space.long_name,
+                            "style": self._space_style(space)})
+        
+        return svg
 
     def _generate_level_group(self, height: float, 
                             spaces: List[SpaceData]) -> List[str]:
@@ -420,6 +690,96 @@ class SVGGenerator:
         elements.append('        </g>')
         return elements
 
+def _triangles_to_polygons(xy: np.ndarray, triangles: np.ndarray) -> List[Polygon]:
+    """Turn the non-degenerate triangles into shapely polygons"""
+    polygons = []
+    for triangle in triangles:
+        try:
+            poly = Polygon(xy[triangle])
+            if poly.is_valid:
+                polygons.append(poly)
+        except ValueError:
+            continue
+    return polygons
+
+def footprint_from_triangles(xy: np.ndarray, triangles: np.ndarray,
+                             weld_tolerance: float = 1e-6) -> Optional[Polygon]:
+    """Build the outline of a set of coplanar triangles from their boundary edges.
+
+    Boundary edges are the edges used by exactly one triangle. They are chained
+    into rings, which is much cheaper than a unary_union of every triangle.
+    Non-manifold outlines (vertices touched by more than two boundary edges)
+    fall back to the union.
+    """
+    if len(triangles) == 0:
+        return None
+
+    # Drop degenerate triangles, they would add spurious boundary edges
+    a, b, c = xy[triangles[:, 0]], xy[triangles[:, 1]], xy[triangles[:, 2]]
+    cross = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (c[:, 0] - a[:, 0]) * (b[:, 1] - a[:, 1])
+    triangles = triangles[np.abs(cross) > weld_tolerance ** 2]
+    if len(triangles) == 0:
+        return None
+
+    # Weld vertices that share the same XY position
+    used = np.unique(triangles)
+    keys = np.round(xy[used] / weld_tolerance).astype(np.int64)
+    _, canonical = np.unique(keys, axis=0, return_inverse=True)
+    remap = np.empty(xy.shape[0], dtype=np.int64)
+    remap[used] = canonical.reshape(-1)
+    vertex_xy = np.empty((canonical.max() + 1, 2))
+    vertex_xy[canonical.reshape(-1)] = xy[used]
+    welded = remap[triangles]
+
+    edges = np.concatenate([welded[:, [0, 1]], welded[:, [1, 2]], welded[:, [2, 0]]])
+    edges = np.sort(edges, axis=1)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+    unique_edges, counts = np.unique(edges, axis=0, return_counts=True)
+    boundary = unique_edges[counts == 1]
+
+    degree = np.bincount(boundary.reshape(-1), minlength=len(vertex_xy))
+    if len(boundary) < 3 or np.any((degree != 0) & (degree != 2)):
+        return unary_union(_triangles_to_polygons(xy, triangles))
+
+    # Chain the boundary edges into closed rings
+    neighbours: Dict[int, List[int]] = {}
+    for start, end in boundary.tolist():
+        neighbours.setdefault(start, []).append(end)
+        neighbours.setdefault(end, []).append(start)
+
+    rings = []
+    while neighbours:
+        first = next(iter(neighbours))
+        ring = [first]
+        previous, current = first, neighbours[first][0]
+        while current != first:
+            ring.append(current)
+            following = neighbours[current]
+            previous, current = current, following[0] if following[1] == previous else following[1]
+        for vertex in ring:
+            del neighbours[vertex]
+        if len(ring) >= 3:
+            rings.append(Polygon(vertex_xy[ring]))
+
+    # Rings nested an odd number of times are holes of the smallest ring around them
+    rings.sort(key=lambda ring: ring.area, reverse=True)
+    shells = []
+    seen = []  # (ring, index of its shell if the ring is a shell)
+    for ring in rings:
+        point = ring.representative_point()
+        containing = [entry for entry in seen if entry[0].contains(point)]
+        if len(containing) % 2 == 1:
+            shells[containing[-1][1]][1].append(ring.exterior.coords)
+            seen.append((ring, None))
+        else:
+            seen.append((ring, len(shells)))
+            shells.append((ring, []))
+
+    polygons = [orient(Polygon(shell.exterior.coords, holes), sign=-1.0) for shell, holes in shells]
+    if len(polygons) == 1:
+        return polygons[0]
+    return MultiPolygon(polygons)
+
 def get_project_data(ifc_file) -> dict:
     """Extract project hierarchy data"""
     project = ifc_file.by_type("IfcProject")[0] if ifc_file.by_type("IfcProject") else None
@@ -435,9 +795,71 @@ def get_project_data(ifc_file) -> dict:
         "building_guid": building.GlobalId if building else "N/A"
     }
 
-def process_ifc(file_path: str, unit: ModelUnit = ModelUnit.CENTIMETERS) -> str:
-    ifc_file = ifcopenshell.open(file_path)
-    generator = SVGGenerator(model_unit=ModelUnit.METERS, output_unit=unit)
-    spaces_by_level = generator.get_spaces_by_storey(ifc_file)
+def _load_ifc_spaces(file_path: str, unit: ModelUnit, workers: Optional[int],
+                     cache_dir: Optional[str], cache_max_bytes: int, stats: Stats,
+                     simplify_tolerance: float = 0.0, outlines: Optional[OutlineStore] = None
+                     ) -> Tuple[SVGGenerator, Dict[float, List[SpaceData]], dict]:
+    with stats.span("open_ifc"):
+        ifc_file = ifcopenshell.open(file_path)
+    cache = GeometryCache(cache_dir, cache_max_bytes) if cache_dir else None
+    generator = SVGGenerator(model_unit=ModelUnit.METERS, output_unit=unit,
+                             workers=workers, cache=cache, stats=stats,
+                             simplify_tolerance=simplify_tolerance)
+    spaces_by_level = generator.get_spaces_by_storey(ifc_file, outlines)
+    if cache is not None:
+        logger.info("Geometry cache: %s", cache.stats)
+        stats.count("cache_hits", cache.stats.hits)
+        stats.count("cache_misses", cache.stats.misses)
     project_data = get_project_data(ifc_file)
-    return generator.generate_svg(spaces_by_level, project_data)
\ No newline at end of file
+    return generator, spaces_by_level, project_data
+
+def process_ifc(file_path: str, unit: ModelUnit = ModelUnit.CENTIMETERS,
+                workers: Optional[int] = 1, cache_dir: Optional[str] = None,
+                cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                output: Optional[TextIO] = None, verbose: bool = False,
+                stats: Optional[Stats] = None, simplify_tolerance: float = 0.0) -> Optional[str]:
+    """Convert the IfcSpaces of an IFC file to SVG.
+
+    workers > 1 tessellates the spaces with that many threads through
+    ifcopenshell.geom.iterator, None uses all available cores.
+    cache_dir enables the on-disk geometry cache, so spaces that did not
+    change since the last import are not tessellated again.
+    With output (a text file-like object) the SVG text is written into it
+    chunk by chunk and None is returned, otherwise the SVG is returned as a
+    string. Streamed output spills the space outlines to a temporary file
+    as they are tessellated, so memory holds neither the document nor the
+    geometry of the whole model, only per-space metadata.
+    verbose=True prints the per-space diagnostics (see configure_logging).
+    Pass a Stats instance to collect per-stage timings and counters.
+    Outline vertices within simplify_tolerance metres of the outline
+    without them are dropped; 0 only drops collinear tessellation vertices.
+    """
+    if verbose:
+        configure_logging(verbose=True)
+    stats = stats if stats is not None else NULL_STATS
+    with stats.span("total"):
+        if output is not None:
+            with OutlineStore() as outlines:
+                generator, spaces_by_level, project_data = _load_ifc_spaces(
+                    file_path, unit, workers, cache_dir, cache_max_bytes, stats, simplify_tolerance, outlines)
+                with stats.span("write_svg"):
+                    generator.write_svg(output, spaces_by_level, project_data, outlines)
+            return None
+        generator, spaces_by_level, project_data = _load_ifc_spaces(
+            file_path, unit, workers, cache_dir, cache_max_bytes, stats, simplify_tolerance)
+        with stats.span("write_svg"):
+            return generator.generate_svg(spaces_by_level, project_data)
+
+def process_ifc_to_element(file_path: str, unit: ModelUnit = ModelUnit.CENTIMETERS,
+                           workers: Optional[int] = 1, cache_dir: Optional[str] = None,
+                           cache_max_bytes: int = DEFAULT_MAX_BYTES, verbose: bool = False,
+                           stats: Optional[Stats] = None, simplify_tolerance: float = 0.0) -> etree._Element:
+    """Convert the IfcSpaces of an IFC file to an lxml <svg> element"""
+    if verbose:
+        configure_logging(verbose=True)
+    stats = stats if stats is not None else NULL_STATS
+    with stats.span("total"):
+        generator, spaces_by_level, project_data = _load_ifc_spaces(
+            file_path, unit, workers, cache_dir, cache_max_bytes, stats, simplify_tolerance)
+        with stats.span("write_svg"):
+            return generator.build_svg_element(spaces_by_level, project_data)
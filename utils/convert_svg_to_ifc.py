@@ -1,48 +1,91 @@
-from dataclasses import dataclass
-import xml.etree.ElementTree as ET
-from typing import List, Tuple, Dict, Any, Optional, Callable
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Any, Optional, TYPE_CHECKING
 import ifcopenshell
-import svgpathtools
-from svgpathtools import svg2paths2
 import uuid
 import time
 from ifcopenshell.file import file as IfcFile
-from svg.path import Path
 import ifcopenshell.guid
+import ifcopenshell.util.unit
 import os
+import math
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from lxml import etree
-from math import sin, cos, radians
 
 from utils.unit_class import UnitConverter, ModelUnit
+from utils.instrumentation import configure_logging, Stats, NULL_STATS
+from utils.svg_transform import TransformResolver, scale_translation
+from utils.polygon_array import Point3D, PolygonArray
+from utils.simplify import simplify_ring
+from utils.layer_index import LayerIndex, LayerKind, LayerNode
+from utils.ifc_update import (UpdateSummary, is_ifc_guid, space_matches, parent_storey,
+                              detach_from_relationships, remove_unused, remove_space,
+                              is_empty_storey, remove_storey, sketch_description, sketch_id)
+from utils.space_validation import SpaceIssue, find_space_issues, outline_problem, repair_outline
 
-@dataclass
-class Point3D:
-    x: float
-    y: float
-    z: float = 0.0
+if TYPE_CHECKING:
+    import svgpathtools
 
-    def to_list(self) -> List[float]:
-        return [self.x, self.y, self.z]
+logger = logging.getLogger(__name__)
 
 
-class SVGGeometryParser:
+class SVGPathCache:
+    """Parsed path data of <path> elements, keyed by element identity.
+
+    The d attribute is parsed straight from the lxml element the first time it
+    is requested, so the SVG file is only parsed once (no svg2paths2 pass) and
+    paths with identical d strings do not collide. svgpathtools (which loads
+    scipy) is imported on the first parse, so sketches of rectangles and the
+    Inkscape extension's IFC import never pay for it.
+    """
+
     def __init__(self):
+        self._paths: Dict[etree._Element, "svgpathtools.Path"] = {}
+        self.parse_count = 0
+
+    def get(self, element: etree._Element) -> Optional["svgpathtools.Path"]:
+        path = self._paths.get(element)
+        if path is None:
+            d = element.get('d')
+            if not d:
+                return None
+            import svgpathtools
+            path = svgpathtools.parse_path(d)
+            self.parse_count += 1
+            self._paths[element] = path
+        return path
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+# Largest distance (m) between a curve of the sketch and the chords replacing it
+CURVE_TOLERANCE = 0.01
+# Upper limit of chords per curve segment, whatever the tolerance
+MAX_CURVE_STEPS = 1000
+# Largest distance (m) of a dropped vertex from the simplified space outline
+SIMPLIFY_TOLERANCE = 0.001
+
+
+class SVGGeometryParser:
+    def __init__(self, curve_tolerance: Optional[float] = CURVE_TOLERANCE):
         self.converter = UnitConverter(
             source_unit=ModelUnit.CENTIMETERS,
             target_unit=ModelUnit.METERS
         )
+        # None keeps only the segment end points (every curve becomes one chord)
+        self.curve_tolerance = curve_tolerance
 
     @staticmethod
     def _validate_geometry(points: List[Point3D]) -> bool:
         """Check if the geometry forms a valid polygon"""
-        # Print for debugging
-        print(f"\nValidating {len(points)} points:")
-        for p in points:
-            print(f"({p.x}, {p.y})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validating %d points: %s", len(points), [(p.x, p.y) for p in points])
 
         # Need at least 3 non-collinear points
         if len(points) < 3:
-            print("Too few points")
+            logger.debug("Too few points")
             return False
             
         # Calculate area to check for non-zero area polygon
@@ -51,156 +94,286 @@ class SVGGeometryParser:
             area += points[i].x * points[i+1].y - points[i+1].x * points[i].y
         area = abs(area) / 2.0
         
-        print(f"Polygon area: {area}")
+        logger.debug("Polygon area: %s", area)
         return area > 1e-6
 
 
-    def parse_rect(self, attr: Dict[str, str]) -> List[Point3D]:
-        """Parse rectangle from SVG attributes (cm) to meters, handling rotation."""
-        # Get basic rectangle properties
-        x = self.converter.convert(float(attr.get('x', 0)))
-        y = self.converter.convert(float(attr.get('y', 0)))
-        width = self.converter.convert(float(attr.get('width', 0)))
-        height = self.converter.convert(float(attr.get('height', 0)))
-        
-        # Parse rotation if it exists
-        transform = attr.get('transform', '')
-        angle = 0
-        cx = x + width/2  # Default rotation center is rectangle center
-        cy = y + height/2
-        
-        if 'rotate' in transform:
-            # Extract rotation parameters
-            rotate_params = transform.split('rotate(')[1].split(')')[0].split(',')
-            angle = float(rotate_params[0])
-            if len(rotate_params) == 3:
-                # If rotation center is specified, use it
-                cx = self.converter.convert(float(rotate_params[1]))
-                cy = self.converter.convert(float(rotate_params[2]))
-        
-        # Convert angle to radians
-        angle_rad = radians(angle)
-        
-        # Function to rotate a point around center
-        def rotate_point(px, py):
-            # Translate point to origin
-            translated_x = px - cx
-            translated_y = py - cy
-            
-            # Rotate
-            rotated_x = translated_x * cos(angle_rad) - translated_y * sin(angle_rad)
-            rotated_y = translated_x * sin(angle_rad) + translated_y * cos(angle_rad)
-            
-            # Translate back
-            final_x = rotated_x + cx
-            final_y = rotated_y + cy
-            
-            return Point3D(final_x, final_y)
-        
-        # Get corners and rotate them
-        corners = [
-            rotate_point(x, y),                    # Top-left
-            rotate_point(x + width, y),            # Top-right
-            rotate_point(x + width, y + height),   # Bottom-right
-            rotate_point(x, y + height),           # Bottom-left
-            rotate_point(x, y)                     # Back to start (closes the shape)
-        ]
+    def parse_rect(self, attr: Dict[str, str]) -> PolygonArray:
+        """Parse rectangle from SVG attributes (cm) to meters.
+
+        The transform attribute (e.g. rotate) is not applied here, it is part of
+        the element's accumulated transform.
+        """
+        x = float(attr.get('x', 0))
+        y = float(attr.get('y', 0))
+        width = float(attr.get('width', 0))
+        height = float(attr.get('height', 0))
         
-        return corners
-    def parse_path(self, path_obj) -> List[Point3D]:
-        """Parse path from SVG (cm) to meters."""
-        points = []
+        # Top-left, top-right, bottom-right, bottom-left and back to start
+        corners = np.array([
+            (x, y),
+            (x + width, y),
+            (x + width, y + height),
+            (x, y + height),
+            (x, y)
+        ])
+        return PolygonArray(self.converter.convert_points(corners))
+
+    @staticmethod
+    def curve_steps(segment, tolerance: float) -> int:
+        """Chords needed to keep within tolerance (in the segment's units) of a path segment"""
+        import svgpathtools
+        if isinstance(segment, svgpathtools.Line):
+            return 1
+        if isinstance(segment, svgpathtools.Arc):
+            # Sagitta of a chord spanning angle a: r (1 - cos(a / 2))
+            radius = max(abs(segment.radius.real), abs(segment.radius.imag))
+            if radius <= tolerance / 2:
+                return 1
+            step = 2 * math.acos(1 - min(tolerance / radius, 1.0))
+            steps = math.ceil(math.radians(abs(segment.delta)) / step)
+        else:
+            # Bézier curves: a chord over dt deviates at most max|B''| dt² / 8
+            control = np.array(segment.bpoints(), dtype=complex)
+            degree = len(control) - 1
+            curvature = degree * (degree - 1) * np.abs(np.diff(control, 2)).max(initial=0.0)
+            steps = math.ceil(math.sqrt(curvature / (8 * tolerance)))
+        return min(max(steps, 1), MAX_CURVE_STEPS)
+
+    def path_vertices(self, path_obj, transform: Optional[np.ndarray] = None) -> np.ndarray:
+        """Complex vertices of a path (SVG units), curves flattened to curve_tolerance.
+
+        transform is the element's accumulated 3x3 SVG transform; the
+        tolerance shrinks by its largest scale so it holds after the transform.
+        """
+        if self.curve_tolerance is None:
+            return np.array([segment.start for segment in path_obj] + [path_obj[-1].end], dtype=complex)
+
+        import svgpathtools
+        tolerance = self.curve_tolerance / self.converter.conversion_factor
+        if transform is not None:
+            scale = float(np.linalg.norm(transform[:2, :2], 2))
+            if scale > 0:
+                tolerance /= scale
+        chunks = []
         for segment in path_obj:
-            x = self.converter.convert(float(segment.start.real))
-            y = self.converter.convert(float(segment.start.imag))
-            points.append(Point3D(x, y))
-
-        if path_obj:
-            end = path_obj[-1].end
-            end_x = self.converter.convert(float(end.real))
-            end_y = self.converter.convert(float(end.imag))
-            end_point = Point3D(end_x, end_y)
-            if abs(end_point.x - points[0].x) > 1e-6 or abs(end_point.y - points[0].y) > 1e-6:
-                points.append(end_point)
-
-        if points and (abs(points[0].x - points[-1].x) > 1e-6 or abs(points[0].y - points[-1].y) > 1e-6):
-            points.append(Point3D(points[0].x, points[0].y))
-        
-        return points
-        
-        # Close polygon if needed
-        if points and (abs(points[0].x - points[-1].x) > 1e-6 or abs(points[0].y - points[-1].y) > 1e-6):
-            points.append(Point3D(points[0].x, points[0].y))
+            steps = self.curve_steps(segment, tolerance)
+            if steps == 1:
+                chunks.append([segment.start])
+            else:
+                t = np.arange(steps) / steps
+                points = segment.point(t) if isinstance(segment, svgpathtools.Arc) else segment.points(t)
+                chunks.append(np.asarray(points, dtype=complex))
+        chunks.append([path_obj[-1].end])
+        return np.concatenate(chunks).astype(complex)
+
+    def parse_path(self, path_obj, transform: Optional[np.ndarray] = None) -> PolygonArray:
+        """Parse path from SVG (cm) to meters, flattening curves to curve_tolerance.
+
+        The transform is not applied, only used to keep the tolerance once it is.
+        """
+        if not path_obj:
+            return PolygonArray(np.empty((0, 2)))
+
+        vertices = self.path_vertices(path_obj, transform)
+        points = self.converter.convert_points(np.column_stack([vertices.real, vertices.imag]))
+
+        # Keep the end point only if the path is not closed back onto its start
+        if np.all(np.abs(points[-1] - points[0]) <= 1e-6):
+            points = points[:-1]
         
-        return points
+        return PolygonArray(points).closed()
 
     @staticmethod
-    def simplify_polygon(points: List[Point3D], tolerance: float = 0.001) -> List[Point3D]:
-        """Simplify polygon by removing collinear points while preserving shape."""
+    def simplify_polygon(points: PolygonArray, tolerance: float = SIMPLIFY_TOLERANCE) -> PolygonArray:
+        """Drop vertices within tolerance (m) of the outline without them (Douglas-Peucker)."""
+        points = PolygonArray.coerce(points)
         if len(points) < 3:
             return points
-            
-        def is_collinear(p1: Point3D, p2: Point3D, p3: Point3D) -> bool:
-            # Calculate triangle area
-            area = abs((p2.x - p1.x) * (p3.y - p1.y) - (p3.x - p1.x) * (p2.y - p1.y))
-            return area < tolerance
-            
-        result = [points[0]]
-        for i in range(1, len(points)-1):
-            if not is_collinear(result[-1], points[i], points[i+1]):
-                result.append(points[i])
-        result.append(points[-1])
-
-        # Ensure we didn't collapse the polygon
-        if len(result) < 3:
-            return points
-            
-        return result
+        return PolygonArray(simplify_ring(points.coords, tolerance))
     
     @staticmethod
-    def is_clockwise(points: List[Point3D]) -> bool:
+    def is_clockwise(points: PolygonArray) -> bool:
         """Check if points are in clockwise order."""
-        if len(points) < 3:
-            return True
-        area = 0
-        for i in range(len(points) - 1):
-            j = (i + 1)
-            area += points[i].x * points[j].y - points[j].x * points[i].y
-        return area < 0
+        return PolygonArray.coerce(points).is_clockwise()
 
     @staticmethod
-    def ensure_clockwise(points: List[Point3D]) -> List[Point3D]:
+    def ensure_clockwise(points: PolygonArray) -> PolygonArray:
         """Ensure points are in clockwise order."""
-        if not SVGGeometryParser.is_clockwise(points):
-            return list(reversed(points))
+        points = PolygonArray.coerce(points)
+        if not points.is_clockwise():
+            return points.reversed()
         return points
     
 
+def entity_counts(ifc_file: IfcFile) -> Dict[str, int]:
+    """Number of entities per IFC class, most frequent first"""
+    counts: Dict[str, int] = {}
+    for entity in ifc_file:
+        counts[entity.is_a()] = counts.get(entity.is_a(), 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+# How the outline of a space is written:
+#   separate: one IfcPolyline for the Body profile and another for the FootPrint
+#   shared:   one IfcPolyline referenced by both representations
+#   indexed:  one IfcIndexedPolyCurve on an IfcCartesianPointList2D (IFC4 only)
+CURVE_MODES = ("separate", "shared", "indexed")
+
+# Namespace of the GlobalIds derived from sketch paths in deterministic mode
+GUID_NAMESPACE = uuid.UUID("fbfc1991-8ac2-493a-8276-b559da1a23a5")
+
+
 class IfcModelCreator:
-    def __init__(self, schema: str = "IFC4"):
-        self.ifc: IfcFile = ifcopenshell.file(schema=schema)
+    def __init__(self, schema: str = "IFC4", share_entities: bool = True, curve_mode: str = "shared",
+                 deterministic: bool = False, stats: Optional[Stats] = None, repair_outlines: bool = False,
+                 curve_tolerance: Optional[float] = CURVE_TOLERANCE,
+                 simplify_tolerance: float = SIMPLIFY_TOLERANCE):
+        if curve_mode not in CURVE_MODES:
+            raise ValueError(f"Unknown curve mode '{curve_mode}', expected one of {CURVE_MODES}")
+        if curve_mode == "indexed" and schema == "IFC2X3":
+            raise ValueError("IfcIndexedPolyCurve requires IFC4 or later")
+        self._ifc: IfcFile = ifcopenshell.file(schema=schema)
         self.owner_history = None
         self.context = None
         self.project = None
         self.building = None
         self.storeys = {}  # Store storeys by name
-        self.geometry_parser = SVGGeometryParser()
+        self.geometry_parser = SVGGeometryParser(curve_tolerance)
+        self.stats = stats if stats is not None else NULL_STATS
+        # Constant geometric entities (directions, points, axis placements)
+        # are created once and referenced everywhere they are needed.
+        # Shared entities must never be modified in place.
+        self.share_entities = share_entities
+        self._shared: Dict[tuple, Any] = {}
+        self.curve_mode = curve_mode
+        # Deterministic mode derives every GlobalId from the sketch path of
+        # the entity and uses a fixed timestamp (SOURCE_DATE_EPOCH or 0), so
+        # identical input produces a byte-identical file.
+        self.deterministic = deterministic
+        self._keys: Dict[int, str] = {}  # entity id -> sketch path
+        self._used_guids = set()
+        # Aggregations are collected per parent and written by flush_relationships(),
+        # which the ifc property and write() call first
+        self._pending_aggregations: Dict[Any, List[Any]] = {}
+        # Invalid (self-intersecting) outlines are reported; with repair_outlines
+        # the ones that only touch themselves are fixed
+        self.repair_outlines = repair_outlines
+        self.simplify_tolerance = simplify_tolerance
+        if deterministic:
+            self.timestamp = int(os.environ.get("SOURCE_DATE_EPOCH", 0))
+            self._ifc.wrapped_data.header.file_name.time_stamp = time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.gmtime(self.timestamp))
+        else:
+            self.timestamp = None
 
-    @staticmethod
-    def _create_guid() -> str:
-        """Create a new valid IFC GUID."""
-        return ifcopenshell.guid.compress(uuid.uuid4().hex)
+    @classmethod
+    def from_file(cls, ifc_file: IfcFile, **options) -> "IfcModelCreator":
+        """Attach to an existing single-building model to add or patch spaces"""
+        creator = cls(schema=ifc_file.schema, **options)
+        creator._ifc = ifc_file
+
+        projects = ifc_file.by_type("IfcProject")
+        buildings = ifc_file.by_type("IfcBuilding")
+        contexts = [context for context in ifc_file.by_type("IfcGeometricRepresentationContext", include_subtypes=False)
+                    if context.ContextType == "Model"]
+        if not projects or not buildings or not contexts:
+            raise ValueError("The IFC file has no project, building or model context to update")
+        if ifcopenshell.util.unit.calculate_unit_scale(ifc_file) != 1.0:
+            raise ValueError("Only IFC files in metres can be updated")
+
+        owner_histories = ifc_file.by_type("IfcOwnerHistory")
+        creator.owner_history = owner_histories[0] if owner_histories else None
+        creator.project = projects[0]
+        creator.building = buildings[0]
+        creator.context = contexts[0]
+        creator.storeys = {storey.Name: storey for storey in ifc_file.by_type("IfcBuildingStorey")}
+        creator._restore_keys()
+        return creator
+
+    def _restore_keys(self) -> None:
+        """Give loaded entities the sketch paths they were created with.
+
+        Deterministic GlobalIds of new spaces and relationships derive from
+        the path of their parent, so an update must produce the same ones as a
+        full conversion of the sketch.
+        """
+        self._used_guids.update(entity.GlobalId for entity in self._ifc.by_type("IfcRoot"))
+
+        def assign(entity, key: str) -> None:
+            self._keys[entity.id()] = key
+            for rel in entity.IsDecomposedBy:
+                for child in rel.RelatedObjects:
+                    kind = {"IfcSite": "Site", "IfcBuilding": "Building",
+                            "IfcBuildingStorey": "Storey"}.get(child.is_a())
+                    if kind is not None:
+                        assign(child, f"{key}/{kind}={child.Name}")
+
+        assign(self.project, f"Project={self.project.Name}")
+
+    @property
+    def ifc(self) -> IfcFile:
+        """The model, with every queued aggregation written"""
+        self.flush_relationships()
+        return self._ifc
+
+    def _shared_entity(self, ifc_class: str, **attributes) -> Any:
+        """Return an existing identical entity or create it"""
+        if not self.share_entities:
+            return self._ifc.create_entity(ifc_class, **attributes)
+        key = (ifc_class,) + tuple(
+            (name, value.id() if isinstance(value, ifcopenshell.entity_instance) else value)
+            for name, value in sorted(attributes.items()))
+        entity = self._shared.get(key)
+        if entity is None:
+            entity = self._shared[key] = self._ifc.create_entity(ifc_class, **attributes)
+        return entity
+
+    def _direction(self, *ratios: float) -> Any:
+        return self._shared_entity("IfcDirection", DirectionRatios=tuple(float(r) for r in ratios))
+
+    def _point(self, *coordinates: float) -> Any:
+        return self._shared_entity("IfcCartesianPoint", Coordinates=tuple(float(c) for c in coordinates))
+
+    def _create_guid(self, key: Optional[str] = None) -> str:
+        """Create a new valid IFC GUID.
+
+        In deterministic mode it is derived from key, the sketch path of the entity.
+        """
+        if not self.deterministic or key is None:
+            return ifcopenshell.guid.compress(uuid.uuid4().hex)
+        guid = ifcopenshell.guid.compress(uuid.uuid5(GUID_NAMESPACE, key).hex)
+        while guid in self._used_guids:  # The same path twice, e.g. unnamed copies
+            key += "#"
+            guid = ifcopenshell.guid.compress(uuid.uuid5(GUID_NAMESPACE, key).hex)
+        self._used_guids.add(guid)
+        return guid
+
+    def _entity_key(self, entity: Any) -> str:
+        """Sketch path of an entity created here, the GlobalId for loaded entities"""
+        return self._keys.get(entity.id(), entity.GlobalId)
+
+    def _create_rooted(self, ifc_class: str, key: str, global_id: Optional[str] = None, **attributes) -> Any:
+        """Create an IfcRoot entity whose GlobalId follows from its sketch path"""
+        entity = self._ifc.create_entity(
+            ifc_class,
+            GlobalId=global_id or self._create_guid(key),
+            **attributes
+        )
+        self._used_guids.add(entity.GlobalId)
+        self._keys[entity.id()] = key
+        return entity
 
 
     def create_owner_history(self) -> None:
         """Create IfcOwnerHistory with required entities."""
         # Create organization
-        app_dev = self.ifc.create_entity(
+        app_dev = self._ifc.create_entity(
             "IfcOrganization",
             Name="CustomApp Developer"
         )
         
-        application = self.ifc.create_entity(
+        application = self._ifc.create_entity(
             "IfcApplication",
             ApplicationDeveloper=app_dev,
             Version="1.0",
@@ -209,26 +382,26 @@ class IfcModelCreator:
         )
         
         # Create person
-        person = self.ifc.create_entity(
+        person = self._ifc.create_entity(
             "IfcPerson",
             FamilyName="Doe",
             GivenName="John"
         )
         
         # Create organization
-        org = self.ifc.create_entity(
+        org = self._ifc.create_entity(
             "IfcOrganization",
             Name="Example Organization"
         )
         
-        person_and_org = self.ifc.create_entity(
+        person_and_org = self._ifc.create_entity(
             "IfcPersonAndOrganization",
             ThePerson=person,
             TheOrganization=org
         )
         
         # Create owner history with correct ChangeAction
-        self.owner_history = self.ifc.create_entity(
+        self.owner_history = self._ifc.create_entity(
             "IfcOwnerHistory",
             OwningUser=person_and_org,
             OwningApplication=application,
@@ -237,38 +410,38 @@ class IfcModelCreator:
             LastModifiedDate=None,
             LastModifyingUser=None,
             LastModifyingApplication=None,
-            CreationDate=int(time.time())
+            CreationDate=self.timestamp if self.deterministic else int(time.time())
         )
 
         # Set file header information
-        self.ifc.wrapped_data.header.file_name.author = ["John Doe"]
-        self.ifc.wrapped_data.header.file_name.organization = ["Example Organization"]
+        self._ifc.wrapped_data.header.file_name.author = ["John Doe"]
+        self._ifc.wrapped_data.header.file_name.organization = ["Example Organization"]
 
     def create_project_context(self, project_name="Default Project 1") -> None:
         """Create project and geometric context."""
         # Create units first
-        length_unit = self.ifc.create_entity("IfcSIUnit", UnitType="LENGTHUNIT", Name="METRE")
+        length_unit = self._ifc.create_entity("IfcSIUnit", UnitType="LENGTHUNIT", Name="METRE")
         
-        units = self.ifc.create_entity(
+        units = self._ifc.create_entity(
             "IfcUnitAssignment",
             Units=[length_unit]
         )
         
         # Create project with units
-        self.project = self.ifc.create_entity(
+        self.project = self._create_rooted(
             "IfcProject",
-            GlobalId=self._create_guid(),
+            f"Project={project_name}",
             Name=project_name,
             UnitsInContext=units,
             OwnerHistory=self.owner_history
         )
         
         # Create axis placement with proper attributes
-        z_dir = self.ifc.create_entity("IfcDirection", DirectionRatios=[0.0, 0.0, 1.0])
-        x_dir = self.ifc.create_entity("IfcDirection", DirectionRatios=[1.0, 0.0, 0.0])
-        origin = self.ifc.create_entity("IfcCartesianPoint", Coordinates=[0.0, 0.0, 0.0])
+        z_dir = self._direction(0.0, 0.0, 1.0)
+        x_dir = self._direction(1.0, 0.0, 0.0)
+        origin = self._point(0.0, 0.0, 0.0)
         
-        axis_placement = self.ifc.create_entity(
+        axis_placement = self._shared_entity(
             "IfcAxis2Placement3D",
             Location=origin,
             Axis=z_dir,  # Added Z direction
@@ -276,7 +449,7 @@ class IfcModelCreator:
         )
         
         # Create context with proper attributes
-        self.context = self.ifc.create_entity(
+        self.context = self._ifc.create_entity(
             "IfcGeometricRepresentationContext",
             ContextType="Model",
             ContextIdentifier="Model",
@@ -294,17 +467,14 @@ class IfcModelCreator:
     ) -> Any:
         """Create a local placement with proper axis placement."""
         if relative_placement is None:
-            z_dir = self.ifc.create_entity("IfcDirection", DirectionRatios=[0.0, 0.0, 1.0])
-            x_dir = self.ifc.create_entity("IfcDirection", DirectionRatios=[1.0, 0.0, 0.0])
-            origin = self.ifc.create_entity("IfcCartesianPoint", Coordinates=[0.0, 0.0, 0.0])
-            relative_placement = self.ifc.create_entity(
+            relative_placement = self._shared_entity(
                 "IfcAxis2Placement3D",
-                Location=origin,
-                Axis=z_dir,
-                RefDirection=x_dir
+                Location=self._point(0.0, 0.0, 0.0),
+                Axis=self._direction(0.0, 0.0, 1.0),
+                RefDirection=self._direction(1.0, 0.0, 0.0)
             )
 
-        return self.ifc.create_entity(
+        return self._ifc.create_entity(
             "IfcLocalPlacement",
             PlacementRelTo=placement_ref,
             RelativePlacement=relative_placement
@@ -312,29 +482,29 @@ class IfcModelCreator:
 
     def _create_units(self) -> None:
         """Create SI units for the project."""
-        units = self.ifc.create_entity(
+        units = self._ifc.create_entity(
             "IfcUnitAssignment",
             Units=[
-                self.ifc.create_entity("IfcSIUnit", UnitType="LENGTHUNIT", Name="METRE"),
-                self.ifc.create_entity("IfcSIUnit", UnitType="AREAUNIT", Name="SQUARE_METRE"),
-                self.ifc.create_entity("IfcSIUnit", UnitType="VOLUMEUNIT", Name="CUBIC_METRE"),
+                self._ifc.create_entity("IfcSIUnit", UnitType="LENGTHUNIT", Name="METRE"),
+                self._ifc.create_entity("IfcSIUnit", UnitType="AREAUNIT", Name="SQUARE_METRE"),
+                self._ifc.create_entity("IfcSIUnit", UnitType="VOLUMEUNIT", Name="CUBIC_METRE"),
             ]
         )
         self.project.UnitsInContext = units
 
     def create_spatial_hierarchy(self, site_name: str = "Default Site", building_name: str = "Default Building") -> None:
-            site = self.ifc.create_entity(
+            site = self._create_rooted(
                 "IfcSite",
-                GlobalId=self._create_guid(),
+                f"{self._entity_key(self.project)}/Site={site_name}",
                 OwnerHistory=self.owner_history,
                 Name=site_name,
                 ObjectPlacement=self._create_local_placement(),
                 CompositionType="ELEMENT"
             )
                     
-            self.building = self.ifc.create_entity(
+            self.building = self._create_rooted(
                 "IfcBuilding",
-                GlobalId=self._create_guid(),
+                f"{self._entity_key(site)}/Building={building_name}",
                 OwnerHistory=self.owner_history,
                 Name=building_name,
                 ObjectPlacement=self._create_local_placement(site.ObjectPlacement),
@@ -346,11 +516,8 @@ class IfcModelCreator:
 
     def create_storey(self, name: str, height: float) -> None:
         """Create a building storey at specified height."""
-        origin = self.ifc.create_entity(
-            "IfcCartesianPoint", 
-            Coordinates=(0.0, 0.0, float(height))  # Convert to tuple of floats
-        )
-        axis_placement = self.ifc.create_entity(
+        origin = self._point(0.0, 0.0, height)
+        axis_placement = self._shared_entity(
             "IfcAxis2Placement3D",
             Location=origin
         )
@@ -359,9 +526,9 @@ class IfcModelCreator:
             axis_placement
         )
         
-        storey = self.ifc.create_entity(
+        storey = self._create_rooted(
             "IfcBuildingStorey",
-            GlobalId=self._create_guid(),
+            f"{self._entity_key(self.building)}/Storey={name}",
             OwnerHistory=self.owner_history,
             Name=name,
             ObjectPlacement=storey_placement,
@@ -372,107 +539,162 @@ class IfcModelCreator:
         self.storeys[name] = storey
 
 
-    def create_space(self, coordinates: List[Point3D], space_height: float, storey_name: str, long_name: Optional[str] = None) -> None:
-        print(f"\nCreating space: {long_name}")
+    def storey_elevation(self, name: str) -> Optional[float]:
+        """Z of a storey's placement, None if the storey does not exist"""
+        storey = self.storeys.get(name)
+        if storey is None:
+            return None
+        return float(storey.ObjectPlacement.RelativePlacement.Location.Coordinates[2])
+
+    def move_storey(self, name: str, height: float) -> None:
+        """Give an existing storey a new height (shared placements are replaced, not edited)"""
+        storey_placement = self.storeys[name].ObjectPlacement
+        storey_placement.RelativePlacement = self._shared_entity(
+            "IfcAxis2Placement3D",
+            Location=self._point(0.0, 0.0, height)
+        )
+
+    def space_outline(self, coordinates: PolygonArray) -> Optional[PolygonArray]:
+        """The closed outline create_space writes for these coordinates, None if too small"""
+        simplified_coords = SVGGeometryParser.simplify_polygon(coordinates, self.simplify_tolerance)
+        if len(simplified_coords) < 4:
+            logger.warning("Invalid polygon with %d points - skipping", len(simplified_coords))
+            return None
+
+        with self.stats.span("validate_outline"):
+            problem = outline_problem(simplified_coords.xy)
+            if problem is None:
+                return simplified_coords
+            repaired = repair_outline(simplified_coords.xy) if self.repair_outlines else None
+        if repaired is None:
+            # Written as drawn, like before validation existed; IFC viewers may reject it
+            logger.warning("Invalid polygon (%s)%s", problem,
+                           " - cannot be repaired" if self.repair_outlines else "")
+            self.stats.count("outlines_invalid")
+            return simplified_coords
+        logger.info("Repaired invalid polygon (%s)", problem)
+        self.stats.count("outlines_repaired")
+        repaired = PolygonArray(repaired)
+        if simplified_coords.coords.shape[1] == 3:
+            repaired = repaired.with_z(simplified_coords.coords[0, 2])
+        return repaired
+
+    def create_space(self, coordinates: PolygonArray, space_height: float, storey_name: str,
+                     long_name: Optional[str] = None, global_id: Optional[str] = None,
+                     element_id: Optional[str] = None) -> Any:
+        logger.debug("Creating space: %s", long_name)
         storey = self.storeys.get(storey_name)
         if not storey:
-            print(f"Warning: Storey {storey_name} not found - skipping space")
-            return
+            logger.warning("Storey %s not found - skipping space %s", storey_name, long_name)
+            return None
 
-        simplified_coords = SVGGeometryParser.simplify_polygon(coordinates)
-        if len(simplified_coords) < 4:
-            print(f"Warning: Invalid polygon with {len(simplified_coords)} points - skipping")
-            return
-
-        space_placement = self._create_local_placement(storey.ObjectPlacement)
-        ifc_space = self._create_spatial_element(
-            "IfcSpace",
-            long_name or "Space",
-            space_placement
-        )
-        print(f"Created IfcSpace with GlobalId: {ifc_space.GlobalId}")
-        
+        with self.stats.span("simplify"):
+            simplified_coords = self.space_outline(coordinates)
+        if simplified_coords is None:
+            return None
+
+        with self.stats.span("create_entities"):
+            space_placement = self._create_local_placement(storey.ObjectPlacement)
+            ifc_space = self._create_spatial_element(
+                "IfcSpace",
+                long_name or "Space",
+                space_placement,
+                global_id,
+                f"{self._entity_key(storey)}/Space={element_id or long_name}"
+            )
+            ifc_space.LongName = long_name
+            ifc_space.Description = sketch_description(element_id)
+            ifc_space.Representation = self._create_space_geometry(simplified_coords, space_height)
+            self._create_aggregation(storey, [ifc_space])
+        self.stats.count("spaces_created")
+        logger.debug("Created IfcSpace %s with %d outline points", ifc_space.GlobalId, len(simplified_coords) - 1)
+        return ifc_space
+
+    def update_space(self, ifc_space: Any, coordinates: PolygonArray, space_height: float,
+                     storey_name: str, long_name: Optional[str] = None) -> bool:
+        """Replace the geometry, name and storey of an existing space in place"""
+        storey = self.storeys.get(storey_name)
+        simplified_coords = self.space_outline(coordinates)
+        if storey is None or simplified_coords is None:
+            return False
+
+        old_representation, old_placement = ifc_space.Representation, ifc_space.ObjectPlacement
+        ifc_space.ObjectPlacement = self._create_local_placement(storey.ObjectPlacement)
+        ifc_space.Representation = self._create_space_geometry(simplified_coords, space_height)
+        ifc_space.Name = long_name or "Space"
         ifc_space.LongName = long_name
-        geometry = self._create_space_geometry(simplified_coords, space_height)
-        print(f"Created geometry: {geometry is not None}")
-        
-        ifc_space.Representation = geometry
-        print(f"Assigned representation to space: {ifc_space.Representation is not None}")
-        
-        self._create_aggregation(storey, [ifc_space])
-        print("Space aggregation created")
+        remove_unused(self._ifc, old_representation)
+        remove_unused(self._ifc, old_placement)
+
+        if parent_storey(ifc_space) != storey:
+            detach_from_relationships(self._ifc, ifc_space)
+            self._create_aggregation(storey, [ifc_space])
+        return True
 
     def _create_aggregation(self, relating_object: Any, related_objects: List[Any]) -> None:
-        """Create an aggregation relationship."""
-        self.ifc.create_entity(
-            "IfcRelAggregates",
-            GlobalId=self._create_guid(),
-            OwnerHistory=self.owner_history,
-            RelatingObject=relating_object,
-            RelatedObjects=related_objects
-        )
-        
-    def _create_space_geometry(self, coordinates: List[Point3D], space_height: float) -> Any:
-        """Create the geometric representation of a space using extrusion."""
-        # Create 2D points for the profile (without Z coordinate)
-        points = [
-            self.ifc.create_entity(
-                "IfcCartesianPoint",
-                Coordinates=(float(p.x), float(p.y))  # 2D coordinates
+        """Queue an aggregation; flush_relationships() writes one IfcRelAggregates per parent."""
+        self._pending_aggregations.setdefault(relating_object, []).extend(related_objects)
+
+    def flush_relationships(self) -> None:
+        """Write the queued aggregations, one relationship per parent.
+
+        A parent that already has an IfcRelAggregates (e.g. in an updated file)
+        gets the new children appended to it.
+        """
+        for relating_object, related_objects in self._pending_aggregations.items():
+            existing = [rel for rel in relating_object.IsDecomposedBy if rel.is_a("IfcRelAggregates")]
+            if existing:
+                existing[0].RelatedObjects = list(existing[0].RelatedObjects) + related_objects
+                continue
+            self._ifc.create_entity(
+                "IfcRelAggregates",
+                GlobalId=self._create_guid(self._relationship_key("IfcRelAggregates", relating_object)),
+                OwnerHistory=self.owner_history,
+                RelatingObject=relating_object,
+                RelatedObjects=related_objects
             )
-            for p in coordinates[:-1]  # Exclude last point if it's duplicate
-        ]
-        
-        # Close the polyline using the first point reference
-        points.append(points[0])
+        self._pending_aggregations.clear()
+
+    def write(self, file_name: str) -> None:
+        with self.stats.span("flush_relationships"):
+            self.flush_relationships()
+        with self.stats.span("write_ifc"):
+            self._ifc.write(file_name)
+        if self.stats.enabled:
+            self.stats.count("entities", sum(1 for _ in self._ifc))
+
+    def _relationship_key(self, ifc_class: str, relating_object: Any) -> str:
+        return f"{self._entity_key(relating_object)}/{ifc_class}"
+
+    def _create_space_geometry(self, coordinates: PolygonArray, space_height: float) -> Any:
+        """Create the geometric representation of a space using extrusion."""
+        # 2D profile coordinates, excluding the last point as it duplicates the first
+        profile_xy = PolygonArray.coerce(coordinates).xy[:-1].tolist()
         
         # Create the closed profile
-        polyline = self.ifc.create_entity(
-            "IfcPolyline",
-            Points=points
-        )
+        outline = self._create_outline_curve(profile_xy)
         
-        profile_def = self.ifc.create_entity(
+        profile_def = self._ifc.create_entity(
             "IfcArbitraryClosedProfileDef",
             ProfileType="AREA",
-            OuterCurve=polyline
+            OuterCurve=outline
         )
         
-        direction = self.ifc.create_entity(
-            "IfcDirection",
-            DirectionRatios=[0.0, 0.0, 1.0]
-        )
-        
-        solid = self.ifc.create_entity(
+        solid = self._ifc.create_entity(
             "IfcExtrudedAreaSolid",
             SweptArea=profile_def,
-            Position=self.ifc.create_entity(
-                "IfcAxis2Placement3D",
-                Location=self.ifc.create_entity(
-                    "IfcCartesianPoint",
-                    Coordinates=[0.0, 0.0, 0.0]
-                )
-            ),
-            ExtrudedDirection=direction,
+            Position=self._create_axis_placement(),
+            ExtrudedDirection=self._direction(0.0, 0.0, 1.0),
             Depth=float(space_height)
         )
         
         # Create 2D footprint for representation
-        footprint_points = [
-            self.ifc.create_entity(
-                "IfcCartesianPoint",
-                Coordinates=(float(p.x), float(p.y))
-            )
-            for p in coordinates[:-1]
-        ]
-        footprint_points.append(footprint_points[0])
-        
-        footprint = self.ifc.create_entity(
-            "IfcPolyline",
-            Points=footprint_points
-        )
+        if self.curve_mode == "separate":
+            footprint = self._create_outline_curve(profile_xy)
+        else:
+            footprint = outline
         
-        body_rep = self.ifc.create_entity(
+        body_rep = self._ifc.create_entity(
             "IfcShapeRepresentation",
             ContextOfItems=self.context,
             RepresentationIdentifier="Body",
@@ -480,7 +702,7 @@ class IfcModelCreator:
             Items=[solid]
         )
         
-        footprint_rep = self.ifc.create_entity(
+        footprint_rep = self._ifc.create_entity(
             "IfcShapeRepresentation",
             ContextOfItems=self.context,
             RepresentationIdentifier="FootPrint",
@@ -488,12 +710,41 @@ class IfcModelCreator:
             Items=[footprint]
         )
         
-        return self.ifc.create_entity(
+        return self._ifc.create_entity(
             "IfcProductDefinitionShape",
             Representations=[body_rep, footprint_rep]
         )
 
 
+    def _create_outline_curve(self, profile_xy: List[List[float]]) -> Any:
+        """Closed 2D curve through the profile vertices (first vertex not repeated)"""
+        if self.curve_mode == "indexed":
+            point_list = self._ifc.create_entity(
+                "IfcCartesianPointList2D",
+                CoordList=profile_xy + profile_xy[:1]
+            )
+            return self._ifc.create_entity(
+                "IfcIndexedPolyCurve",
+                Points=point_list,
+                SelfIntersect=False
+            )
+
+        # Create 2D points for the profile (without Z coordinate)
+        points = [
+            self._ifc.create_entity(
+                "IfcCartesianPoint",
+                Coordinates=(x, y)  # 2D coordinates
+            )
+            for x, y in profile_xy
+        ]
+        
+        # Close the polyline using the first point reference
+        points.append(points[0])
+        return self._ifc.create_entity(
+            "IfcPolyline",
+            Points=points
+        )
+
     def _create_faces(
         self, 
         bottom_vertices: List[Any], 
@@ -515,11 +766,11 @@ class IfcModelCreator:
                     vertices[next_i]
                 ))
             
-            edge_loop = self.ifc.create_entity(
+            edge_loop = self._ifc.create_entity(
                 "IfcEdgeLoop",
                 EdgeList=edges
             )
-            return self.ifc.create_entity(
+            return self._ifc.create_entity(
                 "IfcFaceOuterBound",
                 Bound=edge_loop,
                 Orientation=True
@@ -527,7 +778,7 @@ class IfcModelCreator:
 
         # Bottom face
         faces.append(
-            self.ifc.create_entity(
+            self._ifc.create_entity(
                 "IfcFace",
                 Bounds=[create_face_bounds(bottom_vertices)]
             )
@@ -535,7 +786,7 @@ class IfcModelCreator:
 
         # Top face (reversed orientation)
         faces.append(
-            self.ifc.create_entity(
+            self._ifc.create_entity(
                 "IfcFace",
                 Bounds=[create_face_bounds(top_vertices, reverse=True)]
             )
@@ -551,7 +802,7 @@ class IfcModelCreator:
                 top_vertices[i]
             ]
             faces.append(
-                self.ifc.create_entity(
+                self._ifc.create_entity(
                     "IfcFace",
                     Bounds=[create_face_bounds(vertices)]
                 )
@@ -560,12 +811,14 @@ class IfcModelCreator:
         return faces
 
     def _create_spatial_element(
-        self, element_type: str, name: str, placement: Any
+        self, element_type: str, name: str, placement: Any, global_id: Optional[str] = None,
+        key: Optional[str] = None
     ) -> Any:
         """Create a spatial element with given type and name."""
-        return self.ifc.create_entity(
+        return self._create_rooted(
             element_type,
-            GlobalId=self._create_guid(),
+            key or f"{self._entity_key(self.building)}/{element_type}={name}",
+            global_id,
             Name=name,
             ObjectPlacement=placement,
             OwnerHistory=self.owner_history
@@ -573,244 +826,205 @@ class IfcModelCreator:
 
     def _create_axis_placement(self) -> Any:
         """Create an axis placement at origin."""
-        return self.ifc.create_entity(
+        return self._shared_entity(
             "IfcAxis2Placement3D",
-            Location=self.ifc.create_entity(
-                "IfcCartesianPoint",
-                Coordinates=[0.0, 0.0, 0.0]
-            )
+            Location=self._point(0.0, 0.0, 0.0)
         )
 
     def _create_local_placement(
         self, placement_ref: Any = None, relative_placement: Any = None
     ) -> Any:
         """Create a local placement."""
-        return self.ifc.create_entity(
+        return self._ifc.create_entity(
             "IfcLocalPlacement",
             PlacementRelTo=placement_ref,
             RelativePlacement=relative_placement or self._create_axis_placement()
         )
 
-    def _create_aggregation(self, relating_object: Any, related_objects: List[Any]) -> None:
-        """Create an aggregation relationship."""
-        self.ifc.create_entity(
-            "IfcRelAggregates",
-            GlobalId=self._create_guid(),
-            RelatingObject=relating_object,
-            RelatedObjects=related_objects
-        )
-
     def _create_containment(self, structure: Any, elements: List[Any]) -> None:
         """Create a containment relationship."""
-        self.ifc.create_entity(
+        self._ifc.create_entity(
             "IfcRelContainedInSpatialStructure",
-            GlobalId=self._create_guid(),
+            GlobalId=self._create_guid(self._relationship_key("IfcRelContainedInSpatialStructure", structure)),
             RelatingStructure=structure,
             RelatedElements=elements
         )
 
-    def _validate_geometry(self, points: List[Point3D]) -> bool:
-        """Check if the geometry is valid (no self-intersections)."""
-        # Special case for rectangles
-        if len(points) == 5:  # Rectangles have 5 points (last point closes the shape)
-            # Check if it's actually a rectangle by verifying perpendicular sides
-            def is_perpendicular(p1: Point3D, p2: Point3D, p3: Point3D) -> bool:
-                v1x, v1y = p2.x - p1.x, p2.y - p1.y
-                v2x, v2y = p3.x - p2.x, p3.y - p2.y
-                dot_product = v1x * v2x + v1y * v2y
-                return abs(dot_product) < 0.001  # Allow small numerical errors
-            
-            is_rect = (
-                is_perpendicular(points[0], points[1], points[2]) and
-                is_perpendicular(points[1], points[2], points[3]) and
-                is_perpendicular(points[2], points[3], points[0])
-            )
-            if is_rect:
-                return True
-
-        # For non-rectangular shapes, check for self-intersections
-        def segments_intersect(p1: Point3D, p2: Point3D, p3: Point3D, p4: Point3D) -> bool:
-            def ccw(A: Point3D, B: Point3D, C: Point3D) -> bool:
-                return (C.y - A.y) * (B.x - A.x) > (B.y - A.y) * (C.x - A.x)
-            return ccw(p1, p3, p4) != ccw(p2, p3, p4) and ccw(p1, p2, p3) != ccw(p1, p2, p4)
-        
-        n = len(points)
-        for i in range(n-1):
-            for j in range(i+2, n-1):
-                if segments_intersect(points[i], points[i+1], points[j], points[j+1]):
-                    return False
-        return True
-    
-def find_layer_by_prefix(root: etree._Element, prefix: str, ns: Dict[str, str]) -> Tuple[etree._Element, str]:
+
+def find_layer_by_prefix(root: etree._Element, prefix: str, ns: Dict[str, str],
+                         layers: Optional[LayerIndex] = None) -> Tuple[etree._Element, str]:
     """Find the first layer with an inkscape:label starting with the given prefix."""
     inkscape_ns = ns.get('inkscape')
     if not inkscape_ns:
         raise ValueError("The 'inkscape' namespace is missing in the SVG file.")
     
-    label_attr = f"{{{inkscape_ns}}}label"
-    
-    # Recursively search for elements with matching label
-    for element in root.iter():
-        label = element.get(label_attr)
-        if label and label.startswith(prefix):
-            return element, label.split('=', 1)[1].strip()
+    if layers is None:
+        layers = LayerIndex(root, f"{{{inkscape_ns}}}label")
+    node = layers.find(prefix)
+    if node is not None:
+        return node.element, node.label.split('=', 1)[1].strip()
     
     raise ValueError(f"No layer found with label starting with '{prefix}' in the SVG file.")
 
-def process_svg_layers(svg_file: str, output_dir: str) -> None:
-    tree = etree.parse(svg_file)
-    root = tree.getroot()
-    ns = {k if k else "default": v for k, v in root.nsmap.items()}
+def parse_spaces_label(label: str, converter: UnitConverter) -> Tuple[float, float]:
+    """Parse height and relative Z from Spaces layer label"""
+    parts = label.split(',')
+    height = None  # No default - must be specified
+    rel_z = 0.0    # Optional - defaults to 0.0
     
-    paths, attributes, svg_attributes = svg2paths2(svg_file)
-    path_dict = {attr.get('d', ''): path for path, attr in zip(paths, attributes)}
-
-    def parse_transform_matrix(transform_str):
-
-        if not transform_str or 'matrix' not in transform_str:
-            return None
-        values = [float(x) for x in transform_str.split('(')[1].split(')')[0].split(',')]
-        return values
-
-    def apply_transform(point: Point3D, matrix) -> Point3D:
-        if not matrix:
-            return point
-        x = point.x * matrix[0] + point.y * matrix[2] + matrix[4]
-        y = point.x * matrix[1] + point.y * matrix[3] + matrix[5]
-        return Point3D(x, y)
-
-    def get_accumulated_transform(element):
-        transform_matrix = None
-        current = element
-        while current is not None and current != root:
-            transform = current.get('transform')
-            if transform:
-                matrix = parse_transform_matrix(transform)
-                if matrix:
-                    if transform_matrix is None:
-                        transform_matrix = matrix
-                    else:
-                        a1, b1, c1, d1, e1, f1 = transform_matrix
-                        a2, b2, c2, d2, e2, f2 = matrix
-                        transform_matrix = [
-                            a1*a2 + c1*b2, b1*a2 + d1*b2,
-                            a1*c2 + c1*d2, b1*c2 + d1*d2,
-                            a1*e2 + c1*f2 + e1, b1*e2 + d1*f2 + f1
-                        ]
-            current = current.getparent() if hasattr(current, 'getparent') else None
-        return transform_matrix
-
-    def parse_spaces_label(label: str, converter: UnitConverter) -> Tuple[float, float]:
-        """Parse height and relative Z from Spaces layer label"""
-        parts = label.split(',')
-        height = None  # No default - must be specified
-        rel_z = 0.0    # Optional - defaults to 0.0
-        
-        for part in parts:
-            part = part.strip()
-            if part.startswith('h='):
-                height = converter.convert(float(part.split('=')[1]))
-            elif part.startswith('relZ='):
-                rel_z = converter.convert(float(part.split('=')[1]))
+    for part in parts:
+        part = part.strip()
+        if part.startswith('h='):
+            height = converter.convert(float(part.split('=')[1]))
+        elif part.startswith('relZ='):
+            rel_z = converter.convert(float(part.split('=')[1]))
+    
+    if height is None:
+        raise ValueError("Space height (h=) must be specified in label")
         
-        if height is None:
-            raise ValueError("Space height (h=) must be specified in label")
+    return height, rel_z
+
+def parse_storey_label(label: str, converter: UnitConverter) -> Tuple[str, float]:
+    """Parse storey name and Z position from Storey layer label"""
+    parts = label.split(',')
+    name = parts[0].split('=')[1].strip()
+    z_pos = 0.0
+    
+    for part in parts[1:]:
+        if 'Z=' in part:
+            z_pos = converter.convert(float(part.split('=')[1]))
             
-        return height, rel_z
+    return name, z_pos
+
+
+def ifc_file_name(output_dir: str, project_name: str, building_name: str) -> str:
+    return f"{output_dir}/{project_name}_{building_name}.ifc"
+
+
+def ifc_file_names(svg_file: str, output_dir: str) -> List[str]:
+    """The IFC files process_svg_layers writes for a sketch, from its layer names alone"""
+    layers = LayerIndex.from_root(etree.parse(svg_file).getroot())
+    return [ifc_file_name(output_dir, layers.project.name, building.name) for building in layers.buildings]
+
+
+@dataclass
+class SketchSpace:
+    """A space as drawn in the sketch, coordinates in metres"""
+    long_name: str
+    storey_name: str
+    coordinates: PolygonArray
+    space_height: float
+    global_id: Optional[str] = None
+    element_id: Optional[str] = None
+
+
+@dataclass
+class BuildingResult:
+    name: str
+    ifc_file: str
+    seconds: float
+    error: Optional[str] = None
+    update: Optional[UpdateSummary] = None  # Set when an existing file was patched
+    issues: List[SpaceIssue] = field(default_factory=list)  # Overlaps and gaps found in the sketch
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
-    def parse_storey_label(label: str, converter: UnitConverter) -> Tuple[str, float]:
-        """Parse storey name and Z position from Storey layer label"""
-        parts = label.split(',')
-        name = parts[0].split('=')[1].strip()
-        z_pos = 0.0
+
+class SVGSketchConverter:
+    """Converts the Building= layers of one SVG sketch into IFC files"""
+
+    def __init__(self, svg_file: str, deterministic: bool = False, stats: Optional[Stats] = None,
+                 validate: bool = True, repair: bool = False,
+                 curve_tolerance: Optional[float] = CURVE_TOLERANCE,
+                 simplify_tolerance: float = SIMPLIFY_TOLERANCE):
+        self.svg_file = svg_file
+        self.deterministic = deterministic
+        self.validate = validate
+        self.repair = repair
+        self.curve_tolerance = curve_tolerance
+        self.simplify_tolerance = simplify_tolerance
+        self.issues: List[SpaceIssue] = []
+        self.stats = stats if stats is not None else NULL_STATS
+        with self.stats.span("parse_svg"):
+            self.tree = etree.parse(svg_file)
+        self.root = self.tree.getroot()
+        self.ns = {k if k else "default": v for k, v in self.root.nsmap.items()}
+        self.label_attr = f'{{{self.ns["inkscape"]}}}label'
         
-        for part in parts[1:]:
-            if 'Z=' in part:
-                z_pos = converter.convert(float(part.split('=')[1]))
-                
-        return name, z_pos
-    
-    def process_space_elements(space_layer, space_height, storey_name, creator, storey_z: float, rel_z: float = 0.0):
-        """Process space elements with debug logging"""
+        self.path_cache = SVGPathCache()
+        with self.stats.span("resolve_transforms"):
+            self.transforms = TransformResolver(self.root)
+        with self.stats.span("index_layers"):
+            self.layers = LayerIndex(self.root, self.label_attr)
+
+        # Find project and site
+        self.project_name = self.layers.project.name
+        self.site_name = self.layers.site.name
+
+    def building_layers(self) -> List[LayerNode]:
+        return self.layers.buildings
+
+    def ifc_file_name(self, building: LayerNode, output_dir: str) -> str:
+        return ifc_file_name(output_dir, self.project_name, building.name)
+
+    def sketch_spaces(self, space_layer, space_height, storey_name, geometry_parser, storey_z: float, rel_z: float = 0.0) -> List[SketchSpace]:
+        """Read the rect and path spaces of a Spaces layer with debug logging"""
+        spaces = []
+
         def process_element(elem):
-            tag = elem.tag.split('}')[-1]
+            tag = elem.tag.split('}')[-1] if isinstance(elem.tag, str) else ''
             if tag not in ['rect', 'path']:
                 return
                 
-            space_name = elem.get(f'{{{ns["inkscape"]}}}label') or "Default Space"
-            print(f"\nProcessing space: {space_name}")
-            
+            space_name = elem.get(self.label_attr) or "Default Space"
+            logger.debug("Processing space: %s", space_name)
             if tag == 'path':
-                d = elem.get('d')
-                print(f"Path data: {d}")
-                print(f"In path_dict: {d in path_dict}")
-                if d and d in path_dict:
-                    path = path_dict[d]
-                    points = [complex(seg.start.real, seg.start.imag) for seg in path]
-                    print(f"Points found: {len(points)}")
-                    print(f"First few points: {points[:3]}")
-
-            transform_matrix = get_accumulated_transform(elem)
+                logger.debug("Path data: %s", elem.get('d'))
+
+            transform_matrix = self.transforms.get(elem)
             
             coords = None
             if tag == 'rect':
-                coords = creator.geometry_parser.parse_rect(elem.attrib)
+                coords = geometry_parser.parse_rect(elem.attrib)
             elif tag == 'path':
-                d = elem.get('d')
-                if d and d in path_dict:
-                    coords = creator.geometry_parser.parse_path(path_dict[d])
+                path = self.path_cache.get(elem)
+                if path is not None:
+                    coords = geometry_parser.parse_path(path, transform_matrix)
             
             if coords:
-                print(f"Coordinates generated: {len(coords)}")
+                logger.debug("Coordinates generated: %d", len(coords))
             else:
-                print("No coordinates generated")
-
+                logger.debug("No coordinates generated for %s", space_name)
                
             if coords:
-                if transform_matrix:
-                    coords = [apply_transform(point, transform_matrix) for point in coords]
+                # The transform is in SVG units (cm), the coordinates are already in meters
+                factor = geometry_parser.converter.conversion_factor
+                coords = coords.transformed(scale_translation(transform_matrix, factor))
                 
                 # Calculate absolute Z position
-                print(f"XXXXXXXXXXXXXXXXX {rel_z}")
                 absolute_z = storey_z + rel_z
-                coords = [Point3D(p.x, p.y, absolute_z) for p in coords]
-                creator.create_space(coords, space_height, storey_name, space_name)
+                coords = coords.with_z(absolute_z)
+                # Paths written by convert_ifc_to_svg carry the GlobalId of their IfcSpace
+                element_id = elem.get('id')
+                spaces.append(SketchSpace(space_name, storey_name, coords, space_height,
+                                          element_id if is_ifc_guid(element_id) else None, element_id))
+                self.stats.count("vertices", len(coords))
 
-        for elem in space_layer:
-            process_element(elem)
-            for child in elem:
-                process_element(child)
+        with self.stats.span("read_spaces"):
+            for elem in space_layer:
+                process_element(elem)
+                for child in elem:
+                    process_element(child)
+        self.stats.count("spaces_read", len(spaces))
+        return spaces
 
-    # Find and process project and site
-    project_layer = next(elem for elem in root.iter() if elem.get(f'{{{ns["inkscape"]}}}label', '').startswith('Project='))
-    project_name = project_layer.get(f'{{{ns["inkscape"]}}}label').split('=')[1]
-    
-    site_layer = next(elem for elem in project_layer.iter() if elem.get(f'{{{ns["inkscape"]}}}label', '').startswith('Site='))
-    site_name = site_layer.get(f'{{{ns["inkscape"]}}}label').split('=')[1]
-
-    # Process buildings
-    for building_layer in site_layer:
-        building_label = building_layer.get(f'{{{ns["inkscape"]}}}label', '')
-        if not building_label.startswith('Building='):
-            continue
-            
-        building_name = building_label.split('=')[1]
-        ifc_file = f"{output_dir}/{project_name}_{building_name}.ifc"
-        
-        creator = IfcModelCreator()
-        creator.create_owner_history()
-        creator.create_project_context(project_name)
-        creator.create_spatial_hierarchy(site_name, building_name)
-        
-        # Process storeys
+    def building_storeys(self, building: LayerNode, converter: UnitConverter) -> List[Tuple[str, float, LayerNode]]:
+        """(unique name, z, layer) of the storeys of a building, lowest first"""
         storeys_info = {}
-        for storey_layer in building_layer.findall(f".//*[@{{{ns['inkscape']}}}label]"):
-            storey_label = storey_layer.get(f'{{{ns["inkscape"]}}}label', '')
-            if not storey_label.startswith('Storey='):
-                continue
-            
-            converter = creator.geometry_parser.converter
-            storey_name, storey_z = parse_storey_label(storey_label, converter)
+        for storey_layer in building.descendants(LayerKind.STOREY):
+            storey_name, storey_z = parse_storey_label(storey_layer.label, converter)
             unique_name = storey_name
             counter = 1
             while unique_name in storeys_info:
@@ -822,36 +1036,256 @@ def process_svg_layers(svg_file: str, output_dir: str) -> None:
                 'layer': storey_layer
             }
 
+        return [(storey_name, info['z_position'], info['layer'])
+                for storey_name, info in sorted(storeys_info.items(), key=lambda x: x[1]['z_position'])]
+
+    def storey_spaces(self, storey_name: str, storey_z: float, storey_layer: LayerNode,
+                      geometry_parser: SVGGeometryParser) -> List[SketchSpace]:
+        """All spaces drawn in the Spaces layers of a storey"""
+        spaces = []
+        converter = geometry_parser.converter
+        # Find and process spaces groups
+        for group_layer in storey_layer.descendants(LayerKind.SPACES):
+            group, group_label = group_layer.element, group_layer.label
+            try:
+                
+                space_height, rel_z = parse_spaces_label(group_label, converter)
+                logger.debug("Spaces group '%s': height %s, relZ %s", group_label, space_height, rel_z)
+
+                if space_height > 0:
+                    group_spaces = self.sketch_spaces(
+                        group, 
+                        space_height,
+                        storey_name,
+                        geometry_parser,
+                        storey_z,
+                        rel_z
+                    )
+                    if self.validate:
+                        self.check_spaces(storey_name, group_spaces)
+                    spaces.extend(group_spaces)
+            except (ValueError, IndexError) as e:
+                logger.warning("Error processing space group '%s': %s", group_label, e)
+                continue
+        return spaces
+
+    def check_spaces(self, storey_name: str, spaces: List[SketchSpace]) -> List[SpaceIssue]:
+        """Report overlapping and almost touching spaces of one Spaces layer"""
+        with self.stats.span("validate_spaces"):
+            issues = find_space_issues(
+                [space.coordinates.xy for space in spaces],
+                [f"{space.long_name} ({space.element_id})" if space.element_id else space.long_name
+                 for space in spaces],
+                storey_name)
+        for issue in issues:
+            logger.warning("Space layout: %s", issue)
+            self.stats.count(f"{issue.kind}s")
+        self.issues.extend(issues)
+        return issues
+
+    def convert_building(self, building: LayerNode, output_dir: str) -> str:
+        """Write the IFC file of one building layer and return its path"""
+        ifc_file = self.ifc_file_name(building, output_dir)
+        
+        creator = IfcModelCreator(deterministic=self.deterministic, stats=self.stats, repair_outlines=self.repair,
+                                  curve_tolerance=self.curve_tolerance,
+                                  simplify_tolerance=self.simplify_tolerance)
+        creator.create_owner_history()
+        creator.create_project_context(self.project_name)
+        creator.create_spatial_hierarchy(self.site_name, building.name)
+        
         # Create and process storeys in order
-        for storey_name, info in sorted(storeys_info.items(), key=lambda x: x[1]['z_position']):
-            storey_layer = info['layer']
-            storey_z = info['z_position']
-            
+        for storey_name, storey_z, storey_layer in self.building_storeys(building, creator.geometry_parser.converter):
             creator.create_storey(storey_name, storey_z)
-            
-            # Find and process spaces groups
-            for group in storey_layer.findall(f".//*[@{{{ns['inkscape']}}}label]"):
-                group_label = group.get(f'{{{ns["inkscape"]}}}label', '')
-                if not group_label.startswith('Spaces'):
-                    continue
+            for space in self.storey_spaces(storey_name, storey_z, storey_layer, creator.geometry_parser):
+                creator.create_space(space.coordinates, space.space_height, storey_name,
+                                     space.long_name, space.global_id, space.element_id)
 
-                try:
-                    
-                    space_height, rel_z = parse_spaces_label(group_label, converter)
-                    print(f"YYYYYYYYYY {space_height}, {rel_z}")
-
-                    if space_height > 0:
-                        process_space_elements(
-                            group, 
-                            space_height,
-                            storey_name,
-                            creator,
-                            storey_z,
-                            rel_z
-                        )
-                except (ValueError, IndexError) as e:
-                    print(f"Error processing space group '{group_label}': {str(e)}")
+        os.makedirs(output_dir, exist_ok=True)
+        creator.write(ifc_file)
+        return ifc_file
+
+    def update_building(self, building: LayerNode, ifc_file: str) -> UpdateSummary:
+        """Patch an existing building IFC to match the sketch.
+
+        Spaces are matched by the element id: convert_ifc_to_svg sets it to the
+        GlobalId, and spaces drawn in the sketch keep theirs in the IfcSpace
+        Description. Only spaces whose storey, name or geometry differ are
+        rewritten; spaces missing from the sketch are removed and new ones are
+        added. Storeys are added, moved to their new Z, or removed once they
+        are gone from the sketch and empty. Every other entity and GlobalId is
+        left untouched.
+        """
+        summary = UpdateSummary()
+        with self.stats.span("open_ifc"):
+            model = ifcopenshell.open(ifc_file)
+        creator = IfcModelCreator.from_file(model, deterministic=self.deterministic, stats=self.stats,
+                                            repair_outlines=self.repair, curve_tolerance=self.curve_tolerance,
+                                            simplify_tolerance=self.simplify_tolerance)
+        existing = {space.GlobalId: space for space in creator.ifc.by_type("IfcSpace")}
+        by_sketch_id = {sketch_id(space): space for space in existing.values() if sketch_id(space)}
+        seen = set()
+        sketch_storeys = set()
+
+        for storey_name, storey_z, storey_layer in self.building_storeys(building, creator.geometry_parser.converter):
+            elevation = creator.storey_elevation(storey_name)
+            if elevation is None:
+                creator.create_storey(storey_name, storey_z)
+                summary.storeys_added.append(storey_name)
+            elif abs(elevation - storey_z) > 1e-9:
+                creator.move_storey(storey_name, storey_z)
+                summary.storeys_moved.append(storey_name)
+            sketch_storeys.add(storey_name)
+
+            for space in self.storey_spaces(storey_name, storey_z, storey_layer, creator.geometry_parser):
+                if space.global_id:
+                    ifc_space = existing.get(space.global_id)
+                else:
+                    ifc_space = by_sketch_id.get(space.element_id)
+                if ifc_space is None or ifc_space.GlobalId in seen:
+                    ifc_space = creator.create_space(space.coordinates, space.space_height, storey_name,
+                                                     space.long_name, space.global_id if ifc_space is None else None,
+                                                     space.element_id)
+                    if ifc_space is not None:
+                        summary.added.append(ifc_space.GlobalId)
+                        seen.add(ifc_space.GlobalId)
                     continue
 
-        os.makedirs(output_dir, exist_ok=True)
-        creator.ifc.write(ifc_file)
\ No newline at end of file
+                with self.stats.span("simplify"):
+                    outline = creator.space_outline(space.coordinates)
+                if outline is None:
+                    continue  # Invalid now: removed like in a full conversion
+                seen.add(ifc_space.GlobalId)
+                with self.stats.span("diff"):
+                    unchanged = space_matches(ifc_space, creator.storeys[storey_name], outline.xy[:-1],
+                                              space.space_height, space.long_name)
+                if unchanged:
+                    summary.unchanged += 1
+                elif creator.update_space(ifc_space, space.coordinates, space.space_height,
+                                          storey_name, space.long_name):
+                    summary.changed.append(ifc_space.GlobalId)
+
+        for global_id, ifc_space in existing.items():
+            if global_id not in seen:
+                remove_space(creator.ifc, ifc_space)
+                summary.removed.append(global_id)
+        for storey_name, storey in list(creator.storeys.items()):
+            if storey_name not in sketch_storeys and is_empty_storey(storey):
+                remove_storey(creator.ifc, storey)
+                del creator.storeys[storey_name]
+                summary.storeys_removed.append(storey_name)
+
+        self.stats.count("spaces_added", len(summary.added))
+        self.stats.count("spaces_changed", len(summary.changed))
+        self.stats.count("spaces_removed", len(summary.removed))
+        if summary.touched:
+            creator.write(ifc_file)
+        return summary
+
+    def convert_building_isolated(self, building: LayerNode, output_dir: str,
+                                  incremental: bool = False) -> BuildingResult:
+        """Convert one building, reporting errors in the result instead of raising"""
+        start = time.perf_counter()
+        name = building.name
+        ifc_file = self.ifc_file_name(building, output_dir)
+        update = None
+        first_issue = len(self.issues)
+        try:
+            if incremental and os.path.exists(ifc_file):
+                update = self.update_building(building, ifc_file)
+            else:
+                self.convert_building(building, output_dir)
+        except Exception as e:
+            self.stats.count("buildings_failed")
+            return BuildingResult(name, ifc_file, time.perf_counter() - start,
+                                  f"{type(e).__name__}: {e}", issues=self.issues[first_issue:])
+        self.stats.count("buildings")
+        return BuildingResult(name, ifc_file, time.perf_counter() - start, update=update,
+                              issues=self.issues[first_issue:])
+
+
+def _convert_building_in_worker(svg_file: str, building_index: int, output_dir: str,
+                                incremental: bool = False, collect_stats: bool = False,
+                                options: Optional[Dict[str, Any]] = None) -> Tuple[BuildingResult, Optional[Stats]]:
+    """Process pool entry point: every worker parses the sketch on its own.
+
+    options are the SVGSketchConverter keyword arguments.
+    """
+    stats = Stats() if collect_stats else None
+    sketch = SVGSketchConverter(svg_file, stats=stats, **(options or {}))
+    result = sketch.convert_building_isolated(sketch.building_layers()[building_index], output_dir, incremental)
+    return result, stats
+
+
+def process_svg_layers(svg_file: str, output_dir: str, workers: Optional[int] = 1,
+                       incremental: bool = False, deterministic: bool = False,
+                       verbose: bool = False, stats: Optional[Stats] = None,
+                       validate: bool = True, repair: bool = False,
+                       curve_tolerance: Optional[float] = CURVE_TOLERANCE,
+                       simplify_tolerance: float = SIMPLIFY_TOLERANCE) -> List[BuildingResult]:
+    """Convert every Building= layer of an SVG sketch into {project}_{building}.ifc.
+
+    workers > 1 converts the buildings in that many processes, None uses all
+    cores. A failing building does not stop the others; results are returned
+    in layer order with per-building timings and errors. With incremental=True
+    existing IFC files are patched in place and keep their GlobalIds. With
+    deterministic=True GlobalIds and timestamps are derived from the sketch,
+    so converting the same sketch twice gives byte-identical files.
+    verbose=True prints the per-space diagnostics (see configure_logging).
+    Pass a Stats instance to collect per-stage timings and counters; worker
+    processes report theirs back and they are merged into it.
+    With validate=True overlapping rooms and sliver gaps between rooms of
+    the same Spaces layer are logged and listed in BuildingResult.issues.
+    Self-intersecting room outlines are reported as warnings; repair=True
+    fixes the ones that merely touch themselves.
+    Arcs and Bézier curves are flattened to chords within curve_tolerance
+    metres of the curve; None keeps only the segment end points.
+    Outline vertices closer than simplify_tolerance metres to the outline
+    without them are dropped (0 drops collinear vertices only).
+    """
+    if verbose:
+        configure_logging(verbose=True)
+    stats = stats if stats is not None else NULL_STATS
+    options = dict(deterministic=deterministic, validate=validate, repair=repair,
+                   curve_tolerance=curve_tolerance, simplify_tolerance=simplify_tolerance)
+    with stats.span("total"):
+        results = _convert_buildings(svg_file, output_dir, workers, incremental, stats, options)
+
+    for result in results:
+        status = "ok" if result.ok else f"FAILED ({result.error})"
+        if result.update is not None:
+            status = f"{status}, updated: {result.update}"
+        if result.issues:
+            status = f"{status}, {len(result.issues)} layout issues"
+        if result.ok:
+            logger.info("Building %s: %.2fs %s", result.name, result.seconds, status)
+        else:
+            logger.error("Building %s: %.2fs %s", result.name, result.seconds, status)
+    return results
+
+
+def _convert_buildings(svg_file: str, output_dir: str, workers: Optional[int], incremental: bool,
+                       stats: Stats, options: Dict[str, Any]) -> List[BuildingResult]:
+    sketch = SVGSketchConverter(svg_file, stats=stats, **options)
+    building_layers = sketch.building_layers()
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    if workers <= 1 or len(building_layers) < 2:
+        results = [sketch.convert_building_isolated(layer, output_dir, incremental) for layer in building_layers]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(building_layers))) as pool:
+            futures = [pool.submit(_convert_building_in_worker, svg_file, index, output_dir,
+                                   incremental, stats.enabled, options)
+                       for index in range(len(building_layers))]
+            results = []
+            for layer, future in zip(building_layers, futures):
+                try:
+                    result, worker_stats = future.result()
+                    results.append(result)
+                    if worker_stats is not None:
+                        stats.merge(worker_stats)
+                except Exception as e:
+                    results.append(BuildingResult(layer.name,
+                                                  sketch.ifc_file_name(layer, output_dir),
+                                                  0.0, f"{type(e).__name__}: {e}"))
+    return results
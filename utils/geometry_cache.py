@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import ifcopenshell
+from shapely import wkb
+
+# Bump whenever the cached geometry is computed differently
+CACHE_VERSION = "1"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Layout written by GeometryCache._path: <key[:2]>/<key>.json with a SHA-1 key
+_SHARD_PATTERN = re.compile(r"[0-9a-f]{2}")
+_ENTRY_PATTERN = re.compile(r"([0-9a-f]{40})\.json")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%}), "
+                f"{self.writes} writes, {self.evictions} evictions")
+
+
+def _hash_value(value, memo: Dict[int, str]) -> str:
+    """Hash an attribute value, following entity references by content"""
+    if isinstance(value, ifcopenshell.entity_instance):
+        return entity_content_hash(value, memo)
+    if isinstance(value, (tuple, list)):
+        return "(" + ",".join(_hash_value(v, memo) for v in value) + ")"
+    if isinstance(value, float):
+        return repr(float(value))
+    return repr(value)
+
+
+def entity_content_hash(entity, memo: Optional[Dict[int, str]] = None) -> str:
+    """Hash an entity and everything it references, independent of the #ids.
+
+    Shared entities (contexts, placements, units) are hashed once per memo.
+    """
+    if memo is None:
+        memo = {}
+    entity_id = entity.id()
+    if entity_id and entity_id in memo:
+        return memo[entity_id]
+
+    digest = hashlib.sha1(entity.is_a().encode())
+    for i in range(len(entity)):
+        digest.update(b"|")
+        digest.update(_hash_value(entity[i], memo).encode())
+    result = digest.hexdigest()
+
+    if entity_id:
+        memo[entity_id] = result
+    return result
+
+
+class GeometryCache:
+    """Persistent cache of per-space tessellation results.
+
+    One small JSON file per space, keyed by the content hash of the space's
+    geometry subgraph (representation, placement chain and project units).
+    Least recently used entries are evicted once the directory grows beyond
+    max_bytes. Only files in the cache's own layout are ever indexed, evicted
+    or cleared, so other files in cache_dir are left alone.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._memo: Dict[int, str] = {}
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # path -> size, oldest first
+        self._total_bytes = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+        self._evict()
+
+    def _load_index(self) -> None:
+        """Index the existing cache files from least to most recently used"""
+        found = []
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir() or not _SHARD_PATTERN.fullmatch(shard.name):
+                continue
+            for entry in os.scandir(shard.path):
+                match = _ENTRY_PATTERN.fullmatch(entry.name)
+                if not match or not match.group(1).startswith(shard.name) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def reset_hashes(self) -> None:
+        """Forget the memoised entity hashes (keyed by #id); call before keying another or an edited model"""
+        self._memo.clear()
+
+    def space_key(self, ifc_file, space, settings_key: str = "") -> str:
+        """Cache key of a space from its geometry subgraph and the project units"""
+        parts = [CACHE_VERSION, settings_key,
+                 _hash_value(space.Representation, self._memo),
+                 _hash_value(space.ObjectPlacement, self._memo)]
+        for project in ifc_file.by_type("IfcProject"):
+            parts.append(_hash_value(project.UnitsInContext, self._memo))
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Optional[dict]]:
+        """Return (found, record); record may be None for spaces without footprint"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return False, None
+
+        self.stats.hits += 1
+        if path in self._entries:
+            self._entries.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        if data.get("footprint") is None:
+            return True, None
+        data["footprint"] = wkb.loads(bytes.fromhex(data["footprint"]))
+        return True, data
+
+    def put(self, key: str, record: Optional[dict]) -> None:
+        """Store a record with footprint (shapely geometry), space_height, min_z, max_z"""
+        data = {"footprint": None}
+        if record is not None:
+            data = dict(record)
+            data["footprint"] = record["footprint"].wkb_hex
+            for name in ("space_height", "min_z", "max_z"):
+                data[name] = float(data[name])
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+        self._total_bytes -= self._entries.pop(path, 0)
+        size = os.path.getsize(path)
+        self._entries[path] = size
+        self._total_bytes += size
+        self.stats.writes += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        for path in list(self._entries):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._entries.clear()
+        self._total_bytes = 0
@@ -0,0 +1,204 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+import ifcopenshell
+import ifcopenshell.guid
+import ifcopenshell.util.element
+
+# Coordinates closer than this (in metres) count as unchanged
+COORDINATE_TOLERANCE = 1e-6
+# IfcSpace has no Tag: the id of the sketch element a space was drawn as is
+# kept in its Description, so hand-drawn rooms (rect12, path3) match on update
+SKETCH_ID_PREFIX = "Sketch id: "
+
+
+@dataclass
+class UpdateSummary:
+    """What an incremental update did to one IFC file (GlobalIds of spaces, names of storeys)"""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    storeys_added: List[str] = field(default_factory=list)
+    storeys_moved: List[str] = field(default_factory=list)
+    storeys_removed: List[str] = field(default_factory=list)
+
+    @property
+    def touched(self) -> int:
+        """Spaces and storeys that were modified; the file is only written if non-zero"""
+        return (len(self.added) + len(self.changed) + len(self.removed) + len(self.storeys_added)
+                + len(self.storeys_moved) + len(self.storeys_removed))
+
+    def __str__(self) -> str:
+        text = (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.removed)} removed, {self.unchanged} unchanged")
+        storeys = [f"{len(names)} {action}" for action, names in
+                   (("added", self.storeys_added), ("moved", self.storeys_moved), ("removed", self.storeys_removed))
+                   if names]
+        if storeys:
+            text += f"; storeys: {', '.join(storeys)}"
+        return text
+
+
+def is_ifc_guid(value: Optional[str]) -> bool:
+    """True for a 22 character compressed IFC GlobalId"""
+    if not value or len(value) != 22 or value[0] not in "0123":
+        return False
+    try:
+        ifcopenshell.guid.expand(value)
+    except Exception:
+        return False
+    return True
+
+
+def sketch_description(element_id: Optional[str]) -> Optional[str]:
+    """Description recording the sketch element id; None for GlobalIds, which match directly"""
+    if not element_id or is_ifc_guid(element_id):
+        return None
+    return f"{SKETCH_ID_PREFIX}{element_id}"
+
+
+def sketch_id(space) -> Optional[str]:
+    """Id of the sketch element a space was created from, if recorded"""
+    description = space.Description
+    if description and description.startswith(SKETCH_ID_PREFIX):
+        return description[len(SKETCH_ID_PREFIX):]
+    return None
+
+
+def _is_origin(placement) -> bool:
+    """Axis placement without offset, rotation or an explicit non-default axis"""
+    if placement is None:
+        return True
+    if any(abs(c) > COORDINATE_TOLERANCE for c in placement.Location.Coordinates):
+        return False
+    axis = getattr(placement, "Axis", None)
+    ref_direction = getattr(placement, "RefDirection", None)
+    return ((axis is None or tuple(axis.DirectionRatios) == (0.0, 0.0, 1.0))
+            and (ref_direction is None or tuple(ref_direction.DirectionRatios) == (1.0, 0.0, 0.0)))
+
+
+def space_outline(space) -> Optional[Tuple[np.ndarray, float]]:
+    """Profile vertices (first vertex not repeated) and depth of a space's extrusion.
+
+    Returns None unless the Body is a single vertical extrusion of a polyline
+    profile as written by IfcModelCreator, in which case the space can only be
+    compared by replacing its geometry.
+    """
+    if space.Representation is None:
+        return None
+    bodies = [rep for rep in space.Representation.Representations
+              if rep.RepresentationIdentifier == "Body"]
+    if len(bodies) != 1 or len(bodies[0].Items) != 1:
+        return None
+    solid = bodies[0].Items[0]
+    if not solid.is_a("IfcExtrudedAreaSolid") or not _is_origin(solid.Position):
+        return None
+    if tuple(solid.ExtrudedDirection.DirectionRatios) != (0.0, 0.0, 1.0):
+        return None
+    profile = solid.SweptArea
+    if not profile.is_a("IfcArbitraryClosedProfileDef") or profile.is_a("IfcArbitraryProfileDefWithVoids"):
+        return None
+
+    curve = profile.OuterCurve
+    if curve.is_a("IfcPolyline"):
+        coords = [point.Coordinates for point in curve.Points]
+    elif curve.is_a("IfcIndexedPolyCurve") and not curve.Segments:
+        coords = curve.Points.CoordList
+    else:
+        return None
+    xy = np.array(coords, dtype=float)[:, :2]
+    if len(xy) > 1 and np.allclose(xy[0], xy[-1], atol=COORDINATE_TOLERANCE):
+        xy = xy[:-1]
+    return xy, float(solid.Depth)
+
+
+def parent_storey(space):
+    for rel in space.Decomposes:
+        if rel.RelatingObject.is_a("IfcBuildingStorey"):
+            return rel.RelatingObject
+    return None
+
+
+def same_outline(a: np.ndarray, b: np.ndarray) -> bool:
+    """True if two closed rings (first vertex not repeated) trace the same polygon.
+
+    The starting vertex and the orientation are ignored: the IFC to SVG
+    export and the sketch converter do not agree on either.
+    """
+    if a.shape != b.shape:
+        return False
+    if not len(a):
+        return True
+    for ring in (b, b[::-1]):
+        starts = np.flatnonzero(np.all(np.abs(ring - a[0]) <= COORDINATE_TOLERANCE, axis=1))
+        for start in starts:
+            if np.allclose(np.roll(ring, -start, axis=0), a, rtol=0.0, atol=COORDINATE_TOLERANCE):
+                return True
+    return False
+
+
+def space_matches(space, storey, xy: np.ndarray, depth: float, long_name: Optional[str]) -> bool:
+    """True if an existing space already has this storey, name and geometry"""
+    if parent_storey(space) != storey or space.LongName != long_name:
+        return False
+    placement = space.ObjectPlacement
+    if (placement is None or not placement.is_a("IfcLocalPlacement")
+            or placement.PlacementRelTo != storey.ObjectPlacement
+            or not _is_origin(placement.RelativePlacement)):
+        return False
+    outline = space_outline(space)
+    if outline is None:
+        return False
+    existing_xy, existing_depth = outline
+    return abs(existing_depth - depth) <= COORDINATE_TOLERANCE and same_outline(existing_xy, xy)
+
+
+def detach_from_relationships(ifc_file: ifcopenshell.file, element) -> None:
+    """Remove an element from every relationship; relationships left empty are deleted"""
+    for rel in ifc_file.get_inverse(element):
+        if not rel.is_a("IfcRelationship"):
+            continue
+        for index in range(len(rel)):
+            value = rel[index]
+            if isinstance(value, tuple) and element in value:
+                remaining = [item for item in value if item != element]
+                if remaining:
+                    rel[index] = remaining
+                    continue
+            elif value != element:
+                continue
+            ifc_file.remove(rel)
+            break
+
+
+def remove_unused(ifc_file: ifcopenshell.file, entity) -> None:
+    """Purge an entity and the part of its subgraph nothing else references"""
+    if entity is not None and ifc_file.get_total_inverses(entity) == 0:
+        ifcopenshell.util.element.remove_deep2(ifc_file, entity)
+
+
+def is_empty_storey(storey) -> bool:
+    """True if nothing is aggregated into or contained in a storey"""
+    return (not any(rel.RelatedObjects for rel in storey.IsDecomposedBy)
+            and not any(rel.RelatedElements for rel in storey.ContainsElements))
+
+
+def remove_storey(ifc_file: ifcopenshell.file, storey) -> None:
+    """Delete an empty storey with its placement and relationships"""
+    for rel in list(storey.IsDecomposedBy) + list(storey.ContainsElements):
+        ifc_file.remove(rel)
+    detach_from_relationships(ifc_file, storey)
+    placement = storey.ObjectPlacement
+    ifc_file.remove(storey)
+    remove_unused(ifc_file, placement)
+
+
+def remove_space(ifc_file: ifcopenshell.file, space) -> None:
+    """Delete a space with its representation and placement"""
+    detach_from_relationships(ifc_file, space)
+    representation, placement = space.Representation, space.ObjectPlacement
+    ifc_file.remove(space)
+    remove_unused(ifc_file, representation)
+    remove_unused(ifc_file, placement)
@@ -0,0 +1,126 @@
+import json
+import logging
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, Dict, Optional, TextIO
+
+# Parent of the per-module loggers (utils.convert_svg_to_ifc, ...)
+LOGGER_NAME = "utils"
+LOG_FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+# Library code stays silent unless the application configures logging
+logging.getLogger(LOGGER_NAME).addHandler(logging.NullHandler())
+
+
+def configure_logging(verbose: bool = False, stream: Optional[TextIO] = None) -> logging.Logger:
+    """Print the converters' diagnostics.
+
+    verbose=True shows the per-space debug output, otherwise only warnings
+    and errors. Calling it again replaces the handler installed before.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        if getattr(handler, "_abstractbim", False):
+            logger.removeHandler(handler)
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler._abstractbim = True
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+    return logger
+
+
+@dataclass
+class Span:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: "Stats", name: str):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        span = self.stats.spans.get(self.name)
+        if span is None:
+            span = self.stats.spans[self.name] = Span()
+        span.calls += 1
+        span.seconds += time.perf_counter() - self.start
+        return False
+
+
+class Stats:
+    """Timed spans and counters of a conversion.
+
+    Pass an instance to process_svg_layers or process_ifc and read it back
+    afterwards, or write it with to_json. Spans with the same name add up.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.spans: Dict[str, Span] = {}
+        self.counters: Dict[str, int] = {}
+
+    def span(self, name: str) -> ContextManager:
+        """Time a block: with stats.span("write_ifc"): ..."""
+        return _Timer(self, name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "Stats") -> None:
+        """Add the spans and counters of another run, e.g. from a worker process"""
+        for name, span in other.spans.items():
+            total = self.spans.setdefault(name, Span())
+            total.calls += span.calls
+            total.seconds += span.seconds
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def to_dict(self) -> dict:
+        return {
+            "spans": {name: {"calls": span.calls, "seconds": span.seconds} for name, span in self.spans.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, file_name: Optional[str] = None) -> str:
+        """JSON report; also written to file_name if given"""
+        report = json.dumps(self.to_dict(), indent=2)
+        if file_name:
+            with open(file_name, "w", encoding="utf-8") as f:
+                f.write(report)
+        return report
+
+    def __str__(self) -> str:
+        lines = [f"{name:<24}{span.calls:>8} x {span.seconds * 1000:10.1f} ms"
+                 for name, span in sorted(self.spans.items(), key=lambda item: -item[1].seconds)]
+        lines += [f"{name:<24}{value:>8}" for name, value in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+
+class NullStats(Stats):
+    """Stats that record nothing; the default, so instrumented code costs ~nothing"""
+    enabled = False
+
+    def span(self, name: str) -> ContextManager:
+        return _NULL_SPAN
+
+    def count(self, name: str, value: int = 1) -> None:
+        pass
+
+    def merge(self, other: Stats) -> None:
+        pass
+
+
+_NULL_SPAN = nullcontext()
+NULL_STATS = NullStats()
@@ -0,0 +1,119 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+
+class LayerKind(Enum):
+    PROJECT = "Project="
+    SITE = "Site="
+    BUILDING = "Building="
+    STOREY = "Storey="
+    SPACES = "Spaces"
+
+    @classmethod
+    def classify(cls, label: Optional[str]) -> Optional["LayerKind"]:
+        if not label:
+            return None
+        for kind in cls:
+            if label.startswith(kind.value):
+                return kind
+        return None
+
+
+@dataclass(eq=False)
+class LayerNode:
+    kind: LayerKind
+    label: str
+    element: etree._Element
+    parent: Optional["LayerNode"] = None
+    children: List["LayerNode"] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """Value after the '=' of a Project/Site/Building label"""
+        return self.label.split('=')[1]
+
+    def children_of_kind(self, kind: LayerKind) -> List["LayerNode"]:
+        return [child for child in self.children if child.kind == kind]
+
+    def descendants(self, kind: LayerKind) -> List["LayerNode"]:
+        """All nodes of a kind below this one, in document order"""
+        result = []
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if node.kind == kind:
+                result.append(node)
+            stack.extend(reversed(node.children))
+        return result
+
+
+class LayerIndex:
+    """Project/Site/Building/Storey/Spaces layers of a sketch, found in one pass.
+
+    Every element with an inkscape:label is classified by its label prefix and
+    attached to the nearest classified ancestor, so the rest of the converter
+    never has to rescan the tree. Labeled groups that match no prefix are
+    transparent.
+    """
+
+    def __init__(self, root: etree._Element, label_attr: str):
+        self.root = root
+        self.label_attr = label_attr
+        self.nodes: List[LayerNode] = []  # Document order
+        self.top_level: List[LayerNode] = []
+        self._by_element: Dict[etree._Element, LayerNode] = {}
+        self._build()
+
+    @classmethod
+    def from_root(cls, root: etree._Element) -> "LayerIndex":
+        inkscape_ns = root.nsmap.get('inkscape')
+        if not inkscape_ns:
+            raise ValueError("The 'inkscape' namespace is missing in the SVG file.")
+        return cls(root, f"{{{inkscape_ns}}}label")
+
+    def _build(self) -> None:
+        stack = [(self.root, None)]
+        while stack:
+            element, parent = stack.pop()
+            if not isinstance(element.tag, str):
+                continue  # comments and processing instructions
+            node = parent
+            label = element.get(self.label_attr)
+            kind = LayerKind.classify(label)
+            if kind is not None:
+                node = LayerNode(kind, label, element, parent)
+                (parent.children if parent is not None else self.top_level).append(node)
+                self.nodes.append(node)
+                self._by_element[element] = node
+            stack.extend((child, node) for child in reversed(element))
+
+    def node(self, element: etree._Element) -> Optional[LayerNode]:
+        return self._by_element.get(element)
+
+    def by_kind(self, kind: LayerKind) -> List[LayerNode]:
+        return [node for node in self.nodes if node.kind == kind]
+
+    def find(self, prefix: str) -> Optional[LayerNode]:
+        """First layer (in document order) whose label starts with prefix"""
+        return next((node for node in self.nodes if node.label.startswith(prefix)), None)
+
+    @property
+    def project(self) -> LayerNode:
+        projects = self.by_kind(LayerKind.PROJECT)
+        if not projects:
+            raise ValueError("No layer found with label starting with 'Project=' in the SVG file.")
+        return projects[0]
+
+    @property
+    def site(self) -> LayerNode:
+        sites = self.project.descendants(LayerKind.SITE)
+        if not sites:
+            raise ValueError("No layer found with label starting with 'Site=' in the SVG file.")
+        return sites[0]
+
+    @property
+    def buildings(self) -> List[LayerNode]:
+        return self.site.children_of_kind(LayerKind.BUILDING)
@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+
+@dataclass
+class Point3D:
+    x: float
+    y: float
+    z: float = 0.0
+
+    def to_list(self) -> List[float]:
+        return [self.x, self.y, self.z]
+
+
+class PolygonArray:
+    """Polygon vertices stored as one (N, 2) or (N, 3) float64 array.
+
+    Closed polygons repeat the first vertex at the end, like the Point3D lists
+    they replace. Indexing and iteration still hand out Point3D objects so
+    code written against List[Point3D] keeps working.
+    """
+
+    __slots__ = ("coords",)
+
+    def __init__(self, coords: np.ndarray):
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        if coords.size == 0:
+            coords = coords.reshape((0, 2))
+        if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+            raise ValueError(f"Expected an (N, 2) or (N, 3) array, got shape {coords.shape}")
+        self.coords = coords
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point3D]) -> "PolygonArray":
+        return cls(np.array([(p.x, p.y, p.z) for p in points], dtype=np.float64))
+
+    @classmethod
+    def coerce(cls, value: Union["PolygonArray", np.ndarray, Iterable]) -> "PolygonArray":
+        """Accept a PolygonArray, a coordinate array or a list of Point3D / tuples"""
+        if isinstance(value, PolygonArray):
+            return value
+        if isinstance(value, np.ndarray):
+            return cls(value)
+        value = list(value)
+        if value and isinstance(value[0], Point3D):
+            return cls.from_points(value)
+        return cls(np.array(value, dtype=np.float64))
+
+    # List[Point3D] compatibility
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PolygonArray(self.coords[index])
+        return Point3D(*self.coords[index].tolist())
+
+    def __iter__(self) -> Iterator[Point3D]:
+        for row in self.coords.tolist():
+            yield Point3D(*row)
+
+    def __bool__(self) -> bool:
+        return len(self.coords) > 0
+
+    def __repr__(self) -> str:
+        return f"PolygonArray({self.coords.tolist()!r})"
+
+    def to_points(self) -> List[Point3D]:
+        return list(self)
+
+    @property
+    def xy(self) -> np.ndarray:
+        return self.coords[:, :2]
+
+    def with_z(self, z: float) -> "PolygonArray":
+        """Same vertices as an (N, 3) array at height z"""
+        coords = np.empty((len(self.coords), 3))
+        coords[:, :2] = self.coords[:, :2]
+        coords[:, 2] = z
+        return PolygonArray(coords)
+
+    def transformed(self, matrix: Optional[np.ndarray]) -> "PolygonArray":
+        """Apply a 3x3 affine matrix to X/Y; Z is kept"""
+        if matrix is None:
+            return self
+        coords = self.coords.copy()
+        coords[:, :2] = self.coords[:, :2] @ matrix[:2, :2].T + matrix[:2, 2]
+        return PolygonArray(coords)
+
+    def scaled(self, factor: float) -> "PolygonArray":
+        coords = self.coords.copy()
+        coords[:, :2] *= factor
+        return PolygonArray(coords)
+
+    def is_closed(self, tolerance: float = 1e-6) -> bool:
+        return len(self.coords) > 1 and bool(np.all(np.abs(self.coords[0, :2] - self.coords[-1, :2]) <= tolerance))
+
+    def closed(self, tolerance: float = 1e-6) -> "PolygonArray":
+        """Repeat the first vertex at the end unless it already is"""
+        if not len(self.coords) or self.is_closed(tolerance):
+            return self
+        return PolygonArray(np.vstack([self.coords, self.coords[:1]]))
+
+    def signed_area_2x(self) -> float:
+        """Twice the signed shoelace area over consecutive vertices (closed polygons)"""
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        return float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1]))
+
+    def is_clockwise(self) -> bool:
+        if len(self.coords) < 3:
+            return True
+        return self.signed_area_2x() < 0
+
+    def reversed(self) -> "PolygonArray":
+        return PolygonArray(self.coords[::-1])
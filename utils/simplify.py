@@ -0,0 +1,164 @@
+import numpy as np
+import shapely
+
+# Deviations below this count as zero, so tolerance 0 still drops collinear vertices
+EPSILON = 1e-9
+METHODS = ("douglas-peucker", "visvalingam-whyatt")
+
+
+def _segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distance of every point to its segment start-end (not the infinite line, so spikes stay)"""
+    direction = end - start
+    offset = points - start
+    length2 = np.einsum("ij,ij->i", direction, direction)
+    t = np.einsum("ij,ij->i", offset, direction) / np.where(length2 > 0.0, length2, 1.0)
+    offset -= np.clip(t, 0.0, 1.0)[:, None] * direction
+    return np.hypot(offset[:, 0], offset[:, 1])
+
+
+def douglas_peucker_mask(line: np.ndarray, tolerance: float, anchors=(0, -1)) -> np.ndarray:
+    """Vertices of an open (N, 2) polyline kept by Douglas-Peucker; the anchors always stay.
+
+    All segments of one recursion level are split in a single vectorised
+    step, so a polyline takes O(depth) NumPy passes instead of one per vertex.
+    """
+    count = len(line)
+    position = np.arange(count)
+    keep = np.zeros(count, dtype=bool)
+    keep[list(anchors)] = True
+    undecided = ~keep
+    while undecided.any():
+        # Nearest kept vertex before and after every vertex
+        previous = np.maximum.accumulate(np.where(keep, position, 0))
+        following = np.minimum.accumulate(np.where(keep, position, count - 1)[::-1])[::-1]
+        candidates = np.flatnonzero(undecided)
+        segment = previous[candidates]
+        distances = _segment_distances(line[candidates], line[segment], line[following[candidates]])
+
+        # Farthest candidate of every segment: sort by segment, then distance descending
+        order = np.lexsort((-distances, segment))
+        farthest = order[np.concatenate(([True], segment[order][1:] != segment[order][:-1]))]
+        split = farthest[distances[farthest] > tolerance + EPSILON]
+        keep[candidates[split]] = True
+        # Segments that did not split are final: their candidates are dropped
+        splitting = np.zeros(count, dtype=bool)
+        splitting[segment[split]] = True
+        undecided[candidates] = splitting[segment]
+        undecided[keep] = False
+    return keep
+
+
+def _twice_areas(ring: np.ndarray) -> np.ndarray:
+    """Twice the triangle area of every ring vertex with its two neighbours"""
+    previous, following = np.roll(ring, 1, axis=0), np.roll(ring, -1, axis=0)
+    return np.abs((ring[:, 0] - previous[:, 0]) * (following[:, 1] - previous[:, 1])
+                  - (following[:, 0] - previous[:, 0]) * (ring[:, 1] - previous[:, 1]))
+
+
+def visvalingam_whyatt_mask(ring: np.ndarray, min_area: float) -> np.ndarray:
+    """Vertices of an open (N, 2) ring kept by Visvalingam-Whyatt.
+
+    Every pass drops the vertices whose triangle is below min_area and
+    smallest among its neighbours, never two neighbours at once, so the
+    areas are recomputed after each removal like in the sequential version.
+    """
+    keep = np.ones(len(ring), dtype=bool)
+    while True:
+        index = np.flatnonzero(keep)
+        if len(index) <= 3:
+            break
+        area = _twice_areas(ring[index]) / 2
+        remove = ((area <= min_area + EPSILON)
+                  & (area <= np.roll(area, 1)) & (area <= np.roll(area, -1)))
+        if not remove.any():
+            break
+        # Every other vertex of a run of equal minima, the rest is checked again
+        position = np.arange(len(remove))
+        run_start = remove & ~np.roll(remove, 1)
+        if remove.all():
+            run_start[0] = True
+        offset = position - np.maximum.accumulate(np.where(run_start, position, 0))
+        remove &= offset % 2 == 0
+        if remove[0] and remove[-1]:
+            remove[-1] = False
+        remove[np.flatnonzero(remove)[max(0, len(index) - 3):]] = False
+        keep[index[remove]] = False
+    return keep
+
+
+def _nothing_to_drop(ring: np.ndarray, tolerance: float, method: str) -> bool:
+    """Cheap test for rings that simplification leaves untouched (most rooms)"""
+    extended = np.concatenate((ring[-1:], ring, ring[:1]))
+    previous = extended[:-2]
+    chord = extended[2:] - previous
+    offset = ring - previous
+    cross = offset[:, 0] * chord[:, 1] - chord[:, 0] * offset[:, 1]
+    if method == "visvalingam-whyatt":
+        return bool(np.all(np.abs(cross) / 2 > tolerance + EPSILON))
+    # In a convex ring every chord Douglas-Peucker tests a vertex against lies
+    # beyond the line through the vertex's neighbours, so if every vertex is
+    # farther than tolerance from that line, none is dropped
+    if not ((cross > 0).all() or (cross < 0).all()):
+        return False
+    base = np.hypot(chord[:, 0], chord[:, 1])
+    return bool((np.abs(cross) > (tolerance + EPSILON) * base).all())
+
+
+def _ring_mask(ring: np.ndarray, tolerance: float, method: str) -> np.ndarray:
+    if method == "visvalingam-whyatt":
+        return visvalingam_whyatt_mask(ring, tolerance)
+
+    # Split the ring at two vertices that survive any tolerance: the
+    # lexicographically smallest one (a convex hull corner) and the one
+    # farthest from it
+    anchor = int(np.lexsort((ring[:, 1], ring[:, 0]))[0])
+    rolled = np.roll(ring, -anchor, axis=0)
+    far = int(np.argmax(np.hypot(*(rolled - rolled[0]).T)))
+    keep = douglas_peucker_mask(np.vstack([rolled, rolled[:1]]), tolerance, (0, far, len(rolled)))
+    return np.roll(keep[:-1], anchor)
+
+
+def simplify_ring(coords: np.ndarray, tolerance: float, method: str = "douglas-peucker") -> np.ndarray:
+    """Simplified copy of a polygon ring given as an (N, 2) or (N, 3) array.
+
+    tolerance is the largest distance a dropped vertex may have from the
+    simplified outline (Douglas-Peucker) or the smallest triangle area kept
+    (Visvalingam-Whyatt), in the units of the coordinates. 0 removes
+    collinear and duplicate vertices only. Extra columns (Z) follow the XY
+    vertices, and a closed ring (last vertex repeating the first) stays closed.
+    The result never self-intersects where the input did not: the tolerance
+    is halved until it doesn't.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown simplification method '{method}', expected one of {METHODS}")
+    coords = np.asarray(coords, dtype=np.float64)
+    closed = len(coords) > 1 and coords[0, 0] == coords[-1, 0] and coords[0, 1] == coords[-1, 1]
+    ring = coords[:-1] if closed else coords
+    if len(ring) <= 3:
+        return coords
+
+    # Duplicate vertices would make every segment test degenerate
+    distinct = np.ones(len(ring), dtype=bool)
+    distinct[1:] = (ring[1:, 0] != ring[:-1, 0]) | (ring[1:, 1] != ring[:-1, 1])
+    if not distinct.all():
+        ring = ring[distinct]
+        if len(ring) <= 3:
+            return np.vstack([ring, ring[:1]]) if closed else ring
+
+    if _nothing_to_drop(ring[:, :2], tolerance, method):
+        return coords
+
+    simplified = ring
+    was_valid = None
+    for attempt in [tolerance / 2 ** halvings for halvings in range(8)] + [0.0]:
+        keep = _ring_mask(ring[:, :2], attempt, method)
+        if keep.all():
+            break
+        if len(ring[keep]) < 3:
+            continue
+        if was_valid is None:
+            was_valid = shapely.is_valid(shapely.Polygon(ring[:, :2]))
+        if not was_valid or shapely.is_valid(shapely.Polygon(ring[keep][:, :2])):
+            simplified = ring[keep]
+            break
+    return np.vstack([simplified, simplified[:1]]) if closed else simplified
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely import STRtree
+
+# Overlaps smaller than this (m²) are rounding noise along shared edges
+OVERLAP_TOLERANCE = 0.001
+# Rooms closer than this (m) count as touching
+GAP_TOLERANCE = 0.005
+# Gaps up to this width (m) are slivers; wider ones are walls or corridors
+MAX_GAP = 0.05
+# A repair may drop at most this share of the area (pieces split off at a self-touching vertex)
+REPAIR_AREA_TOLERANCE = 0.01
+
+
+@dataclass
+class SpaceIssue:
+    """An overlap (area in m²) or sliver gap (width in m) between two spaces of a storey"""
+    kind: str  # "overlap" or "gap"
+    storey_name: str
+    first: str
+    second: str
+    size: float
+
+    def __str__(self) -> str:
+        unit = "m²" if self.kind == "overlap" else "m"
+        return f"{self.storey_name}: {self.kind} of {self.size:.4f} {unit} between {self.first} and {self.second}"
+
+
+def outline_problem(xy: np.ndarray) -> Optional[str]:
+    """Why a closed (N, 2) outline is not a valid polygon, None if it is"""
+    polygon = shapely.Polygon(xy)
+    if shapely.is_valid(polygon):
+        return None
+    return shapely.is_valid_reason(polygon)
+
+
+def repair_outline(xy: np.ndarray, area_tolerance: float = REPAIR_AREA_TOLERANCE) -> Optional[np.ndarray]:
+    """Closed (N, 2) exterior of the repaired outline, None if it cannot be repaired.
+
+    make_valid splits a self-touching or slightly self-intersecting outline
+    into pieces; the largest piece is kept if the rest (and any hole it
+    encloses) is at most area_tolerance of the total area.
+    """
+    repaired = shapely.make_valid(shapely.Polygon(xy))
+    pieces = [part for part in shapely.get_parts(repaired) if part.geom_type == "Polygon"]
+    if not pieces:
+        return None
+    total = sum(piece.area for piece in pieces)
+    largest = max(pieces, key=lambda piece: piece.area)
+    filled = shapely.Polygon(largest.exterior)
+    if total <= 0 or abs(filled.area - total) > area_tolerance * total:
+        return None
+    return np.asarray(filled.exterior.coords)
+
+
+def _polygons(outlines: Sequence[np.ndarray]) -> np.ndarray:
+    """Shapely polygons of (N, 2+) outlines; degenerate ones become None, invalid ones are repaired"""
+    polygons = np.array([shapely.Polygon(outline[:, :2]) if len(outline) >= 3 else None
+                         for outline in outlines], dtype=object)
+    invalid = ~shapely.is_valid(polygons) & ~shapely.is_missing(polygons)
+    if invalid.any():
+        polygons[invalid] = shapely.make_valid(polygons[invalid])
+    return polygons
+
+
+def find_space_issues(outlines: Sequence[np.ndarray], names: Sequence[str], storey_name: str = "",
+                      overlap_tolerance: float = OVERLAP_TOLERANCE, gap_tolerance: float = GAP_TOLERANCE,
+                      max_gap: float = MAX_GAP) -> List[SpaceIssue]:
+    """Overlapping and almost touching spaces among the outlines of one storey.
+
+    The candidate pairs come from an STRtree query with the bounding boxes
+    grown by max_gap, so only neighbours are compared and thousands of rooms
+    stay fast. Every pair is reported once, in input order.
+    """
+    polygons = _polygons(outlines)
+    present = np.flatnonzero(~shapely.is_missing(polygons))
+    if len(present) < 2:
+        return []
+
+    tree = STRtree(polygons[present])
+    bounds = shapely.bounds(polygons[present]) + np.array([-max_gap, -max_gap, max_gap, max_gap])
+    query, hits = tree.query(shapely.box(*bounds.T))
+    pairs = query < hits
+    first, second = present[query[pairs]], present[hits[pairs]]
+    order = np.lexsort((second, first))
+    first, second = first[order], second[order]
+    if not len(first):
+        return []
+
+    a, b = polygons[first], polygons[second]
+    overlap = shapely.area(shapely.intersection(a, b))
+    distance = shapely.distance(a, b)
+
+    issues = []
+    for i, j, area, gap in zip(first.tolist(), second.tolist(), overlap.tolist(), distance.tolist()):
+        if area > overlap_tolerance:
+            issues.append(SpaceIssue("overlap", storey_name, names[i], names[j], area))
+        elif gap_tolerance < gap <= max_gap:
+            issues.append(SpaceIssue("gap", storey_name, names[i], names[j], gap))
+    return issues
@@ -0,0 +1,128 @@
+import re
+from math import radians, tan, sin, cos
+from typing import Dict, List, Optional
+
+import numpy as np
+from lxml import etree
+
+# Affine transforms are 3x3 matrices acting on column vectors (x, y, 1):
+# | a c e |
+# | b d f |
+# | 0 0 1 |
+IDENTITY = np.eye(3)
+
+_TRANSFORM_RE = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_ARGUMENT_COUNTS = {
+    'matrix': (6,),
+    'translate': (1, 2),
+    'scale': (1, 2),
+    'rotate': (1, 3),
+    'skewX': (1,),
+    'skewY': (1,),
+}
+
+
+def matrix_from_values(a: float, b: float, c: float, d: float, e: float, f: float) -> np.ndarray:
+    """3x3 matrix from the six values of an SVG matrix(a,b,c,d,e,f)"""
+    return np.array([[a, c, e], [b, d, f], [0.0, 0.0, 1.0]])
+
+
+def _transform_function(name: str, args: List[float]) -> np.ndarray:
+    if len(args) not in _ARGUMENT_COUNTS[name]:
+        raise ValueError(f"Invalid number of arguments for {name}(): {len(args)}")
+
+    if name == 'matrix':
+        return matrix_from_values(*args)
+    if name == 'translate':
+        tx, ty = args[0], args[1] if len(args) == 2 else 0.0
+        return matrix_from_values(1, 0, 0, 1, tx, ty)
+    if name == 'scale':
+        sx = args[0]
+        sy = args[1] if len(args) == 2 else sx
+        return matrix_from_values(sx, 0, 0, sy, 0, 0)
+    if name == 'rotate':
+        angle = radians(args[0])
+        rotation = matrix_from_values(cos(angle), sin(angle), -sin(angle), cos(angle), 0, 0)
+        if len(args) == 3:
+            cx, cy = args[1], args[2]
+            return (matrix_from_values(1, 0, 0, 1, cx, cy) @ rotation
+                    @ matrix_from_values(1, 0, 0, 1, -cx, -cy))
+        return rotation
+    if name == 'skewX':
+        return matrix_from_values(1, 0, tan(radians(args[0])), 1, 0, 0)
+    return matrix_from_values(1, tan(radians(args[0])), 0, 1, 0, 0)  # skewY
+
+
+def parse_transform(transform_str: Optional[str]) -> Optional[np.ndarray]:
+    """Parse an SVG transform attribute into a 3x3 matrix.
+
+    Supports matrix, translate, scale, rotate (with optional center), skewX and
+    skewY, separated by commas and/or whitespace and chained in any number.
+    Returns None for empty attributes.
+    """
+    if not transform_str or not transform_str.strip():
+        return None
+
+    result = None
+    for name, arguments in _TRANSFORM_RE.findall(transform_str):
+        args = [float(value) for value in _NUMBER_RE.findall(arguments)]
+        matrix = _transform_function(name, args)
+        # The rightmost transform in the list is applied first
+        result = matrix if result is None else result @ matrix
+    return result
+
+
+def apply_transform(matrix: Optional[np.ndarray], coords: np.ndarray) -> np.ndarray:
+    """Transform an (N, 2) or (N, 3) coordinate array; Z is left untouched"""
+    if matrix is None:
+        return coords
+    coords = np.asarray(coords, dtype=float)
+    result = coords.copy()
+    result[:, :2] = coords[:, :2] @ matrix[:2, :2].T + matrix[:2, 2]
+    return result
+
+
+def scale_translation(matrix: Optional[np.ndarray], factor: float) -> Optional[np.ndarray]:
+    """Express a transform in other length units (only the translation is a length)"""
+    if matrix is None:
+        return None
+    scaled = matrix.copy()
+    scaled[:2, 2] *= factor
+    return scaled
+
+
+class TransformResolver:
+    """Accumulated transforms of all elements below an SVG root.
+
+    The tree is walked once from the top; every group's transform is parsed a
+    single time and its composed matrix is handed down to its children, instead
+    of walking each element's ancestor chain. The transform of the root itself
+    is not included.
+    """
+
+    def __init__(self, root: etree._Element):
+        self.root = root
+        self._matrices: Dict[etree._Element, Optional[np.ndarray]] = {}
+        self.parse_count = 0
+        self._resolve()
+
+    def _resolve(self) -> None:
+        stack = [(child, None) for child in self.root]
+        while stack:
+            element, parent_matrix = stack.pop()
+            if not isinstance(element.tag, str):
+                continue  # comments and processing instructions
+            matrix = parent_matrix
+            transform = element.get('transform')
+            if transform:
+                self.parse_count += 1
+                own = parse_transform(transform)
+                if own is not None:
+                    matrix = own if parent_matrix is None else parent_matrix @ own
+            self._matrices[element] = matrix
+            stack.extend((child, matrix) for child in element)
+
+    def get(self, element: etree._Element) -> Optional[np.ndarray]:
+        """Composed transform of an element, None if nothing is transformed"""
+        return self._matrices.get(element)
@@ -1,6 +1,4 @@
 from dataclasses import dataclass
-import xml.etree.ElementTree as ET
-from typing import List, Tuple, Dict, Any, Optional, Callable
 import numpy as np
 from enum import Enum
 